@@ -1,35 +1,13 @@
 from psa_license.license import get_user_mode
+from psa_core import export, extraction, metrics, ontology as core_ontology
+from psa_core.scoring import analyze_texts, calculate_trust_visibility_scores
+from psa_core.ranking import rank_resumes
+from psa_core.incremental import IncrementalAnalysis
+from psa_core.results import AnalysisResult
 import streamlit as st
-from PyPDF2 import PdfReader
-import string
-import io
-import zipfile
-import re
 import json
 import os
 
-# --- TRUST & VISIBILITY TUNER ---
-def calculate_trust_visibility_scores(results):
-    domain_scores = results.get("domain_scores", {})
-    critical_domains = set(results.get("critical_domains", []))
-    domain_gaps = results.get("domain_gaps", {})
-
-    trust_total, trust_count = 0, 0
-    visibility_hits, visibility_total = 0, 0
-
-    for domain, score in domain_scores.items():
-        if domain in critical_domains:
-            trust_total += score
-            trust_count += 1
-        if domain in domain_gaps:
-            visibility_total += len(domain_gaps[domain]) + 1
-            visibility_hits += 1 if score > 40 else 0
-
-    trust_score = trust_total / trust_count if trust_count else 0
-    visibility_score = (visibility_hits / visibility_total) * 100 if visibility_total else 0
-
-    return round(trust_score, 1), round(visibility_score, 1)
-
 def generate_hyperprompt(results):
     soc_group = results.get("predicted_soc_group", "[unknown role]")
     critical_domains = results.get("critical_domains", [])
@@ -74,94 +52,96 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
-@st.cache_data(show_spinner="Loading keyword ontology...")
+# psa_core loads ontology.json from its binary artifact once per process and
+# recompiles only when the file changes, so no Streamlit caching here.
 def load_ontology(ontology_path="ontology.json"):
     if not os.path.exists(ontology_path):
         st.error(f"FATAL: Ontology file not found at '{ontology_path}'.")
         return None
     try:
-        with open(ontology_path, 'r') as f:
-            return json.load(f)
+        return core_ontology.load_ontology(ontology_path)
     except (json.JSONDecodeError, Exception) as e:
         st.error(f"FATAL: Could not read or parse ontology file: {e}")
         return None
 
+def load_compiled_ontology(ontology_path="ontology.json"):
+    if load_ontology(ontology_path) is None:
+        return None
+    return core_ontology.load_compiled_ontology(ontology_path)
+
 def extract_text_from_file(file):
     if file is None: return ""
     try:
-        # Use io.BytesIO to handle the file object correctly
-        file_stream = io.BytesIO(file.getvalue())
-        if file.type == "application/pdf":
-            reader = PdfReader(file_stream)
-            return "\n".join([page.extract_text() or "" for page in reader.pages])
-        else:
-            return file_stream.getvalue().decode("utf-8")
+        # Cached, time-limited extraction lives in psa_core.extraction.
+        with metrics.span("app.extract"):
+            return extraction.extract_text_from_file(file, on_warning=lambda msg: st.warning(f"⚠️ {msg}"))
     except Exception as e:
         st.warning(f"⚠️ Failed to extract text: {e}")
         return ""
 
-def clean_and_extract_words(text):
-    text = re.sub(r'([a-z])([A-Z])', r'\1 \2', text).lower()
-    text = re.sub(r'https?://\S+|\S+@\S+', '', text)
-    text = re.sub(f'[{re.escape(string.punctuation)}0-9]', '', text)
-    return {word for word in text.split() if len(word) > 2}
-
-def run_ontological_analysis(resume_file, jd_file, ontology):
-    resume_text = extract_text_from_file(resume_file)
-    jd_text = extract_text_from_file(jd_file)
-    if not resume_text or not jd_text: return None
+def start_live_editing(results, ontology, match_phrases=False, match_variants=False):
+    # Keeps the JD profile and per-domain counters so resume edits only apply the keyword delta.
+    compiled = ontology.mode(match_phrases, match_variants)
+    st.session_state.live_analysis = IncrementalAnalysis(compiled, results["resume_text"], results["jd_text"])
+    st.session_state.live_resume_text = results["resume_text"]
+    trust_score, visibility_score = calculate_trust_visibility_scores(results)
+    st.session_state.baseline_scores = {"overall_score": results["overall_score"], "trust_score": trust_score, "visibility_score": visibility_score}
 
-    resume_words = clean_and_extract_words(resume_text)
-    jd_words = clean_and_extract_words(jd_text)
+@metrics.timed("app.live_edit")
+def apply_resume_edit():
+    # The edited text stays in this session's IncrementalAnalysis; the shared extraction cache only gets it on export.
+    live = st.session_state.live_analysis
+    live.update(st.session_state.live_resume_text)
+    stored = st.session_state.analysis_results
+    st.session_state.analysis_results = AnalysisResult.from_analysis(
+        live.compiled, live.results(), resume_key=stored.resume_key, jd_key=stored.jd_key)
 
-    signal_domains = ontology.get("SignalDomains", {})
-    soc_groups = ontology.get("SOC_Groups", {})
-
-    best_soc_group, max_soc_score = None, -1
-    
-    # --- FIX STARTS HERE ---
-    # The logic for predicting the job category (SOC group) has been corrected.
-    for group_name, group_data in soc_groups.items():
-        # 1. Get all possible keywords for the current job category from the ontology.
-        group_keywords = {kw for domain in group_data.get("signal_domains", []) for phrase in signal_domains.get(domain, []) for kw in phrase.lower().split()}
-        
-        # 2. Identify which of these keywords are ACTUALLY in the job description.
-        #    This gives us the keywords relevant to THIS specific job.
-        relevant_jd_keywords = jd_words.intersection(group_keywords)
-        
-        # 3. Score the RESUME based on its match with these relevant keywords.
-        #    This measures the alignment between the resume and the role's requirements.
-        score = len(resume_words.intersection(relevant_jd_keywords))
-        
-        # 4. The category with the highest alignment score is chosen as the best fit.
-        if score > max_soc_score:
-            max_soc_score, best_soc_group = score, group_name
-    # --- FIX ENDS HERE ---
+def keep_results(results, ontology, match_phrases=False, match_variants=False):
+    # Session state keeps ids, scores and text hashes; the texts stay in the shared, bounded extraction cache.
+    compiled = ontology.mode(match_phrases, match_variants)
+    st.session_state.analysis_results = AnalysisResult.from_analysis(compiled, results)
 
-    domain_scores, domain_gaps, all_jd_keywords = {}, {}, set()
-    for domain_name, keywords in signal_domains.items():
-        domain_keywords = {kw for phrase in keywords for kw in phrase.lower().split()}
-        total_in_domain_from_jd = domain_keywords.intersection(jd_words)
-        if not total_in_domain_from_jd: continue
-        all_jd_keywords.update(total_in_domain_from_jd)
-        matched_in_domain = total_in_domain_from_jd.intersection(resume_words)
-        domain_scores[domain_name] = (len(matched_in_domain) / len(total_in_domain_from_jd)) * 100 if total_in_domain_from_jd else 0
-        if gaps := total_in_domain_from_jd - resume_words:
-            domain_gaps[domain_name] = sorted(list(gaps))
+def release_uploads(notice=None):
+    # New widget keys clear the uploaders once their files are extracted, so session state holds no UploadedFile.
+    st.session_state.upload_generation = st.session_state.get("upload_generation", 0) + 1
+    # Rerun so the fresh (empty) uploaders replace the ones already drawn this run; otherwise the
+    # next upload lands in a widget that disappears on the following rerun and is lost.
+    st.session_state.upload_notice = notice
+    st.rerun()
 
-    overall_score = (len(all_jd_keywords.intersection(resume_words)) / len(all_jd_keywords)) * 100 if all_jd_keywords else 0
-    suggested_titles = soc_groups.get(best_soc_group, {}).get("example_titles", [])
+def run_ontological_analysis(resume_file, jd_file, ontology, backend="index", match_phrases=False, match_variants=False):
+    # PSA_PROFILE=1 captures a cProfile of the next run; see psa_core.metrics.
+    with metrics.profile_run("analysis"), metrics.span("app.analysis"):
+        resume_text = extract_text_from_file(resume_file)
+        jd_text = extract_text_from_file(jd_file)
+        return analyze_texts(resume_text, jd_text, ontology, backend=backend, match_phrases=match_phrases,
+                             match_variants=match_variants)
 
-    return {
-        "predicted_soc_group": best_soc_group,
-        "critical_domains": soc_groups.get(best_soc_group, {}).get("signal_domains", []),
-        "domain_scores": domain_scores,
-        "domain_gaps": domain_gaps,
-        "overall_score": overall_score,
-        "resume_text": resume_text,
-        "jd_text": jd_text,
-        "suggested_titles": suggested_titles
-    }
+def render_diagnostics():
+    data = metrics.snapshot()
+    if data["stages"]:
+        st.table([
+            {"Stage": name, "Calls": stage["count"], "Last (ms)": f"{stage['last_seconds'] * 1000:.1f}",
+             "Max (ms)": f"{stage['max_seconds'] * 1000:.1f}", "Total (s)": f"{stage['total_seconds']:.3f}"}
+            for name, stage in data["stages"].items()
+        ])
+    else:
+        st.caption("No timings recorded yet. Run an analysis.")
+    cache = data["extraction_cache"]
+    st.caption(f"Extraction cache: {cache['hits']} hits · {cache['disk_hits']} disk hits · {cache['misses']} misses · {cache['entries']} entries")
+    jd_cache = data["jd_profile_cache"]
+    st.caption(f"JD profile cache: {jd_cache['hits']} hits · {jd_cache['misses']} misses · {jd_cache['entries']} entries")
+    if data["counters"]:
+        st.caption(" · ".join(f"{name}: {value:,}" for name, value in data["counters"].items()))
+    st.download_button("⬇️ Metrics (JSON)", metrics.export_json(), file_name="psa_metrics.json", mime="application/json")
+    st.download_button("⬇️ Metrics (Prometheus)", metrics.export_prometheus(), file_name="psa_metrics.prom", mime="text/plain")
+    profile_path, profile_text = metrics.profile_summary()
+    if profile_text:
+        with st.expander(f"cProfile of last captured run ({profile_path})"):
+            st.code(profile_text)
+    if st.button("Reset diagnostics", use_container_width=True):
+        metrics.reset()
+        metrics.rearm_profile()
 
 # --- SIDEBAR UI ---
 with st.sidebar:
@@ -176,24 +156,67 @@ with st.sidebar:
     except NameError:
         current_license_tier = "pro" # Default to pro for testing if function is missing
 
-    ontology = load_ontology()
+    ontology = load_compiled_ontology()
+    analysis_mode = None
 
     if current_license_tier in ["pro", "enterprise"]:
         if license_key or current_license_tier == "pro": # Simplified check
             st.success("✅ Pro License Verified!")
         st.markdown("---")
         st.header("📂 Upload Documents")
-        st.session_state.resume_file = st.file_uploader("Upload your Resume", type=["pdf", "txt"])
-        st.session_state.jd_file = st.file_uploader("Upload the Job Description", type=["pdf", "txt"])
+        analysis_mode = st.radio("Mode", ["Single resume", "Rank candidates"], horizontal=True)
+        upload_generation = st.session_state.get("upload_generation", 0)
+        if analysis_mode == "Single resume":
+            resume_file = st.file_uploader("Upload your Resume", type=["pdf", "txt"], key=f"resume_upload_{upload_generation}")
+        else:
+            resume_archive = st.file_uploader("Upload a ZIP of Resumes", type=["zip"], help="PDF, DOCX and TXT resumes are read straight from the archive.", key=f"archive_upload_{upload_generation}")
+            top_k = st.number_input("Candidates to keep", min_value=1, max_value=100, value=10)
+        jd_file = st.file_uploader("Upload the Job Description", type=["pdf", "txt"], key=f"jd_upload_{upload_generation}")
+        if st.session_state.get("analyzed_files"):
+            st.caption("Last analyzed: " + " · ".join(st.session_state.analyzed_files))
+        if notice := st.session_state.pop("upload_notice", None):
+            st.success(notice)
+        match_phrases = st.checkbox("Match multi-word phrases", help="Treat ontology phrases like 'machine learning' as single keywords instead of separate words.")
+        match_variants = st.checkbox("Match word variants", help="Count forms like 'adapting', 'collaborated' or 'analytical' as the ontology keywords 'adapt', 'collaboration' and 'analytics'.")
 
         st.markdown("---")
-        if st.button("🚀 Analyze Now", use_container_width=True, type="primary"):
-            if st.session_state.resume_file and st.session_state.jd_file and ontology:
-                with st.spinner("Performing deep ontological analysis..."):
-                    st.session_state.analysis_results = run_ontological_analysis(st.session_state.resume_file, st.session_state.jd_file, ontology)
-                st.success("Analysis Complete!")
+        if analysis_mode == "Single resume":
+            if st.button("🚀 Analyze Now", use_container_width=True, type="primary"):
+                if resume_file and jd_file and ontology:
+                    with st.spinner("Performing deep ontological analysis..."):
+                        results = run_ontological_analysis(resume_file, jd_file, ontology, match_phrases=match_phrases, match_variants=match_variants)
+                        st.session_state.analysis_results = None
+                        if results:
+                            start_live_editing(results, ontology, match_phrases, match_variants)
+                            keep_results(results, ontology, match_phrases, match_variants)
+                            st.session_state.analyzed_files = (resume_file.name, jd_file.name)
+                            release_uploads(notice="Analysis Complete!")
+                        else:
+                            st.warning("Analysis could not be completed. Please check the uploaded documents.")
+                else:
+                    st.warning("Please upload both documents and ensure ontology is loaded.")
+        elif st.button("🏆 Rank Candidates", use_container_width=True, type="primary"):
+            jd_text = extract_text_from_file(jd_file)
+            if resume_archive and jd_text and ontology:
+                progress = st.progress(0.0, text="Ranking resumes...")
+
+                def show_progress(done, total, ranker):
+                    # Redraw about once per percent so large archives don't flood the frontend.
+                    if done == total or done % max(1, total // 100) == 0:
+                        leader = next(iter(ranker.ranked()), None)
+                        leader_text = f" · leader: {leader[0]} ({leader[1]['overall_score']:.1f}%)" if leader else ""
+                        progress.progress(done / total, text=f"Scored {done}/{total} resumes{leader_text}")
+
+                try:
+                    with metrics.span("app.rank"):
+                        ranked, skipped = rank_resumes(jd_text, resume_archive, ontology, k=int(top_k), match_phrases=match_phrases, match_variants=match_variants, on_progress=show_progress)
+                    st.session_state.ranking_results = {"ranked": ranked, "skipped": skipped}
+                    st.session_state.analyzed_files = (resume_archive.name, jd_file.name)
+                    release_uploads(notice=f"Ranked {len(ranked)} top candidates!")
+                except Exception as e:
+                    st.warning(f"⚠️ Could not read the resume archive: {e}")
             else:
-                st.warning("Please upload both documents and ensure ontology is loaded.")
+                st.warning("Please upload a resume ZIP and a job description, and ensure ontology is loaded.")
     else:
         if license_key: st.error("Invalid License Key.")
         st.info("Enter a valid license key to begin.")
@@ -204,13 +227,31 @@ with st.sidebar:
 st.title("📄 PSA™ Resume & Career Optimizer")
 st.caption("Part of the Presence Signaling Architecture (PSA™) and AI as Presence Interface (AIaPI™) framework.")
 
-if 'analysis_results' not in st.session_state or st.session_state.analysis_results is None:
+if st.session_state.get("ranking_results") and analysis_mode == "Rank candidates":
+    ranking = st.session_state.ranking_results
+    st.header("🏆 Top Candidates")
+    st.table([
+        {
+            "Rank": rank,
+            "Resume": name,
+            "Match Score": f"{analysis['overall_score']:.1f}%",
+            "Trust Score": f"{analysis['trust_score']}%",
+            "Visibility Score": f"{analysis['visibility_score']}%",
+            "Predicted Job Category": analysis["predicted_soc_group"],
+        }
+        for rank, (name, analysis) in enumerate(ranking["ranked"], 1)
+    ])
+    if ranking["skipped"]:
+        with st.expander(f"⚠️ {len(ranking['skipped'])} resumes could not be scored"):
+            for name, reason in ranking["skipped"]:
+                st.markdown(f"- **{name}**: {reason}")
+elif 'analysis_results' not in st.session_state or st.session_state.analysis_results is None:
     st.info("Welcome! Please enter your license key and upload your documents in the sidebar to begin.")
 else:
     results = st.session_state.analysis_results
     # It's good practice to provide default tabs even if results are partial
-    tab_names = ["📊 Strategic Scorecard", "🔍 Gap Analysis", "💼 Career Suggestions", "🤖 AI Hyper-Prompt"]
-    tab1, tab2, tab3, tab4 = st.tabs(tab_names)
+    tab_names = ["📊 Strategic Scorecard", "🔍 Gap Analysis", "💼 Career Suggestions", "🤖 AI Hyper-Prompt", "✏️ Live Editor"]
+    tab1, tab2, tab3, tab4, tab5 = st.tabs(tab_names)
 
     with tab1:
         st.header("📝 Analysis Summary")
@@ -229,6 +270,19 @@ else:
         st.subheader("Predicted Job Category")
         soc_group = results.get('predicted_soc_group')
         st.info(f"**{soc_group}**" if soc_group else "Could not determine job category.")
+        top_soc_groups = results.get("top_soc_groups", [])
+        if top_soc_groups:
+            st.caption("Closest occupation groups, by JD keywords your resume matches.")
+            st.table([
+                {
+                    "Rank": rank,
+                    "Job Category": match["group"],
+                    "Matched Keywords": match["score"],
+                    "JD Coverage": f"{match['coverage']:.0f}%",
+                    "Evidence": ", ".join(match["evidence"][:8]) + (" …" if len(match["evidence"]) > 8 else ""),
+                }
+                for rank, match in enumerate(top_soc_groups, 1)
+            ])
 
         st.subheader("Your Signal Domain Scores")
         st.caption("This shows alignment with strategic skill areas.")
@@ -243,7 +297,15 @@ else:
         else:
             st.write("No domain scores could be calculated.")
 
-    with tab2:
+        # The bundle is only built when the button is clicked; unchanged PDFs come from the artifact cache.
+        # Live edits reach the shared extraction cache here, not on every keystroke.
+        live = st.session_state.get("live_analysis")
+        st.download_button("📦 Download Report Bundle (.zip)",
+                           data=lambda: export.bundle_bytes(export.analysis_report_members(
+                               results.with_resume_text(live.resume_text) if live else results, generate_hyperprompt(results))),
+                           file_name="psa_report_bundle.zip", mime="application/zip", on_click="ignore")
+
+    with tab2, metrics.span("app.render_gap_tab"):
         st.header("Keyword Gap Analysis")
         st.info("Important JD keywords missing from your resume.")
         domain_gaps = results.get('domain_gaps', {})
@@ -272,3 +334,25 @@ else:
         st.info("Use this hyperprompt in ChatGPT, Claude, or Gemini.")
         hyper_prompt = generate_hyperprompt(results)
         st.text_area("Hyper-Prompt", hyper_prompt, height=250)
+
+    with tab5:
+        st.header("Edit Your Resume Live")
+        st.info("Add missing keywords below; scores in every tab update from your edits without re-running the analysis.")
+        if "live_analysis" in st.session_state:
+            baseline = st.session_state.baseline_scores
+            trust_score, visibility_score = calculate_trust_visibility_scores(results)
+            cols = st.columns(3)
+            with cols[0]:
+                st.metric("Overall Resume Match Score", f"{results['overall_score']:.1f}%", delta=f"{results['overall_score'] - baseline['overall_score']:+.1f}%")
+            with cols[1]:
+                st.metric("Trust Score", f"{trust_score}%", delta=f"{trust_score - baseline['trust_score']:+.1f}%")
+            with cols[2]:
+                st.metric("Visibility Score", f"{visibility_score}%", delta=f"{visibility_score - baseline['visibility_score']:+.1f}%")
+            st.text_area("Resume Text", key="live_resume_text", height=400, on_change=apply_resume_edit)
+        else:
+            st.write("Run an analysis to start editing.")
+
+# Rendered last so the panel includes this run's render timings.
+with st.sidebar:
+    if st.checkbox("🩺 Show diagnostics", help="Per-stage timings, document counters and cache hit rates for this server process."):
+        render_diagnostics()
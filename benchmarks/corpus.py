@@ -0,0 +1,188 @@
+"""
+Seeded synthetic resume/JD corpus for the benchmark suite.
+
+Documents are built from the ontology.json vocabulary (signal-domain phrases
+and SOC example titles) mixed with ordinary resume filler, so scoring sees a
+realistic share of matches and misses. The same seed and size always give
+the same text; PDF and DOCX files are rendered from that text.
+
+    python benchmarks/corpus.py --out corpus/ [--sizes 1,10,200] [--seed 7]
+
+writes resume_<pages>p.{txt,pdf,docx} and jd_<pages>p.{txt,pdf,docx} for each size.
+"""
+import argparse
+import io
+import json
+import os
+import random
+import sys
+import zipfile
+from xml.sax.saxutils import escape
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+WORDS_PER_PAGE = 450
+FORMATS = ("txt", "pdf", "docx")
+FILLER = (
+    "led delivered managed built improved across teams with the for and to of a in on by "
+    "stakeholders customers program project quarterly annual results initiative operations "
+    "responsible supported partnered reduced increased launched coordinated drove owned"
+).split()
+VERBS = ["Led", "Delivered", "Built", "Drove", "Owned", "Launched", "Improved", "Managed", "Designed"]
+SECTIONS = ["Summary", "Experience", "Projects", "Skills", "Education", "Certifications"]
+
+
+def load_ontology_json(ontology_path):
+    with open(ontology_path, encoding="utf-8-sig") as f:
+        return json.load(f)
+
+
+def gap_ontology(ontology_path):
+    """A psa_score_engine-style ontology (name/terms/aliases per domain) derived from ontology.json."""
+    signal_domains = load_ontology_json(ontology_path).get("SignalDomains", {})
+    return [{"name": name, "terms": list(phrases), "aliases": []} for name, phrases in signal_domains.items()]
+
+
+def ontology_vocabulary(ontology_path):
+    ontology = load_ontology_json(ontology_path)
+    phrases = sorted({p for ps in ontology.get("SignalDomains", {}).values() for p in ps})
+    titles = sorted({t for g in ontology.get("SOC_Groups", {}).values() for t in g.get("example_titles", [])})
+    return phrases, titles
+
+
+class CorpusGenerator:
+    """Generates resume and JD text of a given length in pages, deterministically per (seed, kind, pages)."""
+
+    def __init__(self, ontology_path=os.path.join(ROOT, "ontology.json"), seed=7):
+        self.phrases, self.titles = ontology_vocabulary(ontology_path)
+        self.seed = seed
+
+    def _rng(self, kind, pages):
+        return random.Random(f"{self.seed}-{kind}-{pages}")
+
+    def _sentence(self, rng, keyword_share):
+        words = [rng.choice(VERBS)]
+        for _ in range(rng.randint(10, 22)):
+            words.append(rng.choice(self.phrases) if rng.random() < keyword_share else rng.choice(FILLER))
+        return " ".join(words) + "."
+
+    def resume_text(self, pages):
+        rng = self._rng("resume", pages)
+        lines = ["Jordan Example", "jordan@example.com | linkedin.com/in/jordan-example"]
+        target, count = pages * WORDS_PER_PAGE, 0
+        while count < target:
+            lines += ["", rng.choice(SECTIONS)]
+            if self.titles:
+                lines.append(f"{rng.choice(self.titles)}, Example Corp, {rng.randint(2005, 2024)}")
+            for _ in range(rng.randint(3, 8)):
+                sentence = self._sentence(rng, keyword_share=0.3)
+                lines.append(f"- {sentence}")
+                count += len(sentence.split())
+        return "\n".join(lines)
+
+    def jd_text(self, pages):
+        rng = self._rng("jd", pages)
+        title = rng.choice(self.titles) if self.titles else "Program Lead"
+        lines = [f"Job Title: {title}", "", "Responsibilities"]
+        target, count = pages * WORDS_PER_PAGE, 0
+        while count < target:
+            sentence = self._sentence(rng, keyword_share=0.45)
+            lines.append(f"- {sentence}")
+            count += len(sentence.split())
+            if rng.random() < 0.1:
+                lines += ["", rng.choice(["Requirements", "Preferred Qualifications", "About the Team"])]
+        return "\n".join(lines)
+
+    def text(self, kind, pages):
+        return self.resume_text(pages) if kind == "resume" else self.jd_text(pages)
+
+    def document(self, kind, pages, fmt):
+        """Returns (filename, bytes) for a resume or JD of the given size and format."""
+        text = self.text(kind, pages)
+        name = f"{kind}_{pages}p.{fmt}"
+        if fmt == "txt":
+            return name, text.encode("utf-8")
+        if fmt == "pdf":
+            from psa_core.export import render_pdf
+            return name, render_pdf(text, title=kind.upper())
+        if fmt == "docx":
+            return name, docx_bytes(text, header=kind.upper())
+        raise ValueError(f"Unknown format {fmt!r}; expected one of {FORMATS}.")
+
+
+CONTENT_TYPES = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">
+<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>
+<Default Extension="xml" ContentType="application/xml"/>
+<Override PartName="/word/document.xml" ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>
+<Override PartName="/word/header1.xml" ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.header+xml"/>
+</Types>"""
+PACKAGE_RELS = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">
+<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" Target="word/document.xml"/>
+</Relationships>"""
+DOCUMENT_RELS = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">
+<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/header" Target="header1.xml"/>
+</Relationships>"""
+W_NS = 'xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"'
+R_NS = 'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships"'
+
+
+def _paragraph(text):
+    return f'<w:p><w:r><w:t xml:space="preserve">{escape(text)}</w:t></w:r></w:p>'
+
+
+def docx_bytes(text, header=None):
+    """A minimal WordprocessingML package: one paragraph per line, skills lines as a table, optional header."""
+    body = []
+    for line in text.split("\n"):
+        if line.startswith("- ") and len(body) % 7 == 0:
+            # Every so often a bullet becomes a two-cell table row, as resume templates do.
+            first, _, rest = line[2:].partition(" ")
+            body.append(f"<w:tbl><w:tr><w:tc>{_paragraph(first)}</w:tc><w:tc>{_paragraph(rest)}</w:tc></w:tr></w:tbl>")
+        else:
+            body.append(_paragraph(line))
+    section = '<w:sectPr><w:headerReference w:type="default" r:id="rId1"/></w:sectPr>' if header else ""
+    document = (f'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+                f'<w:document {W_NS} {R_NS}><w:body>{"".join(body)}{section}</w:body></w:document>')
+
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr("[Content_Types].xml", CONTENT_TYPES)
+        archive.writestr("_rels/.rels", PACKAGE_RELS)
+        archive.writestr("word/document.xml", document)
+        if header:
+            archive.writestr("word/_rels/document.xml.rels", DOCUMENT_RELS)
+            archive.writestr("word/header1.xml", f'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+                                                 f'<w:hdr {W_NS}>{_paragraph(header)}</w:hdr>')
+    return buffer.getvalue()
+
+
+def parse_sizes(value):
+    return [int(size) for size in value.split(",") if size.strip()]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--out", required=True, help="directory to write the corpus into")
+    parser.add_argument("--sizes", type=parse_sizes, default=[1, 10, 200], help="comma-separated sizes in pages")
+    parser.add_argument("--formats", default=",".join(FORMATS))
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--ontology", default=os.path.join(ROOT, "ontology.json"))
+    args = parser.parse_args(argv)
+
+    generator = CorpusGenerator(args.ontology, args.seed)
+    os.makedirs(args.out, exist_ok=True)
+    for pages in args.sizes:
+        for kind in ("resume", "jd"):
+            for fmt in args.formats.split(","):
+                name, data = generator.document(kind, pages, fmt)
+                with open(os.path.join(args.out, name), "wb") as f:
+                    f.write(data)
+                print(f"{name}: {len(data):,} bytes")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Import-time benchmark for the headless scoring core.
+
+Each target is imported in a fresh interpreter several times; the median
+wall-clock import time is reported along with any heavy dependency that the
+import dragged in. Exits non-zero if a psa_core module pulls in Streamlit,
+PyPDF2, python-docx, reportlab, pandas or numpy at import time.
+
+    python benchmarks/import_time.py [--runs 7]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAVY_MODULES = ["streamlit", "PyPDF2", "docx", "reportlab", "pandas", "numpy", "scipy"]
+CORE_TARGETS = ["psa_core.scoring", "psa_core.extraction", "psa_core.ontology"]
+REFERENCE_TARGETS = ["streamlit", "pandas", "PyPDF2"]
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import {target}
+elapsed = time.perf_counter() - start
+print(json.dumps({{"seconds": elapsed, "heavy": [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+
+def time_import(target, runs):
+    timings, heavy = [], []
+    for _ in range(runs):
+        out = subprocess.run(
+            [sys.executable, "-c", PROBE.format(target=target, heavy=HEAVY_MODULES)],
+            cwd=ROOT, capture_output=True, text=True, check=True)
+        result = json.loads(out.stdout)
+        timings.append(result["seconds"])
+        heavy = result["heavy"]
+    return statistics.median(timings), heavy
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=7)
+    args = parser.parse_args()
+
+    failed = False
+    print(f"{'module':<24}{'median ms':>12}  heavy imports")
+    for target in CORE_TARGETS + REFERENCE_TARGETS:
+        try:
+            seconds, heavy = time_import(target, args.runs)
+        except subprocess.CalledProcessError:
+            print(f"{target:<24}{'n/a':>12}  (not installed)")
+            continue
+        print(f"{target:<24}{seconds * 1000:>12.1f}  {', '.join(heavy) or '-'}")
+        if target in CORE_TARGETS and heavy:
+            failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
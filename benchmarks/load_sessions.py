@@ -0,0 +1,359 @@
+"""
+Concurrent-session load test for the Streamlit apps, run headless with
+Streamlit's AppTest.
+
+Each simulated user is its own AppTest session, driven from a thread the way
+the Streamlit server runs every session's script in a thread of one
+process: enter a license key, upload a resume and a JD from the synthetic
+corpus, then analyze (the "🚀 Analyze Now" button in app.py; in
+resume_optimizer_view the upload itself triggers the analysis). Every
+rerun is timed. Each analysis uploads a different resume against the same
+JD, so the shared caches see the many-candidates-per-posting pattern; the
+extraction cache is emptied before each level.
+
+For each concurrency level the report gives rerun latency percentiles by
+step, completed analyses per second, and process RSS growth per live
+session (sessions and their state stay alive until the level ends). The
+first level whose analyze p95 exceeds --degrade-factor times the lowest
+level's p95 is reported as the point where latency degrades.
+
+    python benchmarks/load_sessions.py --app app --sessions 1,4,8,16 [--iterations 2] [--pages 2 --format pdf]
+    python benchmarks/load_sessions.py --app optimizer --sessions 1,8 --json
+
+The apps read ontology.json, config.yaml and psa_ontology_comprehensive_with_alias.json
+from the working directory, so the run happens in a temporary directory
+holding the first two and a gap ontology derived from ontology.json.
+"""
+import argparse
+import contextlib
+import gc
+import json
+import logging
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock, patch
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+import streamlit as st  # noqa: E402
+from streamlit.components.v2.component_manager import BidiComponentManager  # noqa: E402
+from streamlit.runtime import Runtime  # noqa: E402
+from streamlit.runtime.caching.storage.dummy_cache_storage import MemoryCacheStorageManager  # noqa: E402
+from streamlit.runtime.dataframe_source_manager import DataframeSourceManager  # noqa: E402
+from streamlit.runtime.media_file_manager import MediaFileManager  # noqa: E402
+from streamlit.runtime.memory_media_file_storage import MemoryMediaFileStorage  # noqa: E402
+from streamlit.runtime.scriptrunner.script_cache import ScriptCache  # noqa: E402
+from streamlit.runtime.secrets import Secrets  # noqa: E402
+from streamlit.testing.v1 import AppTest  # noqa: E402
+from streamlit.testing.v1.util import patch_config_options  # noqa: E402
+
+from corpus import CorpusGenerator, gap_ontology  # noqa: E402
+from psa_core.extraction_cache import get_extraction_cache  # noqa: E402
+
+# AppTest sessions run in bare mode, which logs a warning for every st.* call outside a script run, and
+# resume_optimizer_view logs a deprecation notice per chart on every rerun; neither says anything about load.
+# A filter rather than a level, since Streamlit resets its loggers' levels when it reads its config.
+# Spawned PDF/export workers still print a few: they re-run the app script, Streamlit's __main__, at start-up.
+for name in ("streamlit.runtime.scriptrunner_utils.script_run_context", "streamlit.deprecation_util"):
+    logging.getLogger(name).addFilter(lambda record: record.levelno >= logging.ERROR)
+
+LICENSE_KEY = "PSA-LOAD-TEST"
+SECRETS = {"license_tiers": {LICENSE_KEY: "pro"}, "valid_keys": [LICENSE_KEY]}
+MIME_TYPES = {
+    "pdf": "application/pdf",
+    "txt": "text/plain",
+    "docx": "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+}
+OPTIMIZER_SCRIPT = "from resume_optimizer_view import resume_optimizer_view\nresume_optimizer_view()\n"
+# app.py takes PDF/TXT uploads; resume_optimizer_view takes PDF/DOCX.
+APP_FORMATS = {"app": ("pdf", "txt"), "optimizer": ("pdf", "docx")}
+
+
+def current_rss():
+    """Resident set size of this process in bytes (Linux /proc; peak RSS elsewhere)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+
+
+def percentile(values, pct):
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * pct / 100
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def prepare_workdir(ontology_path):
+    """A temporary working directory with the files the apps open by relative path."""
+    workdir = tempfile.mkdtemp(prefix="psa_load_")
+    shutil.copy(ontology_path, os.path.join(workdir, "ontology.json"))
+    shutil.copy(os.path.join(ROOT, "config.yaml"), os.path.join(workdir, "config.yaml"))
+    gap_path = os.path.join(ROOT, "psa_ontology_comprehensive_with_alias.json")
+    if os.path.exists(gap_path):
+        shutil.copy(gap_path, workdir)
+    else:
+        with open(os.path.join(workdir, "psa_ontology_comprehensive_with_alias.json"), "w") as f:
+            json.dump({"SignalDomains": gap_ontology(ontology_path)}, f)
+    return workdir
+
+
+@contextlib.contextmanager
+def shared_streamlit_runtime(secrets):
+    """
+    AppTest swaps process-wide state in and out around every run (the Runtime
+    singleton, st.secrets, the global.appTest option), so concurrent sessions
+    tear it down under each other. Like a real server, give every session one
+    shared runtime, one set of secrets and one script cache for the whole load
+    test. AppTest otherwise builds a fresh ScriptCache per run, so every rerun
+    recompiles the script in parallel, and ast.parse is not thread-safe on
+    CPython 3.11.
+    """
+    script_cache = ScriptCache()
+    runtime = MagicMock(spec=Runtime)
+    runtime.media_file_mgr = MediaFileManager(MemoryMediaFileStorage("/mock/media"))
+    runtime.dataframe_source_mgr = DataframeSourceManager()
+    runtime.cache_storage_manager = MemoryCacheStorageManager()
+    runtime.bidi_component_registry = BidiComponentManager()
+    shared_secrets = Secrets()
+    shared_secrets._secrets = secrets
+    saved_secrets, st.secrets = st.secrets, shared_secrets
+    try:
+        # Nested patches inside each run save and restore True, so the option stays set throughout.
+        with patch_config_options({"global.appTest": True}), \
+                patch.object(Runtime, "instance", classmethod(lambda cls: runtime)), \
+                patch.object(Runtime, "exists", classmethod(lambda cls: True)), \
+                patch("streamlit.testing.v1.app_test.ScriptCache", lambda: script_cache), \
+                patch("streamlit.testing.v1.local_script_runner.ScriptCache", lambda: script_cache):
+            yield runtime
+    finally:
+        st.secrets = saved_secrets
+
+
+class Session:
+    """One simulated user. timings collects (step, seconds) for every rerun."""
+
+    def __init__(self, app, resumes, jd, timeout):
+        self.app = app
+        self.resumes = iter(resumes)
+        self.jd = jd
+        if app == "app":
+            self.at = AppTest.from_file(os.path.join(ROOT, "app.py"), default_timeout=timeout)
+        else:
+            self.at = AppTest.from_string(OPTIMIZER_SCRIPT, default_timeout=timeout)
+        self.timings = []
+        self.analyses = 0
+        self.errors = []
+
+    def _timed(self, step, action):
+        start = time.perf_counter()
+        action()
+        self.timings.append((step, time.perf_counter() - start))
+        if self.at.exception:
+            self.errors.append(f"{step}: {self.at.exception[0].message}")
+            return False
+        return True
+
+    def start(self):
+        at = self.at
+        return (self._timed("load", at.run)
+                and self._timed("license", lambda: self._license_input().input(LICENSE_KEY).run()))
+
+    def _license_input(self):
+        return self.at.sidebar.text_input[0] if self.app == "app" else self.at.text_input[0]
+
+    def analyze(self):
+        """Uploads the resume and JD and runs one analysis. Returns True on success."""
+        at, resume, jd = self.at, next(self.resumes), self.jd
+        if self.app == "app":
+            # Uploader keys change after each analysis (uploads are released), so look them up fresh.
+            uploaders = at.sidebar.file_uploader
+            uploaders[0].set_value(resume)
+            uploaders[1].set_value(jd)
+            if not self._timed("upload", at.run):
+                return False
+            button = next(b for b in at.sidebar.button if "Analyze" in b.label)
+            ok = self._timed("analyze", lambda: button.click().run())
+            ok = ok and any("Analysis Complete" in s.value for s in at.sidebar.success)
+        else:
+            at.file_uploader[0].set_value(jd)
+            at.file_uploader[1].set_value(resume)
+            ok = self._timed("analyze", at.run) and len(at.metric) > 0
+        if ok:
+            self.analyses += 1
+        elif not self.errors:
+            self.errors.append("analysis produced no result")
+        return ok
+
+
+def run_session(app, resumes, jd, iterations, timeout, barrier):
+    session = Session(app, resumes, jd, timeout)
+    try:
+        if session.start():
+            # Everyone logs in first, then all sessions analyze at once.
+            barrier.wait()
+            for _ in range(iterations):
+                if not session.analyze():
+                    break
+        else:
+            barrier.abort()
+    except threading.BrokenBarrierError:
+        session.errors.append("another session failed to start")
+    except Exception as e:
+        session.errors.append(f"{type(e).__name__}: {e}")
+        barrier.abort()
+    return session
+
+
+def run_level(app, sessions, fixtures, iterations, timeout):
+    """
+    Runs `sessions` concurrent users. fixtures is (resumes, jd); session i
+    uploads resumes[i * iterations:(i + 1) * iterations]. Returns (stats
+    dict, live Session objects).
+    """
+    resumes, jd = fixtures
+    get_extraction_cache().clear()
+    gc.collect()
+    rss_before = current_rss()
+    barrier = threading.Barrier(sessions)
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=sessions, thread_name_prefix="psa-session") as pool:
+        live = list(pool.map(
+            lambda i: run_session(app, resumes[i * iterations:(i + 1) * iterations], jd, iterations, timeout, barrier),
+            range(sessions)))
+    elapsed = time.perf_counter() - start
+    gc.collect()
+    rss_after = current_rss()
+
+    steps = {}
+    for session in live:
+        for step, seconds in session.timings:
+            steps.setdefault(step, []).append(seconds)
+    analyses = sum(session.analyses for session in live)
+    analyze_times = steps.get("analyze", [])
+    stats = {
+        "sessions": sessions,
+        "analyses": analyses,
+        "errors": [error for session in live for error in session.errors],
+        "wall_seconds": elapsed,
+        "throughput_per_s": analyses / elapsed if elapsed else 0.0,
+        "rss_growth_bytes": rss_after - rss_before,
+        "rss_per_session_bytes": (rss_after - rss_before) / sessions,
+        "latency": {
+            step: {"count": len(times), "p50": percentile(times, 50), "p90": percentile(times, 90),
+                   "p95": percentile(times, 95), "p99": percentile(times, 99), "max": max(times),
+                   "mean": statistics.fmean(times)}
+            for step, times in steps.items()
+        },
+        "analyze_p95": percentile(analyze_times, 95),
+    }
+    return stats, live
+
+
+def build_fixtures(ontology_path, seed, fmt, pages, count):
+    """count distinct resumes (one per corpus seed) plus one shared JD, as (name, bytes, MIME type) uploads."""
+    resumes = []
+    for offset in range(count + 1):
+        name, data = CorpusGenerator(ontology_path, seed + offset).document("resume", pages, fmt)
+        resumes.append((f"{offset}_{name}", data, MIME_TYPES[fmt]))
+    name, data = CorpusGenerator(ontology_path, seed).document("jd", 1, fmt)
+    return resumes, (name, data, MIME_TYPES[fmt])
+
+
+def find_degradation(levels, factor):
+    """First level whose analyze p95 exceeds factor x the lowest level's p95, or None."""
+    measured = [level for level in levels if level["analyze_p95"] is not None]
+    if not measured:
+        return None
+    reference = measured[0]["analyze_p95"]
+    for level in measured[1:]:
+        if level["analyze_p95"] > factor * reference:
+            return level["sessions"]
+    return None
+
+
+def parse_levels(value):
+    return [int(level) for level in value.split(",") if level.strip()]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--app", choices=sorted(APP_FORMATS), default="app")
+    parser.add_argument("--sessions", type=parse_levels, default=[1, 4, 8], help="comma-separated concurrency levels")
+    parser.add_argument("--iterations", type=int, default=2, help="analyses per session")
+    parser.add_argument("--pages", type=int, default=2, help="resume length in pages (the JD is one page)")
+    parser.add_argument("--format", help="upload format (app: pdf/txt, optimizer: pdf/docx); default pdf")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--timeout", type=float, default=120, help="per-rerun timeout in seconds")
+    parser.add_argument("--degrade-factor", type=float, default=2.0)
+    parser.add_argument("--ontology", default=os.path.join(ROOT, "ontology.json"))
+    parser.add_argument("--json", action="store_true", help="print the full report as JSON")
+    args = parser.parse_args(argv)
+
+    fmt = args.format or "pdf"
+    if fmt not in APP_FORMATS[args.app]:
+        parser.error(f"--app {args.app} accepts {' or '.join(APP_FORMATS[args.app])} uploads")
+    fixtures = build_fixtures(args.ontology, args.seed, fmt, args.pages, max(args.sessions) * args.iterations)
+
+    workdir = prepare_workdir(args.ontology)
+    previous_cwd = os.getcwd()
+    os.chdir(workdir)
+    levels = []
+    try:
+        with shared_streamlit_runtime({"psa": SECRETS}):
+            # Warm-up session: imports, ontology compile and cache set-up are not charged to level 1.
+            run_level(args.app, 1, (fixtures[0][-1:], fixtures[1]), 1, args.timeout)
+            for sessions in args.sessions:
+                stats, live = run_level(args.app, sessions, fixtures, args.iterations, args.timeout)
+                levels.append(stats)
+                del live
+                if not args.json:
+                    analyze = stats["latency"].get("analyze", {})
+                    print(f"{sessions:>4} sessions  analyze p50 {_ms(analyze.get('p50'))}  p95 {_ms(analyze.get('p95'))}"
+                          f"  p99 {_ms(analyze.get('p99'))}  {stats['throughput_per_s']:6.2f} analyses/s"
+                          f"  RSS +{stats['rss_per_session_bytes'] / 1e6:6.2f} MB/session"
+                          f"  errors {len(stats['errors'])}", flush=True)
+    finally:
+        os.chdir(previous_cwd)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    degraded_at = find_degradation(levels, args.degrade_factor)
+    report = {
+        "app": args.app,
+        "format": fmt,
+        "resume_pages": args.pages,
+        "iterations": args.iterations,
+        "cpus": os.cpu_count(),
+        "levels": levels,
+        "degrades_at_sessions": degraded_at,
+    }
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+    for level in levels:
+        for error in sorted(set(level["errors"]))[:3]:
+            print(f"  [{level['sessions']} sessions] {error}")
+    if degraded_at:
+        print(f"analyze p95 exceeds {args.degrade_factor:g}x the {levels[0]['sessions']}-session p95 at {degraded_at} sessions.")
+    else:
+        print(f"analyze p95 stayed within {args.degrade_factor:g}x the {levels[0]['sessions']}-session p95 at every level.")
+
+
+def _ms(seconds):
+    return f"{seconds * 1000:8.1f} ms" if seconds is not None else "       - ms"
+
+
+if __name__ == "__main__":
+    main()
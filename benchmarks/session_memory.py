@@ -0,0 +1,134 @@
+"""
+Per-session memory of the single-resume flow in app.py.
+
+Builds the session state one analysis leaves behind, in the previous layout
+(both UploadedFile objects in st.session_state, uploads kept by Streamlit's
+file manager, results dict carrying both texts) and in the current one
+(AnalysisResult with ids and text hashes, uploaders cleared by new widget
+keys), and reports the bytes each session holds privately. Streamlit keeps
+the uploaded bytes in its file manager in both layouts until the session ends. The compiled ontology and the bounded
+extraction cache are shared by every session and are not counted.
+
+    python benchmarks/session_memory.py [--resume resume.pdf --jd jd.pdf] [--words 1500] [--json]
+"""
+import argparse
+import json
+import os
+import random
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from streamlit.runtime.memory_uploaded_file_manager import MemoryUploadedFileManager  # noqa: E402
+from streamlit.runtime.uploaded_file_manager import UploadedFile, UploadedFileRec  # noqa: E402
+
+from psa_core.extraction import extract_text_from_file  # noqa: E402
+from psa_core.incremental import IncrementalAnalysis  # noqa: E402
+from psa_core.ontology import load_compiled_ontology  # noqa: E402
+from psa_core.results import AnalysisResult  # noqa: E402
+from psa_core.scoring import analyze_texts, calculate_trust_visibility_scores  # noqa: E402
+
+SESSION_ID = "bench-session"
+
+
+def deep_size(obj, shared_ids, seen=None):
+    """sys.getsizeof over everything reachable from obj, skipping shared objects and anything seen already."""
+    seen = set() if seen is None else seen
+    stack, total = [obj], 0
+    while stack:
+        item = stack.pop()
+        if id(item) in seen or id(item) in shared_ids:
+            continue
+        seen.add(id(item))
+        total += sys.getsizeof(item)
+        if isinstance(item, dict):
+            stack.extend(item.keys())
+            stack.extend(item.values())
+        elif isinstance(item, (list, tuple, set, frozenset)):
+            stack.extend(item)
+        if hasattr(item, "__dict__") and not isinstance(item, type):
+            stack.append(vars(item))
+        for slot in getattr(type(item), "__slots__", ()):
+            if hasattr(item, slot):
+                stack.append(getattr(item, slot))
+    return total
+
+
+def synthetic_document(compiled, words, seed):
+    rng = random.Random(seed)
+    vocab = compiled.keywords + ["experience", "team", "project", "delivered", "across", "with"] * 20
+    return " ".join(rng.choice(vocab) for _ in range(words)).encode("utf-8"), "text/plain"
+
+
+def upload(manager, file_id, name, data, content_type):
+    manager.add_file(SESSION_ID, UploadedFileRec(file_id, name, content_type, data))
+    record = manager.get_files(SESSION_ID, [file_id])[0]
+    return UploadedFile(record, None)
+
+
+def measure(resume, jd, compiled):
+    """Returns per-session byte counts for the previous and current session layouts."""
+    shared_ids = {id(compiled)}
+    results = {}
+    for layout in ("previous", "current"):
+        manager = MemoryUploadedFileManager("/upload")
+        resume_file = upload(manager, "resume", *resume)
+        jd_file = upload(manager, "jd", *jd)
+        resume_text, jd_text = extract_text_from_file(resume_file), extract_text_from_file(jd_file)
+        analysis = analyze_texts(resume_text, jd_text, compiled)
+        trust, visibility = calculate_trust_visibility_scores(analysis)
+        state = {
+            "live_analysis": IncrementalAnalysis(compiled, resume_text, jd_text),
+            "live_resume_text": resume_text,
+            "baseline_scores": {"overall_score": analysis["overall_score"], "trust_score": trust, "visibility_score": visibility},
+        }
+        if layout == "previous":
+            state.update(resume_file=resume_file, jd_file=jd_file, analysis_results=analysis)
+        else:
+            state.update(analysis_results=AnalysisResult.from_analysis(compiled, analysis),
+                         analyzed_files=(resume_file.name, jd_file.name), upload_generation=1)
+            del resume_file, jd_file
+        seen = set()
+        results[layout] = {
+            "session_state_bytes": deep_size(state, shared_ids, seen),
+            "upload_manager_bytes": manager._total_bytes,
+            "results_bytes": deep_size(state["analysis_results"], shared_ids),
+        }
+        results[layout]["total_bytes"] = results[layout]["session_state_bytes"] + results[layout]["upload_manager_bytes"]
+    return results
+
+
+def read_document(path):
+    with open(path, "rb") as f:
+        data = f.read()
+    content_type = "application/pdf" if path.lower().endswith(".pdf") else "text/plain"
+    return os.path.basename(path), data, content_type
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--resume", help="resume file (PDF or TXT); synthetic text if omitted")
+    parser.add_argument("--jd", help="job description file; synthetic text if omitted")
+    parser.add_argument("--words", type=int, default=1500, help="length of synthetic documents")
+    parser.add_argument("--ontology", default=os.path.join(ROOT, "ontology.json"))
+    parser.add_argument("--json", action="store_true", help="print raw numbers as JSON")
+    args = parser.parse_args(argv)
+
+    compiled = load_compiled_ontology(args.ontology)
+    resume = read_document(args.resume) if args.resume else ("resume.txt", *synthetic_document(compiled, args.words, 1))
+    jd = read_document(args.jd) if args.jd else ("jd.txt", *synthetic_document(compiled, args.words // 3, 2))
+    results = measure(resume, jd, compiled)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(f"resume {len(resume[1]):,} bytes, JD {len(jd[1]):,} bytes")
+    print(f"{'layout':<10}{'session_state':>16}{'uploads kept':>16}{'results':>12}{'total':>12}")
+    for layout, numbers in results.items():
+        print(f"{layout:<10}{numbers['session_state_bytes']:>16,}{numbers['upload_manager_bytes']:>16,}"
+              f"{numbers['results_bytes']:>12,}{numbers['total_bytes']:>12,}")
+
+
+if __name__ == "__main__":
+    main()
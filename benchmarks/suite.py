@@ -0,0 +1,226 @@
+"""
+Timing and memory benchmarks for the analyzer's main stages, on the seeded
+synthetic corpus from benchmarks/corpus.py.
+
+Stages: document extraction (txt/pdf/docx), clean_and_extract_words, the
+app's run_ontological_analysis (extract both uploads, then analyze_texts),
+generate_gap_analysis, create_pdf_bytes and export_zip_bundle. Every case
+runs cold: the shared extraction, JD profile, PDF artifact and report
+pipeline caches are cleared before each repeat, and the cyclic garbage
+collector is paused while a repeat is timed. Each case reports the
+median and best wall-clock time over the repeats and the peak traced
+allocation of one extra run.
+
+    python benchmarks/suite.py --save baseline.json
+    python benchmarks/suite.py --compare baseline.json [--threshold 0.25]
+
+--compare exits non-zero when any case's best time is more than
+--threshold slower than the baseline's (and by at least --min-delta
+seconds, so sub-millisecond noise does not fail the run). Best-of-N is
+compared rather than the median because it is far less sensitive to other
+load on the machine, and a case that looks slower is re-measured (--confirm
+rounds) before it counts. Baselines are plain JSON and only
+comparable on the same machine.
+"""
+import argparse
+import gc
+import io
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+# Parse PDFs and render exports in-process, so timings are single-core and tracemalloc sees the work.
+os.environ.setdefault("PSA_PDF_WORKERS", "0")
+os.environ.setdefault("PSA_EXPORT_WORKERS", "0")
+
+from corpus import FORMATS, CorpusGenerator, gap_ontology, parse_sizes  # noqa: E402
+from psa_core.export import get_artifact_cache  # noqa: E402
+from psa_core.extraction import extract_text_from_bytes, extract_text_from_file, file_kind  # noqa: E402
+from psa_core.extraction_cache import get_extraction_cache  # noqa: E402
+from psa_core.jd_profiles import get_jd_profile_cache  # noqa: E402
+from psa_core.ontology import load_compiled_ontology  # noqa: E402
+from psa_core.pipeline import get_report_pipeline_cache  # noqa: E402
+from psa_core.scoring import analyze_texts  # noqa: E402
+from psa_core.tokenizer import clean_and_extract_words  # noqa: E402
+from psa_score_engine import generate_gap_analysis  # noqa: E402
+from utils import create_pdf_bytes, export_zip_bundle  # noqa: E402
+
+STAGES = ("extract", "clean_and_extract_words", "run_ontological_analysis",
+          "generate_gap_analysis", "create_pdf_bytes", "export_zip_bundle")
+# utils.extract_text reads anything but PDF as plain text, so the bundle is only benchmarked on those.
+EXPORT_FORMATS = ("txt", "pdf")
+JD_PAGES = 2
+
+
+class Upload(io.BytesIO):
+    """A BytesIO with the .name and .type of a Streamlit upload."""
+
+    def __init__(self, name, data):
+        super().__init__(data)
+        self.name = name
+        self.type = None
+
+
+def clear_caches():
+    get_extraction_cache().clear()
+    get_jd_profile_cache().clear()
+    get_artifact_cache().clear()
+    get_report_pipeline_cache().clear()
+
+
+def measure(fn, repeats):
+    """Returns (sorted wall-clock seconds per repeat, peak traced bytes of one more run)."""
+    times = []
+    for _ in range(repeats):
+        clear_caches()
+        # As timeit does: collect up front and keep the cyclic GC out of the timed region.
+        gc.collect()
+        gc.disable()
+        try:
+            start = time.perf_counter()
+            fn()
+            times.append(time.perf_counter() - start)
+        finally:
+            gc.enable()
+    clear_caches()
+    tracemalloc.start()
+    try:
+        fn()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return sorted(times), peak
+
+
+def build_cases(generator, compiled, sizes, formats, stages, gap_domains, gap_config):
+    """Yields (case name, callable) for every requested stage, size and format."""
+    jd_name, jd_txt = generator.document("jd", JD_PAGES, "txt")
+    jd_text = jd_txt.decode("utf-8")
+    for pages in sizes:
+        resume_text = generator.resume_text(pages)
+        documents = {fmt: generator.document("resume", pages, fmt) for fmt in formats}
+        if "extract" in stages:
+            for fmt, (name, data) in documents.items():
+                yield f"extract/{fmt}/{pages}p", lambda d=data, k=file_kind(name): extract_text_from_bytes(d, k, use_cache=False)
+        if "clean_and_extract_words" in stages:
+            yield f"clean_and_extract_words/{pages}p", lambda: clean_and_extract_words(resume_text)
+        if "run_ontological_analysis" in stages:
+            for fmt, (name, data) in documents.items():
+                def run(name=name, data=data):
+                    resume, jd = Upload(name, data), Upload(jd_name, jd_txt)
+                    return analyze_texts(extract_text_from_file(resume), extract_text_from_file(jd), compiled)
+                yield f"run_ontological_analysis/{fmt}/{pages}p", run
+        if "generate_gap_analysis" in stages:
+            yield f"generate_gap_analysis/{pages}p", lambda: generate_gap_analysis(resume_text, jd_text, gap_domains, gap_config)
+        if "create_pdf_bytes" in stages:
+            yield f"create_pdf_bytes/{pages}p", lambda: create_pdf_bytes(resume_text, "Benchmark")
+        if "export_zip_bundle" in stages:
+            for fmt, (name, data) in documents.items():
+                if fmt in EXPORT_FORMATS:
+                    yield f"export_zip_bundle/{fmt}/{pages}p", lambda n=name, d=data: export_zip_bundle(Upload(n, d), Upload(jd_name, jd_txt))
+
+
+def run_suite(sizes, formats, stages, repeats, seed, ontology_path, only=None, log=print):
+    """Runs every case (or just the names in only) and returns the results document."""
+    compiled = load_compiled_ontology(ontology_path)
+    generator = CorpusGenerator(ontology_path, seed)
+    gap_config = {"weights": {"mli": 0.4, "signal_strength": 0.6}}
+    results = {}
+    cases = build_cases(generator, compiled, sizes, formats, stages, gap_ontology(ontology_path), gap_config)
+    for case, fn in cases:
+        if only is not None and case not in only:
+            continue
+        fn()  # warm-up: imports, lazily built matchers and pools
+        times, peak = measure(fn, repeats)
+        results[case] = {"median_s": statistics.median(times), "min_s": times[0], "peak_bytes": peak,
+                         "repeats": repeats}
+        log(f"{case:<44}{results[case]['median_s'] * 1000:>12.2f} ms{peak / 1e6:>12.2f} MB")
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "seed": seed,
+            "sizes": sizes,
+            "formats": formats,
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": results,
+    }
+
+
+def compare(current, baseline, threshold, min_delta):
+    """Returns [(case, baseline best, current best, ratio, regressed)] for cases in both runs."""
+    rows = []
+    for case, numbers in current["results"].items():
+        base = baseline["results"].get(case)
+        if base is None:
+            continue
+        before, after = base["min_s"], numbers["min_s"]
+        ratio = after / before if before else float("inf")
+        regressed = ratio > 1 + threshold and after - before > min_delta
+        rows.append((case, before, after, ratio, regressed))
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=parse_sizes, default=[1, 10], help="resume sizes in pages, e.g. 1,10,200")
+    parser.add_argument("--formats", default=",".join(FORMATS))
+    parser.add_argument("--stages", default=",".join(STAGES))
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--ontology", default=os.path.join(ROOT, "ontology.json"))
+    parser.add_argument("--save", help="write the results as a JSON baseline")
+    parser.add_argument("--compare", help="baseline JSON to check against")
+    parser.add_argument("--threshold", type=float, default=0.25, help="allowed slowdown as a fraction (0.25 = 25%%)")
+    parser.add_argument("--min-delta", type=float, default=0.005, help="ignore slowdowns smaller than this many seconds")
+    parser.add_argument("--confirm", type=int, default=2,
+                        help="re-measure apparent regressions this many times, keeping the best time, before failing")
+    args = parser.parse_args(argv)
+
+    stages = args.stages.split(",")
+    unknown = set(stages) - set(STAGES)
+    if unknown:
+        parser.error(f"unknown stages {sorted(unknown)}; choose from {', '.join(STAGES)}")
+    formats = args.formats.split(",")
+    print(f"{'case':<44}{'median':>15}{'peak':>15}")
+    current = run_suite(args.sizes, formats, stages, args.repeats, args.seed, args.ontology)
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(current, f, indent=2)
+        print(f"baseline written to {args.save}")
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        rows = compare(current, baseline, args.threshold, args.min_delta)
+        for _ in range(args.confirm):
+            suspects = {row[0] for row in rows if row[4]}
+            if not suspects:
+                break
+            print(f"re-measuring {len(suspects)} case(s) that look slower")
+            retry = run_suite(args.sizes, formats, stages, args.repeats, args.seed, args.ontology, only=suspects)
+            for case, numbers in retry["results"].items():
+                if numbers["min_s"] < current["results"][case]["min_s"]:
+                    current["results"][case] = numbers
+            rows = compare(current, baseline, args.threshold, args.min_delta)
+        print(f"\n{'case':<44}{'baseline':>12}{'current':>12}{'ratio':>8}")
+        for case, before, after, ratio, regressed in rows:
+            flag = "  REGRESSION" if regressed else ""
+            print(f"{case:<44}{before * 1000:>10.2f}ms{after * 1000:>10.2f}ms{ratio:>8.2f}{flag}")
+        regressions = [row for row in rows if row[4]]
+        if regressions:
+            print(f"{len(regressions)} case(s) slowed down by more than {args.threshold:.0%}.")
+            sys.exit(1)
+        print("no regressions.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1 @@
+"""Streamlit-free analysis core shared by the PSA™ apps."""
@@ -0,0 +1,255 @@
+"""
+Batch scoring CLI: scores every resume against every job description.
+
+Inputs may be a directory of PDF/DOCX/TXT files, a ZIP of them, a JSONL file
+of {"id": ..., "text": ...} records, or a single document. Each document is
+extracted and tokenized once (identical files only once), then resume x JD
+pairs are scored in chunks across a process pool and streamed out as JSONL
+or CSV while the run progresses.
+
+    python -m psa_core.batch --resumes resume.pdf --jds postings.jsonl --out results.jsonl
+    python -m psa_core.batch --resumes resumes.zip --jds jd.pdf --format csv --out ranked.csv
+"""
+import argparse
+import csv
+import hashlib
+import json
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from psa_core import metrics
+from psa_core.extraction import DOCUMENT_EXTENSIONS, extract_text_from_bytes, file_kind, iter_archive_documents
+from psa_core.jd_profiles import JDProfile
+from psa_core.ontology import load_compiled_ontology
+from psa_core.scoring import calculate_trust_visibility_scores
+
+CSV_FIELDS = [
+    "resume", "jd", "predicted_soc_group", "overall_score", "trust_score",
+    "visibility_score", "domain_scores", "domain_gaps",
+]
+
+
+def iter_documents(path, on_skip=None):
+    """
+    Yields (doc_id, kind, data) from a directory, ZIP archive, JSONL file or
+    single document. on_skip(doc_id, reason) hears about archive members too
+    large to read.
+    """
+    if os.path.isdir(path):
+        for root, dirs, files in os.walk(path):
+            dirs.sort()
+            for name in sorted(files):
+                if name.lower().endswith(DOCUMENT_EXTENSIONS):
+                    full_path = os.path.join(root, name)
+                    with open(full_path, "rb") as f:
+                        yield os.path.relpath(full_path, path), file_kind(name), f.read()
+    elif path.lower().endswith(".zip"):
+        yield from iter_archive_documents(path, on_skip)
+    elif path.lower().endswith(".jsonl"):
+        with open(path, encoding="utf-8") as f:
+            for line_no, line in enumerate(f, 1):
+                if line.strip():
+                    record = json.loads(line)
+                    yield str(record.get("id", line_no)), "text", record.get("text", "").encode("utf-8")
+    else:
+        with open(path, "rb") as f:
+            yield os.path.basename(path), file_kind(path), f.read()
+
+
+# --- Worker side ---
+_compiled = None
+
+
+def _init_worker(ontology_path, match_phrases, match_variants=False):
+    global _compiled
+    # One extraction process per worker gives each PDF the PSA_PDF_TIMEOUT budget: a hung document has
+    # only that process killed and is skipped. Documents are parsed once, so no text cache.
+    os.environ["PSA_PDF_WORKERS"] = "1"
+    os.environ["PSA_EXTRACTION_CACHE_MB"] = "0"
+    # Nothing reads the per-stage timings in a worker; skip recording them in the hot loop.
+    metrics.disable()
+    compiled = load_compiled_ontology(ontology_path)
+    _compiled = compiled.mode(match_phrases, match_variants)
+
+
+def _prepare_document(kind, data):
+    """Extracts and tokenizes one document, keeping only ontology keywords."""
+    text = extract_text_from_bytes(data, kind)
+    if not text:
+        return None
+    return _compiled.restrict(_compiled.extract_keywords(text))
+
+
+def _score_block(jds, resumes, backend):
+    records = []
+    for jd_id, jd_words in jds:
+        if backend == "sparse":
+            analyses = _compiled.vectorized().analyze_batch([words for _, words in resumes], jd_words)
+        else:
+            jd_profile = JDProfile(_compiled, jd_words)
+            analyses = [jd_profile.analyze(words) for _, words in resumes]
+        for (resume_id, _), analysis in zip(resumes, analyses):
+            trust_score, visibility_score = calculate_trust_visibility_scores(analysis)
+            records.append({
+                "resume": resume_id,
+                "jd": jd_id,
+                **analysis,
+                "trust_score": trust_score,
+                "visibility_score": visibility_score,
+            })
+    return records
+
+
+# --- Driver side ---
+def _bounded_map(executor, fn, tasks, max_in_flight):
+    """
+    Submits fn(*args) for each (key, args) in tasks, keeping at most
+    max_in_flight outstanding so inputs are read lazily. Yields (key, future)
+    as tasks complete.
+    """
+    pending = {}
+    tasks = iter(tasks)
+    while True:
+        for key, args in tasks:
+            pending[executor.submit(fn, *args)] = key
+            if len(pending) >= max_in_flight:
+                break
+        if not pending:
+            return
+        done, _ = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            yield pending.pop(future), future
+
+
+def prepare_documents(executor, path, max_in_flight, log):
+    """
+    Extracts and tokenizes every document under path exactly once; documents
+    with identical bytes share one extraction. Returns [(doc_id, keywords)]
+    in input order, skipping documents that fail or contain no text.
+    """
+    keywords_by_hash, order = {}, []
+
+    def skip(doc_id, reason):
+        log(f"warning: skipping {doc_id}: {reason}")
+
+    def tasks():
+        for doc_id, kind, data in iter_documents(path, skip):
+            digest = hashlib.sha256(data).hexdigest()
+            order.append((doc_id, digest))
+            if digest not in keywords_by_hash:
+                keywords_by_hash[digest] = None
+                yield (doc_id, digest), (kind, data)
+
+    for (doc_id, digest), future in _bounded_map(executor, _prepare_document, tasks(), max_in_flight):
+        try:
+            keywords_by_hash[digest] = future.result()
+        except Exception as e:
+            skip(doc_id, e)
+            continue
+        if keywords_by_hash[digest] is None:
+            skip(doc_id, "no text extracted")
+
+    return [(doc_id, keywords_by_hash[digest]) for doc_id, digest in order
+            if keywords_by_hash[digest] is not None]
+
+
+def iter_blocks(resumes, jds, chunk_size):
+    """Splits the resume x JD cross product into tasks of roughly chunk_size pairs."""
+    resume_block = max(1, min(len(resumes), chunk_size))
+    jd_block = max(1, chunk_size // resume_block)
+    for j in range(0, len(jds), jd_block):
+        for r in range(0, len(resumes), resume_block):
+            yield jds[j:j + jd_block], resumes[r:r + resume_block]
+
+
+class ResultWriter:
+    """Streams result records to a JSONL or CSV file as they arrive."""
+
+    def __init__(self, stream, fmt):
+        self.stream = stream
+        self.csv_writer = None
+        if fmt == "csv":
+            self.csv_writer = csv.DictWriter(stream, fieldnames=CSV_FIELDS, extrasaction="ignore")
+            self.csv_writer.writeheader()
+
+    def write(self, record):
+        if self.csv_writer:
+            row = dict(record)
+            row["domain_scores"] = json.dumps(record["domain_scores"])
+            row["domain_gaps"] = json.dumps(record["domain_gaps"])
+            self.csv_writer.writerow(row)
+        else:
+            self.stream.write(json.dumps(record) + "\n")
+
+
+def run_batch(resumes_path, jds_path, out, fmt="jsonl", ontology_path="ontology.json",
+              match_phrases=False, backend="index", workers=None, chunk_size=256, log=None,
+              match_variants=False):
+    """Scores every resume against every JD and writes one record per pair. Returns run stats."""
+    log = log or (lambda msg: print(msg, file=sys.stderr))
+    workers = workers or os.cpu_count() or 1
+    max_in_flight = workers * 4
+    writer = ResultWriter(out, fmt)
+    start = time.perf_counter()
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(ontology_path, match_phrases, match_variants)) as executor:
+        resumes = prepare_documents(executor, resumes_path, max_in_flight, log)
+        jds = prepare_documents(executor, jds_path, max_in_flight, log)
+        prepared = time.perf_counter()
+        log(f"prepared {len(resumes)} resumes and {len(jds)} JDs in {prepared - start:.2f}s")
+
+        pairs = 0
+        tasks = (((), (jd_block, resume_block, backend))
+                 for jd_block, resume_block in iter_blocks(resumes, jds, chunk_size))
+        for _, future in _bounded_map(executor, _score_block, tasks, max_in_flight):
+            records = future.result()
+            for record in records:
+                writer.write(record)
+            pairs += len(records)
+
+    elapsed = time.perf_counter() - start
+    scoring = time.perf_counter() - prepared
+    stats = {
+        "resumes": len(resumes),
+        "jds": len(jds),
+        "pairs": pairs,
+        "seconds": round(elapsed, 3),
+        "pairs_per_second": round(pairs / scoring, 1) if scoring else 0,
+    }
+    log(f"scored {pairs} pairs in {scoring:.2f}s ({stats['pairs_per_second']} pairs/s), total {elapsed:.2f}s")
+    return stats
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m psa_core.batch", description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--resumes", required=True, help="Directory, ZIP, JSONL or single resume file")
+    parser.add_argument("--jds", required=True, help="Directory, ZIP, JSONL or single job description file")
+    parser.add_argument("--out", default="-", help="Output file (default: stdout)")
+    parser.add_argument("--format", choices=["jsonl", "csv"], help="Output format (default: from --out extension, else jsonl)")
+    parser.add_argument("--ontology", default="ontology.json")
+    parser.add_argument("--phrases", action="store_true", help="Match multi-word ontology phrases as units")
+    parser.add_argument("--variants", action="store_true", help="Match inflected and derived word forms (\"adapting\" for \"adapt\")")
+    parser.add_argument("--backend", choices=["index", "sparse"], default="index")
+    parser.add_argument("--workers", type=int, help="Worker processes (default: CPU count)")
+    parser.add_argument("--chunk-size", type=int, default=256, help="Pairs per scheduled task")
+    args = parser.parse_args(argv)
+
+    fmt = args.format or ("csv" if args.out.lower().endswith(".csv") else "jsonl")
+    out = sys.stdout if args.out == "-" else open(args.out, "w", encoding="utf-8", newline="")
+    try:
+        run_batch(args.resumes, args.jds, out, fmt=fmt, ontology_path=args.ontology,
+                  match_phrases=args.phrases, match_variants=args.variants, backend=args.backend,
+                  workers=args.workers, chunk_size=args.chunk_size)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,100 @@
+"""
+Streaming DOCX text extraction.
+
+Reads the WordprocessingML parts straight out of the ZIP with an incremental
+XML parser instead of building python-docx's object tree: each part is
+decompressed and parsed as a stream, text is yielded one paragraph at a time,
+and every element is dropped from the tree as soon as it closes, so memory
+stays flat however long the document is.
+
+Unlike Document.paragraphs this also covers paragraphs inside tables (in
+document order), text boxes, and page headers and footers.
+"""
+import re
+import zipfile
+from xml.etree.ElementTree import iterparse
+
+W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+MC_FALLBACK = "{http://schemas.openxmlformats.org/markup-compatibility/2006}Fallback"
+BODY_PART = "word/document.xml"
+HEADER_FOOTER_RE = re.compile(r"word/(header|footer)(\d*)\.xml")
+
+PARAGRAPH = W + "p"
+TEXT = W + "t"
+# Run-level elements that stand for characters, as python-docx renders them.
+SPECIAL_CHARS = {
+    W + "tab": "\t",
+    W + "ptab": "\t",
+    W + "br": "\n",
+    W + "cr": "\n",
+    W + "noBreakHyphen": "-",
+}
+
+
+def docx_parts(archive):
+    """Names of the text-bearing parts in reading order: headers, body, footers."""
+    headers, footers = [], []
+    for name in archive.namelist():
+        match = HEADER_FOOTER_RE.fullmatch(name)
+        if match:
+            kind, number = match.groups()
+            (headers if kind == "header" else footers).append((int(number or 0), name))
+    return [name for _, name in sorted(headers)] + [BODY_PART] + [name for _, name in sorted(footers)]
+
+
+def iter_part_paragraphs(stream):
+    """Yields the text of each non-blank paragraph in one WordprocessingML part."""
+    # Paragraphs nest (a text box inside a run of its anchor paragraph), so
+    # each open paragraph has its own buffer; inner ones are emitted first.
+    buffers = []
+    parents = []
+    # Text boxes are stored twice: as DrawingML and as a VML fallback for old readers.
+    skip_depth = 0
+    for event, elem in iterparse(stream, events=("start", "end")):
+        tag = elem.tag
+        if event == "start":
+            if skip_depth or tag == MC_FALLBACK:
+                skip_depth += 1
+            elif tag == PARAGRAPH:
+                buffers.append([])
+            parents.append(elem)
+            continue
+
+        parents.pop()
+        if parents:
+            parents[-1].remove(elem)
+        if skip_depth:
+            skip_depth -= 1
+            continue
+        if tag == TEXT:
+            if buffers and elem.text:
+                buffers[-1].append(elem.text)
+        elif tag in SPECIAL_CHARS:
+            if buffers:
+                buffers[-1].append(SPECIAL_CHARS[tag])
+        elif tag == PARAGRAPH:
+            text = "".join(buffers.pop())
+            if text.strip():
+                yield text
+        elem.clear()
+
+
+def iter_docx_paragraphs(source):
+    """
+    Yields paragraph texts from a DOCX given as a path or binary file object,
+    parsing one part at a time. Header and footer lines repeated across
+    sections (first-page, even-page and default variants) are yielded once.
+    """
+    with zipfile.ZipFile(source) as archive:
+        names = set(archive.namelist())
+        if BODY_PART not in names:
+            raise ValueError("Not a Word document: word/document.xml is missing.")
+        seen = set()
+        for name in docx_parts(archive):
+            with archive.open(name) as stream:
+                for text in iter_part_paragraphs(stream):
+                    if name != BODY_PART:
+                        if text in seen:
+                            continue
+                        seen.add(text)
+                    yield text
@@ -0,0 +1,304 @@
+"""
+Report bundle export: wrapped PDF rendering, a content-hash artifact cache and
+a ZIP writer that streams members to a file or stream as they are rendered.
+
+    members = [("cover_letter.pdf", PdfDocument("Cover Letter", text)),
+               ("signal_match_table.csv", csv_text)]
+    with open("bundle.zip", "wb") as f:
+        write_bundle(members, f)
+
+PDFs that are not already cached render on a spawn-based process pool when
+the batch is big enough to pay for it (PSA_EXPORT_WORKERS, default up to 4,
+or 0 on a single core; 0 renders inline), and each one is written to the archive as soon as it
+finishes. Rendered PDFs are kept in an LRU keyed by SHA-256 of title and
+content (PSA_EXPORT_CACHE_MB, default 64), so re-downloading an unchanged
+report does not render anything.
+"""
+import csv
+import hashlib
+import io
+import os
+import threading
+import zipfile
+from collections import OrderedDict, namedtuple
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from functools import lru_cache
+
+from psa_core import metrics
+from psa_core.processes import env_number, worker_context
+from psa_core.scoring import calculate_trust_visibility_scores
+
+PdfDocument = namedtuple("PdfDocument", "title content")
+
+FONT_NAME = "Helvetica"
+FONT_SIZE = 11
+LINE_HEIGHT = 15
+MARGIN = 30
+# Below this many characters of uncached content, spawning workers costs more than rendering inline.
+PARALLEL_MIN_CHARS = 50_000
+
+
+@lru_cache(maxsize=4096)
+def _char_width(char, font_name, font_size):
+    from reportlab.pdfbase.pdfmetrics import stringWidth
+
+    return stringWidth(char, font_name, font_size)
+
+
+def wrap_line(line, max_width, font_name=FONT_NAME, font_size=FONT_SIZE):
+    """Splits one line into pieces no wider than max_width points, breaking at spaces where possible."""
+    # Standard Type 1 fonts have no kerning, so a string's width is the sum of its characters'.
+    def width(text):
+        return sum(_char_width(char, font_name, font_size) for char in text)
+
+    if width(line) <= max_width:
+        return [line]
+    # Each word is measured once; the line width is accumulated rather than re-measured.
+    space = width(" ")
+    pieces, current, current_width = [], [], 0.0
+    for word in line.split(" "):
+        word_width = width(word)
+        if current and current_width + space + word_width <= max_width:
+            current.append(word)
+            current_width += space + word_width
+            continue
+        if current:
+            pieces.append(" ".join(current))
+        # A single word wider than the page is hard-broken by character.
+        while word_width > max_width and len(word) > 1:
+            cut = len(word) - 1
+            while cut > 1 and width(word[:cut]) > max_width:
+                cut -= 1
+            pieces.append(word[:cut])
+            word = word[cut:]
+            word_width = width(word)
+        current, current_width = [word], word_width
+    pieces.append(" ".join(current))
+    return pieces
+
+
+def render_pdf(content, title="PSA Document"):
+    """Renders text as a letter-size PDF, wrapping long lines to the page width."""
+    from reportlab.lib.pagesizes import letter
+    from reportlab.pdfgen import canvas
+
+    buffer = io.BytesIO()
+    # invariant=1 drops the timestamp and random document id so identical input gives identical bytes.
+    c = canvas.Canvas(buffer, pagesize=letter, invariant=1)
+    width, height = letter
+    max_width = width - 2 * MARGIN
+    c.setFont(FONT_NAME, FONT_SIZE)
+    c.drawString(MARGIN, height - 40, title)
+
+    y = height - 60
+    for line in content.split("\n"):
+        for piece in wrap_line(line, max_width):
+            if y < 50:
+                c.showPage()
+                y = height - 50
+                c.setFont(FONT_NAME, FONT_SIZE)
+            c.drawString(MARGIN, y, piece)
+            y -= LINE_HEIGHT
+    c.save()
+    return buffer.getvalue()
+
+
+def _render_document(document):
+    return render_pdf(document.content, document.title)
+
+
+class ArtifactCache:
+    """LRU of rendered artifacts keyed by SHA-256 of their source, bounded by total bytes."""
+
+    def __init__(self, max_bytes=64_000_000):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self.hits = self.misses = 0
+
+    @staticmethod
+    def make_key(document):
+        digest = hashlib.sha256()
+        digest.update(document.title.encode("utf-8"))
+        digest.update(b"\0")
+        digest.update(document.content.encode("utf-8"))
+        return digest.hexdigest()
+
+    def get(self, document):
+        key = self.make_key(document)
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+            return None
+
+    def put(self, document, data):
+        if len(data) > self.max_bytes:
+            return
+        key = self.make_key(document)
+        with self._lock:
+            if key in self._entries:
+                return
+            self._entries[key] = data
+            self._size += len(data)
+            while self._size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted)
+
+    def stats(self):
+        with self._lock:
+            return {"entries": len(self._entries), "bytes": self._size, "hits": self.hits, "misses": self.misses}
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+
+class ExportPool:
+    """Renders PDFs on a lazily started process pool, yielding each one as it completes."""
+
+    def __init__(self, max_workers=None, parallel_min_chars=PARALLEL_MIN_CHARS):
+        if max_workers is None:
+            # A pool only adds IPC and startup cost on a single core.
+            cpus = os.cpu_count() or 1
+            max_workers = env_number("PSA_EXPORT_WORKERS", min(4, cpus) if cpus > 1 else 0)
+        self.max_workers = max_workers
+        self.parallel_min_chars = parallel_min_chars
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self):
+        with self._lock:
+            if self._executor is None:
+                # spawn, not fork: the Streamlit server is multi-threaded.
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers, mp_context=worker_context())
+            return self._executor
+
+    def render(self, items):
+        """Yields (key, pdf_bytes) for (key, PdfDocument) items in completion order."""
+        items = list(items)
+        total_chars = sum(len(document.content) for _, document in items)
+        if self.max_workers == 0 or len(items) < 2 or total_chars < self.parallel_min_chars:
+            for key, document in items:
+                yield key, _render_document(document)
+            return
+        executor = self._get_executor()
+        futures = {executor.submit(_render_document, document): key for key, document in items}
+        for future in as_completed(futures):
+            yield futures[future], future.result()
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(cancel_futures=True)
+                self._executor = None
+
+
+_shared_lock = threading.Lock()
+_shared_cache = None
+_shared_pool = None
+
+
+def get_artifact_cache():
+    """Returns the process-wide ArtifactCache, sized from PSA_EXPORT_CACHE_MB."""
+    global _shared_cache
+    with _shared_lock:
+        if _shared_cache is None:
+            _shared_cache = ArtifactCache(int(env_number("PSA_EXPORT_CACHE_MB", 64, float) * 1_000_000))
+        return _shared_cache
+
+
+def get_export_pool():
+    """Returns the process-wide ExportPool, configured from PSA_EXPORT_WORKERS."""
+    global _shared_pool
+    with _shared_lock:
+        if _shared_pool is None:
+            _shared_pool = ExportPool()
+        return _shared_pool
+
+
+def render_pdf_cached(content, title="PSA Document"):
+    """render_pdf() through the shared artifact cache."""
+    document = PdfDocument(title, content)
+    cache = get_artifact_cache()
+    data = cache.get(document)
+    if data is None:
+        data = render_pdf(content, title)
+        cache.put(document, data)
+    return data
+
+
+@metrics.timed("export.bundle")
+def write_bundle(members, dest):
+    """
+    Writes a ZIP of (arcname, payload) members to dest, a path or writable
+    binary stream (it need not be seekable). A payload is str, bytes or a
+    PdfDocument; cached PDFs and plain members are written first, then
+    uncached PDFs in the order their renders finish.
+    """
+    cache = get_artifact_cache()
+    pending = []
+    with zipfile.ZipFile(dest, "w", zipfile.ZIP_DEFLATED) as archive:
+        for name, payload in members:
+            if isinstance(payload, PdfDocument):
+                cached = cache.get(payload)
+                if cached is None:
+                    pending.append((name, payload))
+                    continue
+                payload = cached
+            archive.writestr(name, payload)
+
+        documents = dict(pending)
+        for name, data in get_export_pool().render(pending):
+            cache.put(documents[name], data)
+            archive.writestr(name, data)
+    return dest
+
+
+def analysis_report_members(results, hyperprompt=None):
+    """Bundle members for an analyze_texts() results dict: scorecard and gap PDFs, a gap CSV and the source texts."""
+    trust_score, visibility_score = calculate_trust_visibility_scores(results)
+    critical_domains = set(results.get("critical_domains", []))
+    domain_scores = sorted(results.get("domain_scores", {}).items(), key=lambda item: item[1], reverse=True)
+    domain_gaps = results.get("domain_gaps", {})
+
+    scorecard = [
+        f"Overall Resume Match Score: {results.get('overall_score', 0):.1f}%",
+        f"Trust Score: {trust_score}%",
+        f"Visibility Score: {visibility_score}%",
+        f"Predicted Job Category: {results.get('predicted_soc_group') or 'Unknown'}",
+        "",
+        "Signal Domain Scores:",
+    ] + [f"  {domain}{' (Critical)' if domain in critical_domains else ''}: {score:.1f}%" for domain, score in domain_scores]
+    if results.get("suggested_titles"):
+        scorecard += ["", "Suggested Job Titles:"] + [f"  - {title}" for title in results["suggested_titles"]]
+
+    gap_report, gap_rows = [], io.StringIO()
+    writer = csv.writer(gap_rows)
+    writer.writerow(["domain", "keyword", "critical"])
+    for domain in sorted(domain_gaps, key=lambda d: (d not in critical_domains, d)):
+        gap_report.append(f"{domain}{' (Critical for this role)' if domain in critical_domains else ''}:")
+        gap_report.append("  " + ", ".join(domain_gaps[domain]))
+        writer.writerows([domain, keyword, "yes" if domain in critical_domains else "no"] for keyword in domain_gaps[domain])
+
+    members = [
+        ("psa_scorecard.pdf", PdfDocument("PSA™ Scorecard", "\n".join(scorecard))),
+        ("gap_analysis.pdf", PdfDocument("Keyword Gap Analysis", "\n".join(gap_report) or "No significant keyword gaps were found.")),
+        ("keyword_gaps.csv", gap_rows.getvalue()),
+        ("resume.txt", results.get("resume_text") or ""),
+        ("job_description.txt", results.get("jd_text") or ""),
+    ]
+    if hyperprompt:
+        members.append(("hyper_prompt.txt", hyperprompt))
+    return members
+
+
+def bundle_bytes(members):
+    """write_bundle() into memory, for callers that need the archive as bytes."""
+    buffer = io.BytesIO()
+    write_bundle(members, buffer)
+    return buffer.getvalue()
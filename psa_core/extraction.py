@@ -0,0 +1,113 @@
+import io
+import re
+import zipfile
+
+from psa_core import metrics
+from psa_core.docx_text import iter_docx_paragraphs
+from psa_core.extraction_cache import get_extraction_cache, read_file_bytes
+
+PDF_CONTENT_TYPE = "application/pdf"
+DOCX_CONTENT_TYPE = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+WHITESPACE_RE = re.compile(r'\s+')
+DOCUMENT_EXTENSIONS = (".pdf", ".docx", ".txt")
+# Members larger than this (uncompressed) are skipped rather than read into memory.
+MAX_ARCHIVE_MEMBER_BYTES = 20_000_000
+
+
+def file_kind(filename=None, content_type=None):
+    """Returns "pdf", "docx" or "text" from an upload's name and/or MIME type."""
+    name = (filename or "").lower()
+    if content_type == PDF_CONTENT_TYPE or name.endswith(".pdf"):
+        return "pdf"
+    if content_type == DOCX_CONTENT_TYPE or name.endswith(".docx"):
+        return "docx"
+    return "text"
+
+
+@metrics.timed("extract.pdf")
+def extract_pdf_text(data, on_warning=None):
+    # PyPDF2 is only imported inside the extraction workers.
+    from psa_core.pdf_pool import extract_pdf_pages
+
+    result = extract_pdf_pages(data)
+    if on_warning and (warning := result.warning()):
+        on_warning(warning)
+    return "\n".join(result.pages)
+
+
+@metrics.timed("extract.docx")
+def extract_docx_text(data):
+    return "\n".join(iter_docx_paragraphs(io.BytesIO(data)))
+
+
+def extract_text_from_bytes(data, kind, on_warning=None, use_cache=True):
+    """
+    Extracts text from raw document bytes. PDF and DOCX parsing is memoized
+    by content hash in the shared extraction cache (skipped with
+    use_cache=False for one-off documents); on_warning receives non-fatal
+    messages (e.g. page-limit truncation) when a document is parsed.
+    """
+    metrics.increment("documents")
+    metrics.increment("document_bytes", len(data))
+    if not use_cache:
+        if kind == "pdf":
+            return extract_pdf_text(data, on_warning)
+        if kind == "docx":
+            return extract_docx_text(data)
+        return data.decode("utf-8", errors="ignore")
+
+    cache = get_extraction_cache()
+    if kind == "pdf":
+        return cache.get_or_extract(data, "pdf", lambda d: extract_pdf_text(d, on_warning))
+    if kind == "docx":
+        # Keyed apart from the old python-docx text, which lacked tables, text boxes and headers.
+        return cache.get_or_extract(data, "docx-xml", extract_docx_text)
+    return data.decode("utf-8", errors="ignore")
+
+
+def extract_text_from_file(file, on_warning=None):
+    """Extracts text from an uploaded file or binary stream with a .name."""
+    if file is None:
+        return ""
+    kind = file_kind(getattr(file, "name", None), getattr(file, "type", None))
+    return extract_text_from_bytes(read_file_bytes(file), kind, on_warning)
+
+
+def archive_members(archive):
+    """
+    Returns (members, oversized) for an open ZipFile: the document members to
+    read, and those skipped for exceeding MAX_ARCHIVE_MEMBER_BYTES. Folders
+    and other file types are left out of both.
+    """
+    members, oversized = [], []
+    for info in archive.infolist():
+        if not info.is_dir() and info.filename.lower().endswith(DOCUMENT_EXTENSIONS):
+            (members if info.file_size <= MAX_ARCHIVE_MEMBER_BYTES else oversized).append(info)
+    return members, oversized
+
+
+def oversized_reason(info):
+    """The skip reason reported for an archive member over MAX_ARCHIVE_MEMBER_BYTES."""
+    return (f"{info.file_size / 1_000_000:.1f} MB uncompressed, over the "
+            f"{MAX_ARCHIVE_MEMBER_BYTES // 1_000_000} MB limit for archive members")
+
+
+def iter_archive_documents(source, on_skip=None):
+    """
+    Yields (name, kind, data) for each document in a ZIP archive, given a
+    path or a binary file object. Members are read one at a time straight
+    from the archive; nothing is extracted to disk. on_skip(name, reason) is
+    called for each oversized member.
+    """
+    with zipfile.ZipFile(source) as archive:
+        members, oversized = archive_members(archive)
+        if on_skip:
+            for info in oversized:
+                on_skip(info.filename, oversized_reason(info))
+        for info in members:
+            yield info.filename, file_kind(info.filename), archive.read(info)
+
+
+def clean_text(text):
+    """Collapses the whitespace runs and stray line breaks left by PDF/DOCX extraction."""
+    return WHITESPACE_RE.sub(" ", text).strip()
@@ -0,0 +1,181 @@
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+
+
+def read_file_bytes(file):
+    """Returns the raw bytes of an uploaded file or binary stream without consuming it."""
+    if hasattr(file, "getvalue"):
+        return file.getvalue()
+    position = file.tell() if hasattr(file, "tell") else None
+    data = file.read()
+    if position is not None:
+        file.seek(position)
+    return data
+
+
+class ExtractionCache:
+    """
+    Two-tier cache of extracted document text keyed by SHA-256 of the file bytes.
+
+    The memory tier is an LRU bounded by total cached characters; the optional
+    disk tier stores one UTF-8 file per entry and evicts least recently used
+    files once it grows past its byte budget. Failed extractions are never cached.
+    """
+
+    def __init__(self, max_chars=50_000_000, disk_dir=None, disk_max_bytes=500_000_000):
+        self.max_chars = max_chars
+        self.disk_dir = disk_dir
+        self.disk_max_bytes = disk_max_bytes
+        self._entries = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self.hits = self.disk_hits = self.misses = self.evictions = 0
+        if disk_dir:
+            os.makedirs(disk_dir, exist_ok=True)
+
+    @staticmethod
+    def make_key(data, extractor_name):
+        # The extractor name is part of the key: entry points join pages differently.
+        return f"{extractor_name}-{hashlib.sha256(data).hexdigest()}"
+
+    def get_or_extract(self, data, extractor_name, extract):
+        """Returns cached text for data, calling extract(data) on a miss."""
+        key = self.make_key(data, extractor_name)
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+
+        text = self._disk_get(key)
+        if text is not None:
+            with self._lock:
+                self.disk_hits += 1
+            self._memory_put(key, text)
+            return text
+
+        with self._lock:
+            self.misses += 1
+        text = extract(data)
+        self._memory_put(key, text)
+        self._disk_put(key, text)
+        return text
+
+    def put_text(self, text):
+        """Stores text under a hash of its own content and returns the key, for callers that keep only the key."""
+        key = f"text-{hashlib.sha256(text.encode('utf-8')).hexdigest()}"
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return key
+        self._memory_put(key, text)
+        self._disk_put(key, text)
+        return key
+
+    def get_text(self, key):
+        """Returns the text stored under key, or None once it has been evicted from both tiers."""
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return self._entries[key]
+        text = self._disk_get(key)
+        if text is not None:
+            self._memory_put(key, text)
+        return text
+
+    def _memory_put(self, key, text):
+        if len(text) > self.max_chars:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._size -= len(self._entries.pop(key))
+            self._entries[key] = text
+            self._size += len(text)
+            while self._size > self.max_chars:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted)
+                self.evictions += 1
+
+    def _disk_path(self, key):
+        return os.path.join(self.disk_dir, f"{key}.txt")
+
+    def _disk_get(self, key):
+        if not self.disk_dir:
+            return None
+        path = self._disk_path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                text = f.read()
+            os.utime(path)
+            return text
+        except OSError:
+            return None
+
+    def _disk_put(self, key, text):
+        if not self.disk_dir:
+            return
+        path = self._disk_path(key)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(text)
+            os.replace(tmp_path, path)
+            self._disk_evict()
+        except OSError:
+            pass
+
+    def _disk_evict(self):
+        entries = []
+        for name in os.listdir(self.disk_dir):
+            if name.endswith(".txt"):
+                stat = os.stat(os.path.join(self.disk_dir, name))
+                entries.append((stat.st_mtime, stat.st_size, name))
+        total = sum(size for _, size, _ in entries)
+        for _, size, name in sorted(entries):
+            if total <= self.disk_max_bytes:
+                break
+            try:
+                os.remove(os.path.join(self.disk_dir, name))
+                total -= size
+                with self._lock:
+                    self.evictions += 1
+            except OSError:
+                pass
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def stats(self):
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "chars": self._size,
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
+_shared_cache = None
+_shared_lock = threading.Lock()
+
+
+def get_extraction_cache():
+    """
+    Returns the process-wide ExtractionCache. Sized by PSA_EXTRACTION_CACHE_MB
+    (memory tier, default 50) with an on-disk tier when PSA_EXTRACTION_CACHE_DIR is set.
+    """
+    global _shared_cache
+    with _shared_lock:
+        if _shared_cache is None:
+            _shared_cache = ExtractionCache(
+                max_chars=int(float(os.environ.get("PSA_EXTRACTION_CACHE_MB", "50")) * 1_000_000),
+                disk_dir=os.environ.get("PSA_EXTRACTION_CACHE_DIR") or None,
+            )
+        return _shared_cache
+
@@ -0,0 +1,85 @@
+import heapq
+
+from psa_core.jd_profiles import get_jd_profile
+
+
+class IncrementalAnalysis:
+    """
+    Live analysis of one resume against a fixed JD profile.
+
+    Per-domain and per-SOC-group match counters are kept between edits, so
+    update() only walks the keywords that entered or left the resume instead
+    of re-scoring every domain and group. results() matches analyze_texts
+    for the current resume text, minus the raw texts, so
+    calculate_trust_visibility_scores applies to it unchanged. The JD side
+    comes from the shared JD profile cache; the current resume text is kept
+    here (resume_text) rather than in the shared extraction cache.
+    """
+
+    def __init__(self, compiled, resume_text, jd_text):
+        self.compiled = compiled
+        profile = get_jd_profile(compiled, jd_text)
+        self.jd_words = profile.words
+        self.resume_words = frozenset()
+
+        self.jd_domain_counts = [0] * len(compiled.domain_names)
+        for idx, required in zip(profile.domain_ids, profile.domain_required):
+            self.jd_domain_counts[idx] = len(required)
+        self.scored_domains = list(profile.domain_ids)
+
+        self.matched_domain_counts = [0] * len(compiled.domain_names)
+        self.group_scores = [0] * len(compiled.group_names)
+        self.gaps = {idx: set(required) for idx, required in zip(profile.domain_ids, profile.domain_required)}
+        self.matched_total = 0
+        self.resume_text = ""
+        self.update(resume_text)
+
+    def update(self, resume_text):
+        """Re-tokenizes the resume and applies only the keyword delta. Returns the number of keywords changed."""
+        compiled = self.compiled
+        words = compiled.restrict(compiled.extract_keywords(resume_text)) & self.jd_words
+        added, removed = words - self.resume_words, self.resume_words - words
+        for kw, step in [(kw, 1) for kw in added] + [(kw, -1) for kw in removed]:
+            self.matched_total += step
+            for idx in compiled.keyword_domains[kw]:
+                self.matched_domain_counts[idx] += step
+                if step > 0:
+                    self.gaps[idx].discard(kw)
+                else:
+                    self.gaps[idx].add(kw)
+            for idx in compiled.keyword_groups.get(kw, ()):
+                self.group_scores[idx] += step
+        self.resume_words = words
+        self.resume_text = resume_text
+        return len(added) + len(removed)
+
+    def top_soc_groups(self, k=5):
+        ranked = heapq.nsmallest(k, ((idx, score) for idx, score in enumerate(self.group_scores) if score),
+                                 key=lambda item: (-item[1], item[0]))
+        return self.compiled.describe_soc_groups(ranked, self.resume_words, self.jd_words)
+
+    def results(self):
+        """Returns the analysis dict for the current resume."""
+        compiled = self.compiled
+        best_soc_group = None
+        if compiled.group_names:
+            best_idx = max(range(len(self.group_scores)), key=lambda idx: (self.group_scores[idx], -idx))
+            best_soc_group = compiled.group_names[best_idx]
+        group_data = compiled.soc_groups.get(best_soc_group, {})
+
+        domain_scores, domain_gaps = {}, {}
+        for idx in self.scored_domains:
+            domain = compiled.domain_names[idx]
+            domain_scores[domain] = (self.matched_domain_counts[idx] / self.jd_domain_counts[idx]) * 100
+            if self.gaps[idx]:
+                domain_gaps[domain] = sorted(self.gaps[idx])
+
+        return {
+            "predicted_soc_group": best_soc_group,
+            "critical_domains": group_data.get("signal_domains", []),
+            "domain_scores": domain_scores,
+            "domain_gaps": domain_gaps,
+            "overall_score": (self.matched_total / len(self.jd_words)) * 100 if self.jd_words else 0,
+            "suggested_titles": group_data.get("example_titles", []),
+            "top_soc_groups": self.top_soc_groups(),
+        }
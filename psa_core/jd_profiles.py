@@ -0,0 +1,175 @@
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict, defaultdict
+
+
+class JDProfile:
+    """
+    Everything scoring needs from one JD, precomputed against one
+    CompiledOntology: its keyword set, the sorted required keywords and
+    counts per domain it touches, and the relevant-keyword count per SOC
+    group. analyze() then only does resume-side work and returns exactly what
+    CompiledOntology.analyze returns for the same pair.
+    """
+
+    __slots__ = ("compiled", "words", "domain_ids", "domain_required", "group_relevant_counts")
+
+    def __init__(self, compiled, jd_words):
+        self.compiled = compiled
+        self.words = compiled.restrict(jd_words)
+        required = defaultdict(list)
+        group_counts = [0] * len(compiled.group_names)
+        for kw in self.words:
+            for idx in compiled.keyword_domains[kw]:
+                required[idx].append(kw)
+            for idx in compiled.keyword_groups.get(kw, ()):
+                group_counts[idx] += 1
+        self.domain_ids = tuple(sorted(required))
+        self.domain_required = tuple(tuple(sorted(required[idx])) for idx in self.domain_ids)
+        self.group_relevant_counts = group_counts
+
+    def matched(self, resume_words):
+        """JD keywords present in the resume."""
+        return self.words.intersection(resume_words)
+
+    def score_domains(self, matched):
+        """Returns (domain_scores, domain_gaps, overall_score) given the matched keywords."""
+        compiled = self.compiled
+        resume_hits = defaultdict(int)
+        for kw in matched:
+            for idx in compiled.keyword_domains[kw]:
+                resume_hits[idx] += 1
+
+        domain_scores, domain_gaps = {}, {}
+        for idx, required in zip(self.domain_ids, self.domain_required):
+            domain = compiled.domain_names[idx]
+            hits = resume_hits[idx]
+            domain_scores[domain] = (hits / len(required)) * 100
+            if hits < len(required):
+                domain_gaps[domain] = [kw for kw in required if kw not in matched]
+
+        overall_score = (len(matched) / len(self.words)) * 100 if self.words else 0
+        return domain_scores, domain_gaps, overall_score
+
+    def rank_soc_groups(self, matched, k=5):
+        """CompiledOntology.rank_soc_groups for this JD given the matched keywords."""
+        return self.compiled.rank_soc_groups(matched, self.words, k)
+
+    def top_soc_groups(self, resume_words, k=5, matched=None, ranked=None):
+        """
+        CompiledOntology.top_soc_groups for this JD, with the per-group JD counts
+        already known. ranked is a rank_soc_groups() result to describe instead
+        of ranking again.
+        """
+        compiled = self.compiled
+        matched = self.matched(resume_words) if matched is None else matched
+        if ranked is None:
+            ranked = self.rank_soc_groups(matched, k)
+        described = []
+        for idx, score in ranked[:k]:
+            keywords = compiled.group_keyword_sets[idx]
+            jd_relevant = self.group_relevant_counts[idx]
+            described.append({
+                "group": compiled.group_names[idx],
+                "score": score,
+                "coverage": (score / jd_relevant) * 100 if jd_relevant else 0,
+                "evidence": sorted(kw for kw in matched if kw in keywords),
+            })
+        return described
+
+    def analyze(self, resume_words, matched=None, ranked=None):
+        """
+        Scores a resume token set against this JD, like CompiledOntology.analyze.
+        ranked is a rank_soc_groups() result (k >= 1) for the same resume; the
+        predicted group is its first entry.
+        """
+        compiled = self.compiled
+        matched = self.matched(resume_words) if matched is None else matched
+        best_soc_group = None
+        if compiled.group_names:
+            if ranked is None:
+                ranked = self.rank_soc_groups(matched, k=1)
+            best_soc_group = compiled.group_names[ranked[0][0] if ranked else 0]
+        domain_scores, domain_gaps, overall_score = self.score_domains(matched)
+        group_data = compiled.soc_groups.get(best_soc_group, {})
+        return {
+            "predicted_soc_group": best_soc_group,
+            "critical_domains": group_data.get("signal_domains", []),
+            "domain_scores": domain_scores,
+            "domain_gaps": domain_gaps,
+            "overall_score": overall_score,
+            "suggested_titles": group_data.get("example_titles", []),
+        }
+
+
+class JDProfileCache:
+    """
+    LRU of JDProfiles keyed by the compiled ontology and a SHA-256 of the JD
+    text, with entries expiring ttl seconds after they were built. Shared by
+    every session in the process; profiles are read-only.
+    """
+
+    def __init__(self, maxsize=256, ttl=3600.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = self.misses = self.evictions = 0
+
+    def get(self, compiled, jd_text):
+        """Returns the profile for jd_text under compiled, tokenizing and building it on a miss."""
+        key = (id(compiled), hashlib.sha256(jd_text.encode("utf-8")).hexdigest())
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            # The compiled identity check guards against a recycled id() after a reload.
+            if entry and entry[1].compiled is compiled and now - entry[0] < self.ttl:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+
+        profile = JDProfile(compiled, compiled.extract_keywords(jd_text))
+        with self._lock:
+            self._entries[key] = (now, profile)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return profile
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses,
+                    "evictions": self.evictions}
+
+
+_shared_cache = None
+_shared_lock = threading.Lock()
+
+
+def get_jd_profile_cache():
+    """
+    Returns the process-wide JDProfileCache, sized by PSA_JD_CACHE_SIZE
+    (profiles, default 256) with entries expiring after PSA_JD_CACHE_TTL
+    seconds (default 3600).
+    """
+    global _shared_cache
+    with _shared_lock:
+        if _shared_cache is None:
+            _shared_cache = JDProfileCache(
+                maxsize=int(os.environ.get("PSA_JD_CACHE_SIZE", "256")),
+                ttl=float(os.environ.get("PSA_JD_CACHE_TTL", "3600")),
+            )
+        return _shared_cache
+
+
+def get_jd_profile(compiled, jd_text):
+    """Returns the shared JDProfile for jd_text scored against compiled."""
+    return get_jd_profile_cache().get(compiled, jd_text)
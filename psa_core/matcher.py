@@ -0,0 +1,170 @@
+import re
+from collections import deque
+
+from psa_core.normalization import NormalizationTable
+
+# Words and single punctuation marks; whitespace only separates tokens.
+TOKEN_RE = re.compile(r"\w+|[^\w\s]")
+
+
+def phrase_tokens(phrase):
+    return tuple(tok.lower() for tok in TOKEN_RE.findall(phrase))
+
+
+class PhraseMatcher:
+    """
+    Aho-Corasick automaton over word tokens.
+
+    All phrases are compiled into one automaton whose alphabet is lower-cased
+    tokens, so a text is scanned once regardless of how many phrases there are,
+    and matches always fall on word boundaries ("ai" does not hit "maintain").
+
+    normalize, if given, maps each lower-cased token (of phrases and of
+    scanned text alike) to a canonical form, e.g. NormalizationTable.token, so
+    "collaborated" in a text matches a "collaboration" phrase.
+    """
+
+    def __init__(self, phrases=(), normalize=None):
+        self.normalize = normalize
+        self._goto = [{}]
+        self._fail = [0]
+        self._own = [()]
+        self._out = [()]
+        self.max_length = 0
+        self._compiled = True
+        for item in phrases:
+            phrase, payload = item if isinstance(item, tuple) else (item, item)
+            self.add(phrase, payload)
+
+    def add(self, phrase, payload=None):
+        tokens = phrase_tokens(phrase)
+        if self.normalize:
+            tokens = tuple(map(self.normalize, tokens))
+        if not tokens:
+            return
+        node = 0
+        for tok in tokens:
+            nxt = self._goto[node].get(tok)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[node][tok] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._own.append(())
+            node = nxt
+        entry = (phrase if payload is None else payload, len(tokens))
+        # Phrases that normalize alike may share a node; each payload is reported once.
+        if entry not in self._own[node]:
+            self._own[node] += (entry,)
+        self.max_length = max(self.max_length, len(tokens))
+        self._compiled = False
+
+    def _compile(self):
+        # Breadth-first failure links; each node inherits the outputs of its failure node.
+        goto, fail = self._goto, self._fail
+        out = self._out = list(self._own)
+        queue = deque(goto[0].values())
+        for child in queue:
+            fail[child] = 0
+        while queue:
+            node = queue.popleft()
+            for tok, child in goto[node].items():
+                queue.append(child)
+                state = fail[node]
+                while state and tok not in goto[state]:
+                    state = fail[state]
+                fail[child] = goto[state].get(tok, 0)
+                out[child] += out[fail[child]]
+        self._compiled = True
+
+    def finditer(self, text):
+        """Yields (start, end, payload) for every phrase occurrence, in text order."""
+        if not self._compiled:
+            self._compile()
+        goto, fail, out = self._goto, self._fail, self._out
+        normalize = self.normalize
+        starts = deque(maxlen=self.max_length or 1)
+        node = 0
+        for m in TOKEN_RE.finditer(text):
+            tok = m.group().lower()
+            if normalize:
+                tok = normalize(tok)
+            starts.append(m.start())
+            while node and tok not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(tok, 0)
+            for payload, length in out[node]:
+                yield starts[-length], m.end(), payload
+
+    def matched(self, text):
+        """Returns the set of payloads found in text."""
+        return {payload for _, _, payload in self.finditer(text)}
+
+
+class OntologyTermMatcher:
+    """
+    One automaton over every term and alias of a psa_score_engine ontology
+    (a list of {"name", "terms", "aliases"} domains).
+
+    aliases given as an {alias: term} mapping stand for one of the domain's
+    terms: an alias hit is reported and scored as that term, wherever the term
+    is listed. A plain list of aliases (or an alias whose term the domain does
+    not list) keeps slots of its own, next to the terms.
+
+    With match_variants, the words of every term and alias go through one
+    NormalizationTable, and so do the words of scanned text. Inflected forms
+    then hit the term they come from ("audits" -> "audit").
+    """
+
+    def __init__(self, ontology, match_variants=False):
+        self.ontology = ontology
+        self.match_variants = match_variants
+        self.domain_terms = []
+        # (lower-cased alias, lower-cased term) for every alias that maps to a listed term
+        self.aliases = []
+        for domain in ontology:
+            terms = list(domain.get("terms", []))
+            aliases = domain.get("aliases", [])
+            if isinstance(aliases, dict):
+                listed = {term.lower() for term in terms}
+                for alias, term in aliases.items():
+                    if term.lower() in listed:
+                        self.aliases.append((alias.lower(), term.lower()))
+                    else:
+                        terms.append(alias)
+            else:
+                terms += aliases
+            self.domain_terms.append(terms)
+        # lower-cased term -> [(domain index, position in domain_terms)]
+        self.slots = {}
+        for d, terms in enumerate(self.domain_terms):
+            for pos, term in enumerate(terms):
+                self.slots.setdefault(term.lower(), []).append((d, pos))
+        self.normalizer = None
+        if match_variants:
+            phrases = list(self.slots) + [alias for alias, _ in self.aliases]
+            self.normalizer = NormalizationTable(tok for phrase in phrases for tok in phrase_tokens(phrase))
+        self.matcher = PhraseMatcher([(term, term) for term in self.slots] + self.aliases,
+                                     normalize=self.normalizer.token if self.normalizer else None)
+
+    def finditer(self, text):
+        """Yields (start, end, domain name, term) for every hit, in text order."""
+        for start, end, key in self.matcher.finditer(text):
+            for d, pos in self.slots[key]:
+                yield start, end, self.ontology[d]["name"], self.domain_terms[d][pos]
+
+    def matched_terms(self, text):
+        """Returns the set of lower-cased ontology terms present in text."""
+        return self.matcher.matched(text)
+
+    def domain_hits(self, text, matched=None):
+        """
+        Returns, per domain, the list of its terms (and unmapped aliases)
+        present in text, in ontology order.
+        """
+        if matched is None:
+            matched = self.matched_terms(text)
+        hits = [[] for _ in self.ontology]
+        for d, pos in sorted(slot for key in matched for slot in self.slots[key]):
+            hits[d].append(self.domain_terms[d][pos])
+        return hits
@@ -0,0 +1,193 @@
+"""
+Lightweight per-stage timing and counters for the analysis pipeline.
+
+    with metrics.span("tokenize"):
+        ...
+
+    @metrics.timed("extract.pdf")
+    def extract_pdf_text(...): ...
+
+Spans aggregate into process-wide per-stage count / total / max seconds;
+counters track document sizes and similar totals. Both export as JSON or
+Prometheus text. Set PSA_PROFILE=1 (or a file path) to capture a cProfile of
+the next analysis run wrapped in profile_run(); PSA_METRICS=0 turns spans
+into no-ops.
+"""
+import cProfile
+import functools
+import io
+import json
+import os
+import pstats
+import re
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager, nullcontext
+
+enabled = os.environ.get("PSA_METRICS", "1") != "0"
+
+_lock = threading.Lock()
+_stages = {}
+_counters = {}
+_recent = deque(maxlen=200)
+_profile = {"armed": bool(os.environ.get("PSA_PROFILE")), "summary": None, "path": None}
+
+
+def _record(name, seconds):
+    with _lock:
+        stage = _stages.get(name)
+        if stage is None:
+            stage = _stages[name] = {"count": 0, "total_seconds": 0.0, "max_seconds": 0.0}
+        stage["count"] += 1
+        stage["total_seconds"] += seconds
+        stage["max_seconds"] = max(stage["max_seconds"], seconds)
+        stage["last_seconds"] = seconds
+        _recent.append((name, seconds, time.time()))
+
+
+@contextmanager
+def _span(name):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        _record(name, time.perf_counter() - start)
+
+
+def span(name):
+    """Context manager timing one pipeline stage."""
+    return _span(name) if enabled else nullcontext()
+
+
+def timed(name):
+    """Decorator form of span()."""
+    def decorate(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not enabled:
+                return fn(*args, **kwargs)
+            with _span(name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def increment(name, value=1):
+    if enabled:
+        with _lock:
+            _counters[name] = _counters.get(name, 0) + value
+
+
+def disable():
+    global enabled
+    enabled = False
+
+
+def reset():
+    with _lock:
+        _stages.clear()
+        _counters.clear()
+        _recent.clear()
+
+
+@contextmanager
+def profile_run(name="analysis"):
+    """
+    Profiles the wrapped block once when PSA_PROFILE is set. The stats are
+    written to PSA_PROFILE (if it is a path) or psa_profile_<name>.prof, and
+    a text summary is kept for the diagnostics panel. Later runs are not
+    profiled until rearm_profile().
+    """
+    with _lock:
+        armed, _profile["armed"] = _profile["armed"], False
+    if not armed:
+        yield
+        return
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        target = os.environ.get("PSA_PROFILE", "")
+        path = target if target not in ("", "1") else f"psa_profile_{name}.prof"
+        profiler.dump_stats(path)
+        out = io.StringIO()
+        pstats.Stats(profiler, stream=out).sort_stats("cumulative").print_stats(30)
+        with _lock:
+            _profile["summary"], _profile["path"] = out.getvalue(), path
+
+
+def rearm_profile():
+    """Profiles the next run again, if PSA_PROFILE is set."""
+    with _lock:
+        _profile["armed"] = bool(os.environ.get("PSA_PROFILE"))
+
+
+def profile_summary():
+    """Returns (path, text summary) of the last captured profile, or (None, None)."""
+    with _lock:
+        return _profile["path"], _profile["summary"]
+
+
+def _extraction_cache_stats():
+    from psa_core.extraction_cache import get_extraction_cache
+    return get_extraction_cache().stats()
+
+
+def _jd_profile_cache_stats():
+    from psa_core.jd_profiles import get_jd_profile_cache
+    return get_jd_profile_cache().stats()
+
+
+def snapshot():
+    """Returns stages, counters, extraction and JD profile cache stats and recent spans as plain data."""
+    cache, jd_cache = _extraction_cache_stats(), _jd_profile_cache_stats()
+    with _lock:
+        return {
+            "stages": {name: dict(stage) for name, stage in sorted(_stages.items())},
+            "counters": dict(sorted(_counters.items())),
+            "extraction_cache": cache,
+            "jd_profile_cache": jd_cache,
+            "recent_spans": [{"stage": n, "seconds": s, "at": t} for n, s, t in _recent],
+        }
+
+
+def export_json():
+    return json.dumps(snapshot(), indent=2)
+
+
+def _metric_name(name):
+    return re.sub(r"[^a-zA-Z0-9_]", "_", name)
+
+
+def _label(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def export_prometheus():
+    """Renders the current metrics in Prometheus text exposition format."""
+    data = snapshot()
+    lines = [
+        "# HELP psa_stage_seconds_total Total wall-clock seconds spent in each pipeline stage.",
+        "# TYPE psa_stage_seconds_total counter",
+    ]
+    lines += [f'psa_stage_seconds_total{{stage="{_label(n)}"}} {s["total_seconds"]:.6f}' for n, s in data["stages"].items()]
+    lines += ["# HELP psa_stage_calls_total Number of times each pipeline stage ran.",
+              "# TYPE psa_stage_calls_total counter"]
+    lines += [f'psa_stage_calls_total{{stage="{_label(n)}"}} {s["count"]}' for n, s in data["stages"].items()]
+    lines += ["# HELP psa_stage_max_seconds Slowest observed run of each pipeline stage.",
+              "# TYPE psa_stage_max_seconds gauge"]
+    lines += [f'psa_stage_max_seconds{{stage="{_label(n)}"}} {s["max_seconds"]:.6f}' for n, s in data["stages"].items()]
+    for name, value in data["counters"].items():
+        metric = f"psa_{_metric_name(name)}_total"
+        lines += [f"# TYPE {metric} counter", f"{metric} {value}"]
+    for cache in ("extraction_cache", "jd_profile_cache"):
+        for name, value in data[cache].items():
+            if name in ("hits", "disk_hits", "misses", "evictions"):
+                metric, kind = f"psa_{cache}_{name}_total", "counter"
+            else:
+                metric, kind = f"psa_{cache}_{name}", "gauge"
+            lines += [f"# TYPE {metric} {kind}", f"{metric} {value}"]
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,163 @@
+"""
+Word-variant normalization: "adapting" -> "adapt", "collaborated" ->
+"collaboration", "analytical" -> "analytics".
+
+A NormalizationTable is built once per vocabulary (an ontology's keywords, or
+a gap ontology's terms and aliases). Vocabulary words that share a stem form
+one class, and every surface form the table knows maps to the class's id and
+canonical spelling. Known forms are the words themselves, their stems and the
+regular inflections of each word. Matching a document token is then one dict
+lookup. The first time a token is seen, an unknown form
+costs one stem() call. Results are memoized per table, so later analyses see
+each document token as a cache hit.
+"""
+import functools
+from collections import defaultdict
+
+MIN_STEM = 3
+# Derivational suffixes only apply to longer stems, so "topic" does not become "top".
+MIN_DERIVED_STEM = 4
+MEMO_SIZE = 1 << 16
+
+# (suffix, replacement, min stem length); the longest applicable suffix is stripped, twice at most,
+# and the second strip always leaves at least MIN_DERIVED_STEM characters ("presence" -> "pres", not "pre").
+SUFFIX_RULES = sorted([
+    ("s", "", MIN_STEM), ("es", "", MIN_STEM), ("ed", "", MIN_STEM), ("ing", "", MIN_STEM),
+    ("er", "", MIN_STEM), ("ers", "", MIN_STEM), ("e", "", MIN_STEM),
+    ("ies", "y", MIN_STEM), ("ied", "y", MIN_STEM), ("y", "", MIN_DERIVED_STEM), ("ly", "", MIN_DERIVED_STEM),
+    ("ion", "", MIN_DERIVED_STEM), ("ions", "", MIN_DERIVED_STEM),
+    ("ation", "", MIN_DERIVED_STEM), ("ations", "", MIN_DERIVED_STEM),
+    ("ate", "", MIN_DERIVED_STEM), ("ated", "", MIN_DERIVED_STEM), ("ating", "", MIN_DERIVED_STEM),
+    ("ative", "", MIN_DERIVED_STEM), ("ator", "", MIN_DERIVED_STEM), ("ators", "", MIN_DERIVED_STEM),
+    ("ive", "", MIN_DERIVED_STEM), ("ity", "", MIN_DERIVED_STEM), ("ment", "", MIN_DERIVED_STEM),
+    ("ments", "", MIN_DERIVED_STEM), ("ance", "", MIN_DERIVED_STEM), ("ence", "", MIN_DERIVED_STEM),
+    ("able", "", MIN_DERIVED_STEM), ("ible", "", MIN_DERIVED_STEM), ("al", "", MIN_DERIVED_STEM),
+    ("ally", "", MIN_DERIVED_STEM), ("ic", "", MIN_DERIVED_STEM), ("ics", "", MIN_DERIVED_STEM),
+    ("ical", "", MIN_DERIVED_STEM), ("ically", "", MIN_DERIVED_STEM),
+], key=lambda rule: -len(rule[0]))
+VOWELS = frozenset("aeiouy")
+# Doubled finals that belong to the word ("press", "buzz") are kept when undoubling.
+KEEP_DOUBLED = frozenset("sz")
+# Stripping a bare "e" or "y" leaves a stem that different words share ("police", "policy" -> "polic"),
+# so such matches must go through the inflections the table lists.
+BARE_SUFFIXES = frozenset(("e", "y"))
+# Words whose ending only looks like a suffix ("general" is not "gener" + "al", like "generation").
+STEM_EXCEPTIONS = frozenset(("general", "generic", "police"))
+
+
+def _strip_suffix(word, floor=0):
+    for suffix, replacement, min_stem in SUFFIX_RULES:
+        if word.endswith(suffix) and len(word) - len(suffix) >= max(min_stem, floor):
+            base = word[:-len(suffix)]
+            # "status" and "press" are not plurals.
+            if suffix == "s" and base[-1] in "su":
+                continue
+            return base + replacement, suffix
+    return None, None
+
+
+def _stem(word):
+    """stem(), plus the form a bare "e" or "y" was stripped from ("measurement" -> "measure"), else None."""
+    bare_base = None
+    for floor in (0, MIN_DERIVED_STEM):
+        if word in STEM_EXCEPTIONS:
+            break
+        stripped, suffix = _strip_suffix(word, floor)
+        if stripped is None:
+            break
+        if suffix in BARE_SUFFIXES:
+            bare_base = word
+        word = stripped
+    # "planning" -> "plann" -> "plan"
+    if len(word) > MIN_STEM and word[-1] == word[-2] and word[-1] not in VOWELS | KEEP_DOUBLED:
+        word = word[:-1]
+    return word, bare_base
+
+
+def stem(word):
+    """
+    A light suffix-stripping stemmer: lower-cased word in, stem out. Forms of
+    one word stem alike ("collaborate", "collaborated", "collaboration" ->
+    "collabor"). Stems are match keys, not words.
+    """
+    return _stem(word)[0]
+
+
+def inflections(word):
+    """Regular inflected forms of a word (plural/third person, past, gerund, agent noun)."""
+    if word.endswith("e"):
+        base = word[:-1]
+        return {word + "s", word + "d", base + "ing", word + "r", word + "rs"}
+    if word.endswith("y") and len(word) > 1 and word[-2] not in VOWELS:
+        base = word[:-1]
+        return {base + "ies", base + "ied", word + "ing", base + "ier", base + "iers"}
+    plural = word + "es" if word.endswith(("s", "x", "z", "ch", "sh")) else word + "s"
+    return {plural, word + "ed", word + "ing", word + "er", word + "ers"}
+
+
+class NormalizationTable:
+    """
+    Maps surface forms to canonical keyword ids. keywords[id] is the canonical
+    spelling of a class (its shortest member). An unknown token matches by
+    stem only when neither it nor the class needed a bare "e"/"y" strip; such
+    classes are reached through the inflections of the stripped base instead
+    ("measured" via "measure" for "measurement").
+    """
+
+    def __init__(self, vocabulary, memo_size=MEMO_SIZE):
+        classes = defaultdict(set)
+        bases = defaultdict(set)
+        # Stems that only listed forms may reach ("polic" from "policy").
+        guarded = set()
+        for word in vocabulary:
+            if word:
+                key, bare_base = _stem(word)
+                classes[key].add(word)
+                bases[key].add(word)
+                if bare_base:
+                    bases[key].add(bare_base)
+                    guarded.add(key)
+        canonical = {key: min(members, key=lambda w: (len(w), w)) for key, members in classes.items()}
+        self.keywords = sorted(set(canonical.values()))
+        ids = {kw: idx for idx, kw in enumerate(self.keywords)}
+
+        # Least to most specific, so a vocabulary word always maps to its own class.
+        forms = {}
+        for key, members in bases.items():
+            idx = ids[canonical[key]]
+            for word in members:
+                forms[word] = idx
+                # Inflections need not share the word's stem ("influences" -> "influenc", not "influ").
+                for form in inflections(word):
+                    forms[form] = idx
+        for key in classes:
+            forms[key] = ids[canonical[key]]
+        for key, members in classes.items():
+            for word in members:
+                forms[word] = ids[canonical[key]]
+        self.forms = forms
+        self.guarded = frozenset(guarded)
+        self.lookup = functools.lru_cache(maxsize=memo_size)(self._resolve)
+
+    def _resolve(self, token):
+        idx = self.forms.get(token)
+        if idx is None:
+            key, bare_base = _stem(token)
+            if bare_base is None and key not in self.guarded:
+                idx = self.forms.get(key)
+        return idx
+
+    def canonical(self, token):
+        """The canonical keyword for a lower-cased token, or None when it is not a vocabulary form."""
+        idx = self.lookup(token)
+        return None if idx is None else self.keywords[idx]
+
+    def token(self, token):
+        """Like canonical(), but passes unknown tokens through unchanged (for token-stream matchers)."""
+        idx = self.lookup(token)
+        return token if idx is None else self.keywords[idx]
+
+    def normalize(self, words):
+        """Reduces a token set to the set of canonical keywords it contains."""
+        keywords, lookup = self.keywords, self.lookup
+        return {keywords[idx] for idx in map(lookup, words) if idx is not None}
@@ -0,0 +1,305 @@
+import heapq
+import os
+import threading
+from collections import defaultdict
+
+from psa_core import metrics
+from psa_core.matcher import PhraseMatcher, phrase_tokens
+from psa_core.normalization import NormalizationTable
+from psa_core.ontology_store import load_json_document
+from psa_core.tokenizer import clean_and_extract_words, normalize_text
+
+
+class CompiledOntology:
+    """
+    Precomputed keyword index over an ontology.json dict.
+
+    Built once per ontology so that scoring a document pair is a single pass
+    over the JD tokens instead of re-splitting every phrase for every domain
+    and SOC group on each analysis.
+
+    In phrase mode every ontology entry is one keyword ("machine learning"
+    rather than "machine" and "learning"), and documents are reduced to the
+    entries they contain with a single PhraseMatcher scan.
+
+    With match_variants, ontology words are compiled into a NormalizationTable
+    (see psa_core.normalization) and document words are looked up in it. An
+    inflected or derived form then counts as the keyword ("collaborated" for
+    "collaboration"). In word mode, keywords that share a stem merge into
+    their canonical spelling.
+    """
+
+    def __init__(self, ontology, phrase_mode=False, match_variants=False):
+        self.source = ontology
+        self.phrase_mode = phrase_mode
+        self.match_variants = match_variants
+        signal_domains = ontology.get("SignalDomains", {})
+        soc_groups = ontology.get("SOC_Groups", {})
+
+        self.domain_names = list(signal_domains)
+        self.group_names = list(soc_groups)
+        self.soc_groups = soc_groups
+
+        self.normalizer = None
+        if match_variants:
+            words = (phrase_tokens(normalize_text(phrase)) if phrase_mode else phrase.lower().split()
+                     for phrases in signal_domains.values() for phrase in phrases)
+            self.normalizer = NormalizationTable(word for tokens in words for word in tokens)
+
+        if phrase_mode:
+            split = self._phrase_keywords
+        elif self.normalizer:
+            split = lambda phrase: [self.normalizer.canonical(word) for word in phrase.lower().split()]
+        else:
+            split = lambda phrase: phrase.lower().split()
+        self.domain_keywords = {
+            domain: frozenset(kw for phrase in phrases for kw in split(phrase))
+            for domain, phrases in signal_domains.items()
+        }
+        self.group_keywords = {
+            group: frozenset(
+                kw for domain in group_data.get("signal_domains", [])
+                for kw in self.domain_keywords.get(domain, ())
+            )
+            for group, group_data in soc_groups.items()
+        }
+
+        # Inverted index: keyword -> indices into domain_names / group_names.
+        keyword_domains, keyword_groups = defaultdict(list), defaultdict(list)
+        for idx, domain in enumerate(self.domain_names):
+            for kw in self.domain_keywords[domain]:
+                keyword_domains[kw].append(idx)
+        for idx, group in enumerate(self.group_names):
+            for kw in self.group_keywords[group]:
+                keyword_groups[kw].append(idx)
+        self.keyword_domains = {kw: tuple(ids) for kw, ids in keyword_domains.items()}
+        self.keyword_groups = {kw: tuple(ids) for kw, ids in keyword_groups.items()}
+        self.group_keyword_sets = [self.group_keywords[group] for group in self.group_names]
+        # Stable small-integer ids, so results can hold keyword/domain/group references instead of strings.
+        self.keywords = sorted(self.keyword_domains)
+        self.keyword_ids = {kw: idx for idx, kw in enumerate(self.keywords)}
+        self.domain_ids = {domain: idx for idx, domain in enumerate(self.domain_names)}
+        self.group_ids = {group: idx for idx, group in enumerate(self.group_names)}
+        self._vector_scorer = None
+        # Every matching mode of one ontology shares this dict, so each is compiled once.
+        self._modes = {(phrase_mode, match_variants): self}
+
+        # Entries are matched in normalized text but reported by their lower-cased ontology spelling.
+        self.phrase_matcher = None
+        if phrase_mode:
+            self.phrase_matcher = PhraseMatcher(
+                ((normalize_text(kw), kw) for kw in self.keyword_domains),
+                normalize=self.normalizer.token if self.normalizer else None)
+
+    @staticmethod
+    def _phrase_keywords(phrase):
+        return [phrase.lower()] if normalize_text(phrase).split() else []
+
+    def extract_keywords(self, text):
+        """Reduces a document to the token set this index scores against."""
+        if self.phrase_mode:
+            return self.phrase_matcher.matched(normalize_text(text))
+        words = clean_and_extract_words(text)
+        return self.normalizer.normalize(words) if self.normalizer else words
+
+    def restrict(self, words):
+        """Keeps only the words this index knows; scoring the restricted sets gives identical results."""
+        return frozenset(w for w in words if w in self.keyword_domains)
+
+    def mode(self, phrases=False, variants=False):
+        """Returns the index for the same ontology with the given matching options, built on first use."""
+        key = (bool(phrases), bool(variants))
+        compiled = self._modes.get(key)
+        if compiled is None:
+            compiled = CompiledOntology(self.source, phrase_mode=key[0], match_variants=key[1])
+            compiled._modes = self._modes
+            compiled = self._modes.setdefault(key, compiled)
+        return compiled
+
+    def phrases(self):
+        """Returns the phrase-mode index for the same ontology, built on first use."""
+        return self.mode(True, self.match_variants)
+
+    def variants(self):
+        """Returns the word-variant-matching index for the same ontology, built on first use."""
+        return self.mode(self.phrase_mode, True)
+
+    def vectorized(self):
+        """Returns the sparse-matrix VectorScorer for this ontology, built on first use."""
+        if self._vector_scorer is None:
+            # numpy/scipy are only imported when the vectorized backend is requested.
+            from psa_core.vector_engine import VectorScorer
+            self._vector_scorer = VectorScorer(self)
+        return self._vector_scorer
+
+    def predict_soc_group(self, resume_words, jd_words):
+        """
+        Returns the SOC group whose JD-relevant keywords best align with the resume.
+        Ties resolve to the group listed first in the ontology.
+        """
+        if not self.group_names:
+            return None
+        ranked = self.rank_soc_groups(resume_words, jd_words, k=1)
+        return self.group_names[ranked[0][0]] if ranked else self.group_names[0]
+
+    def rank_soc_groups(self, resume_words, jd_words, k=5):
+        """
+        Returns up to k (group index, score) pairs, best first, where a group's
+        score is the number of JD keywords matched in the resume that belong
+        to it. Groups with no matched keyword are left out; ties keep ontology
+        order.
+
+        Matched keywords are processed rarest first, accumulating scores from
+        the inverted index. Once the keywords left could no longer lift an
+        unseen group into the top k, no new candidates are admitted, the
+        remaining (most common) keywords only update surviving candidates, and
+        candidates that cannot catch the k-th score are dropped. The cost
+        follows the matched keywords' postings, not the number of groups.
+        """
+        keyword_groups = self.keyword_groups
+        matched = sorted((kw for kw in jd_words if kw in resume_words and kw in keyword_groups),
+                         key=lambda kw: len(keyword_groups[kw]))
+        if not matched or k <= 0:
+            return []
+
+        # Admission phase: plain accumulation. The k-th best score can only
+        # exceed what the keywords still to come could give an unseen group
+        # (so admission can close) in the second half, and it is checked there
+        # each time the number of keywords left halves.
+        total = len(matched)
+        scores = [0] * len(self.group_names)
+        touched = []
+        checkpoint = total // 2
+        position = total
+        for position, kw in enumerate(matched, 1):
+            for idx in keyword_groups[kw]:
+                if not scores[idx]:
+                    touched.append(idx)
+                scores[idx] += 1
+            left = total - position
+            if left <= checkpoint and left < position and len(touched) >= k:
+                checkpoint = left // 2
+                if heapq.nlargest(k, [scores[idx] for idx in touched])[-1] > left:
+                    break
+
+        candidates = {idx: scores[idx] for idx in touched}
+        # Pruning phase: only groups that can still reach the k-th score are
+        # kept, and the remaining keywords (the most common ones) only update them.
+        rest = matched[position:]
+        for offset, kw in enumerate(rest):
+            threshold = heapq.nlargest(k, candidates.values())[-1]
+            remaining = len(rest) - offset
+            candidates = {idx: score for idx, score in candidates.items() if score + remaining >= threshold}
+            postings = keyword_groups[kw]
+            if len(postings) <= len(candidates):
+                for idx in postings:
+                    if idx in candidates:
+                        candidates[idx] += 1
+            else:
+                for idx in candidates:
+                    if kw in self.group_keyword_sets[idx]:
+                        candidates[idx] += 1
+
+        return heapq.nsmallest(k, candidates.items(), key=lambda item: (-item[1], item[0]))
+
+    def describe_soc_groups(self, ranked, resume_words, jd_words):
+        """
+        Expands rank_soc_groups() output with per-group evidence: the matched
+        keywords, and the share of the group's JD-relevant keywords they cover.
+        """
+        described = []
+        for idx, score in ranked:
+            keywords = self.group_keyword_sets[idx]
+            jd_relevant = sum(1 for kw in jd_words if kw in keywords)
+            described.append({
+                "group": self.group_names[idx],
+                "score": score,
+                "coverage": (score / jd_relevant) * 100 if jd_relevant else 0,
+                "evidence": sorted(kw for kw in jd_words if kw in resume_words and kw in keywords),
+            })
+        return described
+
+    def top_soc_groups(self, resume_words, jd_words, k=5):
+        """Returns the k best-matching SOC groups as dicts with group, score, coverage and evidence."""
+        return self.describe_soc_groups(self.rank_soc_groups(resume_words, jd_words, k), resume_words, jd_words)
+
+    def score_domains(self, resume_words, jd_words):
+        """
+        Returns (domain_scores, domain_gaps, overall_score) for a tokenized pair.
+        """
+        jd_hits, resume_hits = defaultdict(int), defaultdict(int)
+        gaps = defaultdict(list)
+        all_jd_keywords = matched_keywords = 0
+        for kw in jd_words:
+            domain_ids = self.keyword_domains.get(kw)
+            if not domain_ids:
+                continue
+            in_resume = kw in resume_words
+            all_jd_keywords += 1
+            matched_keywords += in_resume
+            for idx in domain_ids:
+                jd_hits[idx] += 1
+                if in_resume:
+                    resume_hits[idx] += 1
+                else:
+                    gaps[idx].append(kw)
+
+        domain_scores, domain_gaps = {}, {}
+        for idx in sorted(jd_hits):
+            domain = self.domain_names[idx]
+            domain_scores[domain] = (resume_hits[idx] / jd_hits[idx]) * 100
+            if idx in gaps:
+                domain_gaps[domain] = sorted(gaps[idx])
+
+        overall_score = (matched_keywords / all_jd_keywords) * 100 if all_jd_keywords else 0
+        return domain_scores, domain_gaps, overall_score
+
+    def analyze(self, resume_words, jd_words):
+        """
+        Scores tokenized resume/JD word sets. Returns the results dict used by
+        the app, minus the raw document text.
+        """
+        with metrics.span("score.soc_group"):
+            best_soc_group = self.predict_soc_group(resume_words, jd_words)
+        with metrics.span("score.domains"):
+            domain_scores, domain_gaps, overall_score = self.score_domains(resume_words, jd_words)
+        group_data = self.soc_groups.get(best_soc_group, {})
+        return {
+            "predicted_soc_group": best_soc_group,
+            "critical_domains": group_data.get("signal_domains", []),
+            "domain_scores": domain_scores,
+            "domain_gaps": domain_gaps,
+            "overall_score": overall_score,
+            "suggested_titles": group_data.get("example_titles", []),
+        }
+
+
+def load_ontology(ontology_path="ontology.json"):
+    """
+    Reads an ontology.json file through its precompiled artifact (see
+    psa_core.ontology_store). The same read-only document is returned until the
+    file changes. Raises OSError or ValueError if it is missing or malformed.
+    """
+    return load_json_document(ontology_path)
+
+
+_compiled_cache = {}
+_compiled_lock = threading.Lock()
+
+
+def load_compiled_ontology(ontology_path="ontology.json"):
+    """Loads and compiles an ontology once per process, recompiling only when the file's content changes."""
+    ontology = load_ontology(ontology_path)
+    key = os.path.abspath(ontology_path)
+    with _compiled_lock:
+        cached = _compiled_cache.get(key)
+        if cached is None or cached[0] is not ontology:
+            cached = _compiled_cache[key] = (ontology, CompiledOntology(ontology))
+        return cached[1]
+
+
+def compile_ontology(ontology):
+    """Returns a CompiledOntology, compiling the raw dict if needed."""
+    if ontology is None or isinstance(ontology, CompiledOntology):
+        return ontology
+    return CompiledOntology(ontology)
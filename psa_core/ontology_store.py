@@ -0,0 +1,276 @@
+"""
+Precompiled binary ontology artifacts, reloaded only when the source file
+changes.
+
+    python -m psa_core.ontology_store ontology.json psa_ontology_comprehensive_with_alias.json
+
+compiles each JSON file into a sibling "<name>.psab" artifact. Every distinct
+string (keywords, terms, aliases, names) is stored once in a string table and
+referenced by id, so a term shared by many domains is one object after
+loading. Lists of strings, which make up nearly all of an ontology, decode
+with a single slice of the id array. The decoded document is an ordinary
+per-process object; nothing stays mapped or is shared between processes.
+
+load_json_document() is the entry point the loaders use. It returns the same
+document object for as long as the source file is unchanged: a stat() per
+call, with a SHA-256 of the source only when mtime or size moved. When the
+content really changed it loads from the artifact, (re)compiling it first if
+it is missing or stale. Callers must treat the returned document as
+read-only; it is shared.
+
+Artifacts go next to the source, or into PSA_ONTOLOGY_CACHE_DIR when set. If
+neither is writable the JSON is parsed directly.
+"""
+import argparse
+import hashlib
+import json
+import os
+import struct
+import sys
+import threading
+from array import array
+
+MAGIC = b"PSAONT\x00\x01"
+HEADER = struct.Struct("<8sI")
+ARTIFACT_SUFFIX = ".psab"
+
+NULL, TRUE, FALSE, INT, FLOAT, STR, LIST, STRLIST, DICT = range(9)
+
+
+class OntologyStoreError(Exception):
+    pass
+
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class _Encoder:
+    def __init__(self):
+        self.ids = {}
+        self.strings = []
+        self.words = array("I")
+
+    def intern(self, text):
+        if "\0" in text:
+            raise OntologyStoreError("Ontology strings may not contain NUL characters.")
+        string_id = self.ids.get(text)
+        if string_id is None:
+            string_id = self.ids[text] = len(self.strings)
+            self.strings.append(text)
+        return string_id
+
+    def encode(self, value):
+        words = self.words
+        if value is None:
+            words.append(NULL)
+        elif value is True:
+            words.append(TRUE)
+        elif value is False:
+            words.append(FALSE)
+        elif isinstance(value, int):
+            words.extend((INT, self.intern(str(value))))
+        elif isinstance(value, float):
+            words.extend((FLOAT, self.intern(repr(value))))
+        elif isinstance(value, str):
+            words.extend((STR, self.intern(value)))
+        elif isinstance(value, list) and value and all(isinstance(item, str) for item in value):
+            words.extend((STRLIST, len(value)))
+            words.extend(self.intern(item) for item in value)
+        elif isinstance(value, list):
+            words.extend((LIST, len(value)))
+            for item in value:
+                self.encode(item)
+        elif isinstance(value, dict):
+            words.extend((DICT, len(value)))
+            for key, item in value.items():
+                words.append(self.intern(key))
+                self.encode(item)
+        else:
+            raise OntologyStoreError(f"Cannot store {type(value).__name__} values.")
+
+
+def write_artifact(document, path, source_sha256):
+    """Encodes a JSON document into a binary artifact at path (written atomically)."""
+    encoder = _Encoder()
+    encoder.encode(document)
+    if sys.byteorder != "little":
+        encoder.words.byteswap()
+    strings = "\0".join(encoder.strings).encode("utf-8")
+    manifest = json.dumps({
+        "source_sha256": source_sha256,
+        "string_count": len(encoder.strings),
+        "strings_bytes": len(strings),
+        "word_count": len(encoder.words),
+    }).encode("utf-8")
+    # The id array is 4-byte aligned so it can be read straight into an array("I").
+    head = HEADER.pack(MAGIC, len(manifest)) + manifest
+    padding = b"\0" * (-(len(head) + len(strings)) % 4)
+
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(head)
+        f.write(strings)
+        f.write(padding)
+        f.write(encoder.words.tobytes())
+    os.replace(tmp_path, path)
+
+
+class _Decoder:
+    def __init__(self, strings, words):
+        self.strings = strings
+        self.words = words
+
+    def decode(self, pos):
+        """Returns (value, next position) for the node at pos."""
+        words, strings = self.words, self.strings
+        tag = words[pos]
+        if tag == STRLIST:
+            count = words[pos + 1]
+            end = pos + 2 + count
+            return list(map(strings.__getitem__, words[pos + 2:end])), end
+        if tag == STR:
+            return strings[words[pos + 1]], pos + 2
+        if tag == DICT:
+            result, pos = {}, pos + 2
+            for _ in range(words[pos - 1]):
+                key = strings[words[pos]]
+                result[key], pos = self.decode(pos + 1)
+            return result, pos
+        if tag == LIST:
+            result, pos = [], pos + 2
+            for _ in range(words[pos - 1]):
+                item, pos = self.decode(pos)
+                result.append(item)
+            return result, pos
+        if tag == INT:
+            return int(strings[words[pos + 1]]), pos + 2
+        if tag == FLOAT:
+            return float(strings[words[pos + 1]]), pos + 2
+        if tag in (NULL, TRUE, FALSE):
+            return (None, True, False)[tag], pos + 1
+        raise OntologyStoreError(f"Corrupt ontology artifact: unknown tag {tag}.")
+
+
+def read_manifest(path):
+    with open(path, "rb") as f:
+        magic, manifest_len = HEADER.unpack(f.read(HEADER.size))
+        if magic != MAGIC:
+            raise OntologyStoreError(f"{path} is not a PSA ontology artifact.")
+        return json.loads(f.read(manifest_len))
+
+
+def read_artifact(path):
+    """Returns (manifest, document) decoded from an artifact."""
+    with open(path, "rb") as f:
+        data = f.read()
+    magic, manifest_len = HEADER.unpack_from(data, 0)
+    if magic != MAGIC:
+        raise OntologyStoreError(f"{path} is not a PSA ontology artifact.")
+    offset = HEADER.size + manifest_len
+    manifest = json.loads(data[HEADER.size:offset])
+    strings_end = offset + manifest["strings_bytes"]
+    strings = data[offset:strings_end].decode("utf-8").split("\0")
+    if manifest["string_count"] == 0:
+        strings = []
+    words_start = strings_end + (-strings_end % 4)
+    words_end = words_start + 4 * manifest["word_count"]
+    words = array("I")
+    words.frombytes(data[words_start:words_end])
+    if len(words) != manifest["word_count"]:
+        raise OntologyStoreError(f"{path} is truncated.")
+    if sys.byteorder != "little":
+        words.byteswap()
+    return manifest, _Decoder(strings, words).decode(0)[0]
+
+
+def artifact_path(source_path):
+    cache_dir = os.environ.get("PSA_ONTOLOGY_CACHE_DIR")
+    if cache_dir:
+        tag = hashlib.sha256(os.path.abspath(source_path).encode("utf-8")).hexdigest()[:12]
+        return os.path.join(cache_dir, f"{os.path.basename(source_path)}.{tag}{ARTIFACT_SUFFIX}")
+    return source_path + ARTIFACT_SUFFIX
+
+
+def compile_file(source_path, out_path=None, encoding="utf-8-sig"):
+    """Compiles a JSON ontology file into its binary artifact. Returns (artifact path, document)."""
+    out_path = out_path or artifact_path(source_path)
+    with open(source_path, "rb") as f:
+        raw = f.read()
+    document = json.loads(raw.decode(encoding))
+    if os.path.dirname(out_path):
+        os.makedirs(os.path.dirname(out_path), exist_ok=True)
+    write_artifact(document, out_path, hashlib.sha256(raw).hexdigest())
+    return out_path, document
+
+
+def load_document(source_path, source_sha256, encoding="utf-8-sig"):
+    """Loads a JSON file through its artifact, compiling the artifact when it is missing or stale."""
+    path = artifact_path(source_path)
+    try:
+        if read_manifest(path).get("source_sha256") == source_sha256:
+            return read_artifact(path)[1]
+    except (OSError, ValueError, KeyError, struct.error, OntologyStoreError):
+        pass
+    try:
+        return compile_file(source_path, path, encoding)[1]
+    except OSError:
+        # Read-only deployment without a cache dir: parse the JSON directly.
+        with open(source_path, encoding=encoding) as f:
+            return json.load(f)
+
+
+class FileMemo:
+    """
+    Memoizes a loader per file path. A stat() decides whether the file may have
+    changed; if mtime or size moved, the content hash decides whether to call
+    load(path, sha256) again.
+    """
+
+    def __init__(self, load):
+        self.load = load
+        self._entries = {}
+        self._lock = threading.Lock()
+        self.loads = 0
+
+    def get(self, path):
+        key = os.path.abspath(path)
+        stat = os.stat(key)
+        signature = (stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[0] == signature:
+                return entry[2]
+            sha256 = file_sha256(key)
+            if entry and entry[1] == sha256:
+                self._entries[key] = (signature, sha256, entry[2])
+                return entry[2]
+            value = self.load(key, sha256)
+            self.loads += 1
+            self._entries[key] = (signature, sha256, value)
+            return value
+
+
+_documents = FileMemo(load_document)
+
+
+def load_json_document(path):
+    """Returns the parsed JSON document for path, shared and reloaded only when the file changes."""
+    return _documents.get(path)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compile ontology JSON files into binary artifacts.")
+    parser.add_argument("sources", nargs="+", help="ontology JSON files")
+    args = parser.parse_args(argv)
+    for source in args.sources:
+        out_path, _ = compile_file(source)
+        print(f"{source} -> {out_path} ({os.path.getsize(out_path):,} bytes, from {os.path.getsize(source):,})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,223 @@
+import io
+import os
+import queue
+import threading
+import time
+from multiprocessing import connection
+
+from psa_core.processes import env_number, worker_context
+
+
+class PdfExtractionError(Exception):
+    pass
+
+
+class PdfExtractionTimeout(PdfExtractionError):
+    pass
+
+
+class InvalidPdfError(PdfExtractionError):
+    """The bytes are not a PDF that PyPDF2 can read."""
+
+
+class PdfPages:
+    """Per-page text of an extracted PDF, in page order."""
+
+    def __init__(self, pages, total_pages, max_pages):
+        self.pages = pages
+        self.total_pages = total_pages
+        self.truncated = total_pages > len(pages)
+        self.max_pages = max_pages
+
+    def warning(self):
+        if self.truncated:
+            return f"Only the first {self.max_pages} of {self.total_pages} PDF pages were analyzed."
+        return None
+
+
+def _extract_page_range(data, start, stop):
+    """Worker entry point: returns (page_texts, total_pages) for pages [start, stop)."""
+    from PyPDF2 import PdfReader
+    from PyPDF2.errors import PyPdfError
+
+    try:
+        reader = PdfReader(io.BytesIO(data))
+        total = len(reader.pages)
+        return [reader.pages[i].extract_text() or "" for i in range(start, min(stop, total))], total
+    except PyPdfError as e:
+        # Re-raised as a psa_core type so callers can tell bad input apart without importing PyPDF2.
+        raise InvalidPdfError(f"{type(e).__name__}: {e}") from None
+
+
+def _worker_loop(conn):
+    """Worker process: extracts page ranges sent over conn until the parent closes it."""
+    while True:
+        try:
+            data, start, stop = conn.recv()
+        except (EOFError, OSError):
+            return
+        try:
+            reply = ("ok", _extract_page_range(data, start, stop))
+        except Exception as e:
+            reply = ("error", e)
+        try:
+            conn.send(reply)
+        except Exception:
+            # The exception itself would not pickle.
+            conn.send(("error", PdfExtractionError(f"{type(reply[1]).__name__}: {reply[1]}")))
+
+
+class _Worker:
+    """One extraction process and the pipe to it; started is when its current chunk was handed over."""
+
+    def __init__(self, context):
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(target=_worker_loop, args=(child_conn,), daemon=True)
+        self.process.start()
+        child_conn.close()
+        self.started = None
+
+    def submit(self, data, start, stop):
+        self.conn.send((data, start, stop))
+        self.started = time.monotonic()
+
+    def receive(self):
+        """Returns the chunk result, re-raising the worker's exception; EOFError if the process died."""
+        status, value = self.conn.recv()
+        if status == "error":
+            raise value
+        return value
+
+    def kill(self):
+        self.process.kill()
+        self.process.join()
+        self.conn.close()
+
+
+class PdfExtractionPool:
+    """
+    Bounded pool of PyPDF2 extraction processes.
+
+    Each document gets one wall-clock budget, counted from when a worker
+    picks up its first chunk (time spent queued behind other uploads before
+    that does not count), and a page limit. Documents longer than
+    chunk_pages are split into page ranges that run on separate workers and
+    are reassembled in order. A document that overruns its budget has its
+    remaining chunks dropped and only its own workers killed and replaced,
+    and raises PdfExtractionTimeout, so one hung PDF can neither pin a core
+    nor fail other sessions' extractions.
+
+    max_workers=0 extracts inline in the calling process, with no timeout.
+    """
+
+    def __init__(self, max_workers=None, timeout=None, max_pages=None, chunk_pages=None):
+        if max_workers is None:
+            max_workers = env_number("PSA_PDF_WORKERS", min(4, os.cpu_count() or 1))
+        self.max_workers = max_workers
+        self.timeout = timeout or env_number("PSA_PDF_TIMEOUT", 30, float)
+        self.max_pages = max_pages or env_number("PSA_PDF_MAX_PAGES", 200)
+        self.chunk_pages = chunk_pages or env_number("PSA_PDF_CHUNK_PAGES", 20)
+        # spawn, not fork: the Streamlit server is multi-threaded.
+        self._context = worker_context()
+        # Idle workers, plus one None per worker slot that has not been started (or was retired).
+        self._idle = queue.LifoQueue()
+        for _ in range(max(self.max_workers, 0)):
+            self._idle.put(None)
+
+    def _acquire(self, block, timeout=None):
+        """Returns an idle worker, starting one in a free slot; None if none is free (within timeout)."""
+        try:
+            worker = self._idle.get(block=block, timeout=timeout)
+        except queue.Empty:
+            return None
+        if worker is None:
+            try:
+                worker = _Worker(self._context)
+            except Exception:
+                self._idle.put(None)
+                raise
+        return worker
+
+    def _retire(self, worker):
+        worker.kill()
+        self._idle.put(None)
+
+    def extract_pages(self, data, timeout=None, max_pages=None):
+        """Returns PdfPages for the PDF bytes."""
+        timeout, max_pages = timeout or self.timeout, max_pages or self.max_pages
+        if self.max_workers == 0:
+            pages, total = _extract_page_range(data, 0, max_pages)
+            return PdfPages(pages, total, max_pages)
+        first_stop = min(self.chunk_pages, max_pages)
+        [(pages, total)], deadline = self._run_chunks(data, [(0, first_stop)], timeout)
+        limit = min(total, max_pages)
+        ranges = [(start, min(start + self.chunk_pages, limit)) for start in range(first_stop, limit, self.chunk_pages)]
+        chunks, _ = self._run_chunks(data, ranges, timeout, deadline)
+        for chunk, _ in chunks:
+            pages.extend(chunk)
+        return PdfPages(pages, total, max_pages)
+
+    def _run_chunks(self, data, ranges, timeout, deadline=None):
+        """
+        Extracts page ranges in parallel and returns (results in order, deadline). The
+        document's deadline is set timeout after its first chunk starts; pass it back in
+        for the document's later chunks.
+        """
+        results = [None] * len(ranges)
+        queued = list(enumerate(ranges))[::-1]
+        running = {}
+        try:
+            while queued or running:
+                if deadline is not None and time.monotonic() >= deadline:
+                    raise PdfExtractionTimeout(f"PDF extraction exceeded {timeout:g}s and was stopped.")
+                # Only block for a worker while holding none, so concurrent documents cannot deadlock.
+                while queued:
+                    wait_for = None if deadline is None else max(0, deadline - time.monotonic())
+                    worker = self._acquire(block=not running, timeout=wait_for)
+                    if worker is None:
+                        break
+                    index, (start, stop) = queued.pop()
+                    running[index] = worker
+                    try:
+                        worker.submit(data, start, stop)
+                    except OSError:
+                        raise PdfExtractionError("A PDF extraction worker exited unexpectedly.")
+                    if deadline is None:
+                        deadline = worker.started + timeout
+
+                ready = connection.wait([worker.conn for worker in running.values()],
+                                        timeout=max(0, deadline - time.monotonic()))
+                for index, worker in list(running.items()):
+                    if worker.conn in ready:
+                        del running[index]
+                        try:
+                            results[index] = worker.receive()
+                        except (EOFError, OSError):
+                            self._retire(worker)
+                            raise PdfExtractionError("A PDF extraction worker exited unexpectedly.")
+                        except BaseException:
+                            self._idle.put(worker)
+                            raise
+                        self._idle.put(worker)
+        finally:
+            # This document failed; stop its other chunks without touching anyone else's workers.
+            for worker in running.values():
+                self._retire(worker)
+        return results, deadline
+
+
+_shared_pool = None
+_shared_lock = threading.Lock()
+
+
+def get_pdf_pool():
+    """Returns the process-wide PdfExtractionPool, configured from PSA_PDF_* env vars."""
+    global _shared_pool
+    with _shared_lock:
+        if _shared_pool is None:
+            _shared_pool = PdfExtractionPool()
+        return _shared_pool
+
+
+def extract_pdf_pages(data, timeout=None, max_pages=None):
+    return get_pdf_pool().extract_pages(data, timeout=timeout, max_pages=max_pages)
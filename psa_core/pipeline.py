@@ -0,0 +1,105 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import cached_property
+
+from psa_core import metrics
+from psa_core.extraction import extract_text_from_file
+from psa_core.extraction_cache import read_file_bytes
+
+
+@dataclass(frozen=True, slots=True)
+class DocumentProfile:
+    """One document, extracted and tokenized: its text and lowercased word set."""
+
+    text: str
+    words: frozenset
+
+    @classmethod
+    def from_text(cls, text):
+        metrics.increment("pipeline.tokenize")
+        return cls(text, frozenset(text.lower().split()))
+
+
+class ReportPipeline:
+    """
+    Memoized stages for one resume/JD pair. Each document is extracted and
+    tokenized on first use and the profile is shared by every report built
+    from the pair. extract(file) -> str is the extraction entry point.
+    """
+
+    def __init__(self, resume_file=None, jd_file=None, extract=extract_text_from_file):
+        self._files = {"resume": resume_file, "jd": jd_file}
+        self._profiles = {}
+        self.extract = extract
+        self._lock = threading.Lock()
+
+    def _profile(self, role):
+        with self._lock:
+            profile = self._profiles.get(role)
+            if profile is None:
+                file = self._files[role]
+                metrics.increment("pipeline.extract")
+                profile = self._profiles[role] = DocumentProfile.from_text(self.extract(file) if file is not None else "")
+                # The profile replaces the upload; the pipeline stops holding its bytes.
+                del self._files[role]
+            return profile
+
+    @property
+    def resume(self):
+        return self._profile("resume")
+
+    @property
+    def jd(self):
+        return self._profile("jd")
+
+    @cached_property
+    def signal_table(self):
+        """(matched, score, missing[:10]) of JD words found in the resume."""
+        resume_words, jd_words = self.resume.words, self.jd.words
+        matched = list(jd_words & resume_words)
+        missing = list(jd_words - resume_words)
+        score = len(matched) / len(jd_words) * 100 if jd_words else 0
+        return matched, score, missing[:10]
+
+
+def _content_key(file):
+    return hashlib.sha256(read_file_bytes(file)).hexdigest() if file is not None else ""
+
+
+class PipelineCache:
+    """LRU of ReportPipelines keyed by the content hashes of the pair and the extractor."""
+
+    def __init__(self, maxsize=32):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, resume_file, jd_file, extract=extract_text_from_file):
+        key = (_content_key(resume_file), _content_key(jd_file), extract)
+        with self._lock:
+            pipeline = self._entries.get(key)
+            if pipeline is not None:
+                self._entries.move_to_end(key)
+                return pipeline
+            pipeline = self._entries[key] = ReportPipeline(resume_file, jd_file, extract)
+            if len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return pipeline
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+_pipelines = PipelineCache()
+
+
+def get_report_pipeline_cache():
+    return _pipelines
+
+
+def get_report_pipeline(resume_file, jd_file, extract=extract_text_from_file):
+    """Returns the shared ReportPipeline for this resume/JD content, creating it on first use."""
+    return _pipelines.get(resume_file, jd_file, extract)
@@ -0,0 +1,51 @@
+"""
+Helpers shared by the PDF extraction and export process pools.
+
+Spawned children normally re-import the parent's __main__ (as __mp_main__)
+before running their target. Under `streamlit run app.py` that is the whole
+app script: Streamlit, the license check and the ontology load, once per
+worker. worker_context() starts processes with __main__ hidden instead; pool
+targets live in psa_core modules and never need it.
+"""
+import os
+import sys
+import threading
+import types
+from multiprocessing import context
+
+_main_lock = threading.Lock()
+
+
+def env_number(name, default, cast=int):
+    """The environment variable name as a number, or default when it is unset or malformed."""
+    try:
+        return cast(os.environ.get(name, default))
+    except ValueError:
+        return cast(default)
+
+
+class _SpawnProcess(context.SpawnProcess):
+    @staticmethod
+    def _Popen(process_obj):
+        # The spawn preparation data (including which main module to import) is built while
+        # starting the process, so __main__ only has to be hidden for that long.
+        with _main_lock:
+            main = sys.modules["__main__"]
+            sys.modules["__main__"] = types.ModuleType("__main__")
+            try:
+                return context.SpawnProcess._Popen(process_obj)
+            finally:
+                sys.modules["__main__"] = main
+
+
+class _SpawnContext(context.SpawnContext):
+    Process = _SpawnProcess
+
+
+_context = _SpawnContext()
+
+
+def worker_context():
+    """A spawn multiprocessing context whose processes do not import the parent's __main__."""
+    return _context
+
@@ -0,0 +1,71 @@
+import heapq
+import zipfile
+
+from psa_core.extraction import archive_members, extract_text_from_bytes, file_kind, oversized_reason
+from psa_core.jd_profiles import get_jd_profile
+from psa_core.ontology import compile_ontology
+from psa_core.scoring import calculate_trust_visibility_scores
+
+
+class TopKRanker:
+    """
+    Keeps the k best-scoring candidates seen so far in a min-heap, so memory
+    stays O(k) however many candidates are pushed. Ties keep the earlier one.
+    """
+
+    def __init__(self, k):
+        self.k = k
+        self._heap = []
+        self._seen = 0
+
+    def push(self, score, name, analysis):
+        entry = (score, -self._seen, name, analysis)
+        self._seen += 1
+        if len(self._heap) < self.k:
+            heapq.heappush(self._heap, entry)
+        elif entry > self._heap[0]:
+            heapq.heapreplace(self._heap, entry)
+
+    def ranked(self):
+        """Returns [(name, analysis)] best first."""
+        return [(name, analysis) for _, _, name, analysis in sorted(self._heap, reverse=True)]
+
+
+def rank_resumes(jd_text, archive, ontology, k=10, match_phrases=False, on_progress=None, match_variants=False):
+    """
+    Scores every resume in a ZIP archive (path or file object) against one JD
+    and returns the top k as [(name, analysis)], best overall_score first.
+
+    The JD profile comes from the shared cache; resumes are read, extracted and scored one at a
+    time and discarded unless they make the top k. on_progress(done, total,
+    ranker) is called after each resume; unreadable resumes, and members too
+    large to read, are reported as (name, reason) in the returned skipped list.
+    """
+    compiled = compile_ontology(ontology)
+    if match_phrases:
+        compiled = compiled.phrases()
+    if match_variants:
+        compiled = compiled.variants()
+    jd_profile = get_jd_profile(compiled, jd_text)
+
+    ranker = TopKRanker(k)
+    with zipfile.ZipFile(archive) as zf:
+        members, oversized = archive_members(zf)
+        skipped = [(info.filename, oversized_reason(info)) for info in oversized]
+        for done, info in enumerate(members, 1):
+            try:
+                # One-off documents: bypass the shared extraction cache so memory stays flat.
+                text = extract_text_from_bytes(zf.read(info), file_kind(info.filename), use_cache=False)
+            except Exception as e:
+                text, error = "", str(e)
+            else:
+                error = "no text extracted"
+            if text:
+                analysis = jd_profile.analyze(compiled.extract_keywords(text))
+                analysis["trust_score"], analysis["visibility_score"] = calculate_trust_visibility_scores(analysis)
+                ranker.push(analysis["overall_score"], info.filename, analysis)
+            else:
+                skipped.append((info.filename, error))
+            if on_progress:
+                on_progress(done, len(members), ranker)
+    return ranker.ranked(), skipped
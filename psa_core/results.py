@@ -0,0 +1,103 @@
+from dataclasses import dataclass, replace
+
+from psa_core.extraction_cache import get_extraction_cache
+
+RESULT_KEYS = (
+    "predicted_soc_group", "critical_domains", "domain_scores", "domain_gaps", "overall_score",
+    "resume_text", "jd_text", "suggested_titles", "top_soc_groups",
+)
+
+
+@dataclass(slots=True)
+class AnalysisResult:
+    """
+    Compact analysis result for long-lived session state.
+
+    Holds scores plus domain, group and keyword ids into the CompiledOntology
+    that produced them, and the content-hash keys of the two documents in the
+    shared extraction cache; no strings of its own. Reads like the results
+    dict from analyze_texts (result["domain_gaps"], result.get(...)), with the
+    names and texts looked up on access. resume_text / jd_text are None once
+    the shared cache has evicted them.
+    """
+
+    ontology: object
+    soc_group: int
+    overall_score: float
+    domain_scores: tuple
+    domain_gaps: tuple
+    top_soc_groups: tuple
+    resume_key: str
+    jd_key: str
+
+    @classmethod
+    def from_analysis(cls, ontology, analysis, resume_text=None, jd_text=None, resume_key=None, jd_key=None):
+        """
+        Packs a results dict from analyze_texts or IncrementalAnalysis.results().
+        ontology is the CompiledOntology (in whichever matching mode) that scored it.
+        Texts default to the ones in analysis; pass resume_key / jd_key to reuse stored texts.
+        """
+        store = get_extraction_cache()
+        keyword_ids, domain_ids = ontology.keyword_ids, ontology.domain_ids
+        if resume_key is None:
+            resume_key = store.put_text(analysis.get("resume_text", "") if resume_text is None else resume_text)
+        if jd_key is None:
+            jd_key = store.put_text(analysis.get("jd_text", "") if jd_text is None else jd_text)
+        return cls(
+            ontology=ontology,
+            soc_group=ontology.group_ids.get(analysis["predicted_soc_group"], -1),
+            overall_score=analysis["overall_score"],
+            domain_scores=tuple((domain_ids[d], score) for d, score in analysis["domain_scores"].items()),
+            domain_gaps=tuple((domain_ids[d], tuple(keyword_ids[kw] for kw in gaps))
+                              for d, gaps in analysis["domain_gaps"].items()),
+            top_soc_groups=tuple(
+                (ontology.group_ids[match["group"]], match["score"], match["coverage"],
+                 tuple(keyword_ids[kw] for kw in match["evidence"]))
+                for match in analysis.get("top_soc_groups", ())),
+            resume_key=resume_key,
+            jd_key=jd_key,
+        )
+
+    def with_resume_text(self, resume_text):
+        """A copy whose resume is resume_text, stored in the shared extraction cache now."""
+        return replace(self, resume_key=get_extraction_cache().put_text(resume_text))
+
+    def __getitem__(self, key):
+        ontology = self.ontology
+        if key == "overall_score":
+            return self.overall_score
+        if key == "predicted_soc_group":
+            return ontology.group_names[self.soc_group] if self.soc_group >= 0 else None
+        if key in ("critical_domains", "suggested_titles"):
+            group_data = ontology.soc_groups.get(self["predicted_soc_group"], {})
+            return group_data.get("signal_domains" if key == "critical_domains" else "example_titles", [])
+        if key == "domain_scores":
+            return {ontology.domain_names[d]: score for d, score in self.domain_scores}
+        if key == "domain_gaps":
+            return {ontology.domain_names[d]: [ontology.keywords[kw] for kw in gaps] for d, gaps in self.domain_gaps}
+        if key == "top_soc_groups":
+            return [
+                {"group": ontology.group_names[g], "score": score, "coverage": coverage,
+                 "evidence": [ontology.keywords[kw] for kw in evidence]}
+                for g, score, coverage, evidence in self.top_soc_groups
+            ]
+        if key == "resume_text":
+            return get_extraction_cache().get_text(self.resume_key)
+        if key == "jd_text":
+            return get_extraction_cache().get_text(self.jd_key)
+        raise KeyError(key)
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def __contains__(self, key):
+        return key in RESULT_KEYS
+
+    def keys(self):
+        return RESULT_KEYS
+
+    def to_dict(self):
+        return {key: self[key] for key in RESULT_KEYS}
@@ -0,0 +1,79 @@
+from psa_core import metrics
+from psa_core.jd_profiles import get_jd_profile
+from psa_core.ontology import compile_ontology
+
+
+def analyze_texts(resume_text, jd_text, ontology, backend="index", match_phrases=False, top_k=5,
+                  match_variants=False):
+    """
+    Scores a resume against a job description. Returns the results dict the
+    apps render, or None when either text is empty.
+
+    match_phrases treats multi-word entries ("machine learning") as single
+    keywords, and match_variants counts inflected and derived forms
+    ("adapting" for "adapt"); backend="sparse" scores with sparse matrix products instead of
+    the compiled keyword index (see psa_core.vector_engine). top_soc_groups
+    lists the top_k best-matching SOC groups with their evidence. The JD side
+    is looked up in the shared JD profile cache, so a JD already seen only
+    costs resume-side work.
+    """
+    if not resume_text or not jd_text:
+        return None
+
+    compiled = compile_ontology(ontology)
+    if match_phrases:
+        compiled = compiled.phrases()
+    if match_variants:
+        compiled = compiled.variants()
+    metrics.increment("resume_chars", len(resume_text))
+    metrics.increment("jd_chars", len(jd_text))
+    with metrics.span("tokenize"):
+        resume_words = compiled.extract_keywords(resume_text)
+    with metrics.span("jd_profile"):
+        profile = get_jd_profile(compiled, jd_text)
+
+    matched = profile.matched(resume_words)
+    with metrics.span("score.top_soc_groups"):
+        # One ranking gives both the listed groups and the predicted group (its first entry).
+        ranked = profile.rank_soc_groups(matched, k=max(top_k, 1))
+        top_soc_groups = profile.top_soc_groups(resume_words, k=top_k, matched=matched, ranked=ranked)
+    with metrics.span(f"score.{backend}"):
+        if backend == "sparse":
+            analysis = compiled.vectorized().analyze(resume_words, profile.words)
+        else:
+            analysis = profile.analyze(resume_words, matched, ranked=ranked)
+
+    return {
+        "predicted_soc_group": analysis["predicted_soc_group"],
+        "critical_domains": analysis["critical_domains"],
+        "domain_scores": analysis["domain_scores"],
+        "domain_gaps": analysis["domain_gaps"],
+        "overall_score": analysis["overall_score"],
+        "resume_text": resume_text,
+        "jd_text": jd_text,
+        "suggested_titles": analysis["suggested_titles"],
+        "top_soc_groups": top_soc_groups,
+    }
+
+
+# --- TRUST & VISIBILITY TUNER ---
+def calculate_trust_visibility_scores(results):
+    domain_scores = results.get("domain_scores", {})
+    critical_domains = set(results.get("critical_domains", []))
+    domain_gaps = results.get("domain_gaps", {})
+
+    trust_total, trust_count = 0, 0
+    visibility_hits, visibility_total = 0, 0
+
+    for domain, score in domain_scores.items():
+        if domain in critical_domains:
+            trust_total += score
+            trust_count += 1
+        if domain in domain_gaps:
+            visibility_total += len(domain_gaps[domain]) + 1
+            visibility_hits += 1 if score > 40 else 0
+
+    trust_score = trust_total / trust_count if trust_count else 0
+    visibility_score = (visibility_hits / visibility_total) * 100 if visibility_total else 0
+
+    return round(trust_score, 1), round(visibility_score, 1)
@@ -0,0 +1,475 @@
+"""
+Local asyncio HTTP scoring service with request micro-batching.
+
+    python -m psa_core.service serve [--port 8765]
+    python -m psa_core.service loadtest [--url http://127.0.0.1:8765] [--requests 2000] [--concurrency 32]
+
+Endpoints (JSON in, JSON out):
+  POST /analyze             {"resume": DOC, "jd": DOC, "match_phrases": false, "match_variants": false}
+  POST /analyze/batch       {"jd": DOC, "resumes": [DOC, ...], "match_phrases": false, "match_variants": false}
+  POST /gap-analysis        {"resume": DOC, "jd": DOC}
+  POST /gap-analysis/batch  {"jd": DOC, "resumes": [DOC, ...]}
+  GET  /health, GET /stats, GET /metrics (Prometheus text)
+
+A DOC is either a plain string of text or {"text": ...} or
+{"content_b64": ..., "filename": "resume.pdf"}.
+
+Extraction runs on a thread pool (PDFs additionally in the PDF process pool)
+so the event loop never blocks. Scoring requests that arrive within a short
+window are collected into one micro-batch and scored together on a single
+scoring thread, grouped by JD so the sparse backend can score each group with
+one matrix product.
+"""
+import argparse
+import asyncio
+import base64
+import binascii
+import json
+import os
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+from urllib.request import urlopen
+from xml.etree.ElementTree import ParseError
+
+from psa_core import metrics
+from psa_core.extraction import extract_text_from_bytes, file_kind
+from psa_core.extraction_cache import get_extraction_cache
+from psa_core.jd_profiles import get_jd_profile
+from psa_core.ontology import load_compiled_ontology, load_ontology
+from psa_core.pdf_pool import InvalidPdfError
+from psa_core.scoring import calculate_trust_visibility_scores
+
+MAX_BODY_BYTES = 50_000_000
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 413: "Payload Too Large",
+           500: "Internal Server Error", 503: "Service Unavailable"}
+
+
+class HTTPError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+class MicroBatcher:
+    """
+    Collects items submitted within window seconds (or until max_batch items)
+    and hands them to score_batch(items) -> results on the given executor.
+    """
+
+    def __init__(self, score_batch, executor, window=0.005, max_batch=256):
+        self.score_batch = score_batch
+        self.executor = executor
+        self.window = window
+        self.max_batch = max_batch
+        self._pending = []
+        self._timer = None
+        self.batches = self.items = 0
+
+    async def submit(self, item):
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((item, future))
+        if len(self._pending) >= self.max_batch:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window, self._flush)
+        return await future
+
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        pending, self._pending = self._pending, []
+        if not pending:
+            return
+        self.batches += 1
+        self.items += len(pending)
+        task = asyncio.get_running_loop().run_in_executor(
+            self.executor, self.score_batch, [item for item, _ in pending])
+
+        def deliver(task):
+            error = task.exception()
+            for i, (_, future) in enumerate(pending):
+                if future.done():
+                    continue
+                if error:
+                    future.set_exception(error)
+                else:
+                    future.set_result(task.result()[i])
+
+        task.add_done_callback(deliver)
+
+
+def _score_pairs(items, backend):
+    """items: [(compiled, resume_words, jd_profile)] -> analyses, grouping pairs that share a JD."""
+    results = [None] * len(items)
+    groups = {}
+    for i, (_, _, jd_profile) in enumerate(items):
+        # Profiles come from the shared JD profile cache, so equal JDs share one object.
+        groups.setdefault(id(jd_profile), []).append(i)
+    for indices in groups.values():
+        compiled, _, jd_profile = items[indices[0]]
+        if backend == "sparse":
+            analyses = compiled.vectorized().analyze_batch([items[i][1] for i in indices], jd_profile.words)
+        else:
+            analyses = [jd_profile.analyze(items[i][1]) for i in indices]
+        for i, analysis in zip(indices, analyses):
+            analysis["trust_score"], analysis["visibility_score"] = calculate_trust_visibility_scores(analysis)
+            results[i] = analysis
+    return results
+
+
+def _score_gap_pairs(items):
+    """items: [(psa_ontology, config, resume_text, jd_text)] -> [{"result", "score"}], batched per JD."""
+    from psa_score_engine import generate_gap_analysis, generate_gap_analysis_batch
+
+    results = [None] * len(items)
+    groups = {}
+    for i, (_, _, _, jd_text) in enumerate(items):
+        groups.setdefault(jd_text, []).append(i)
+    for jd_text, indices in groups.items():
+        psa_ontology, config = items[indices[0]][:2]
+        resume_texts = [items[i][2] for i in indices]
+        if config.get("scoring_backend") == "sparse":
+            outputs = generate_gap_analysis_batch(resume_texts, jd_text, psa_ontology, config)
+        else:
+            outputs = [generate_gap_analysis(text, jd_text, psa_ontology, config) for text in resume_texts]
+        for i, (result, score) in zip(indices, outputs):
+            results[i] = {"result": result, "score": score}
+    return results
+
+
+class ScoringService:
+    def __init__(self, ontology_path="ontology.json", psa_ontology_path=None, config_path="config.yaml",
+                 backend="index", window=0.005, max_batch=256, extract_workers=None):
+        self.compiled = load_compiled_ontology(ontology_path)
+        self.backend = backend
+        self.psa_ontology = self.gap_config = None
+        if psa_ontology_path and os.path.exists(psa_ontology_path):
+            from psa_score_engine import get_psa_ontology, load_config
+            self.psa_ontology = get_psa_ontology(psa_ontology_path)
+            self.gap_config = load_config(config_path) if os.path.exists(config_path) else {}
+
+        self.extract_pool = ThreadPoolExecutor(max_workers=extract_workers or min(8, (os.cpu_count() or 1) + 4),
+                                               thread_name_prefix="psa-extract")
+        # One scoring thread: batches are CPU-bound and would only contend for the GIL.
+        self.score_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="psa-score")
+        self.pair_batcher = MicroBatcher(lambda items: _score_pairs(items, backend), self.score_pool,
+                                         window, max_batch)
+        self.gap_batcher = MicroBatcher(_score_gap_pairs, self.score_pool, window, max_batch)
+        self.requests = 0
+        self.started = time.time()
+
+    # --- documents ---
+    @staticmethod
+    def _document_text(doc):
+        if isinstance(doc, str):
+            return doc
+        if not isinstance(doc, dict):
+            raise HTTPError(400, "Documents must be a string or an object.")
+        if "text" in doc:
+            if not isinstance(doc["text"], str):
+                raise HTTPError(400, "'text' must be a string.")
+            return doc["text"]
+        if "content_b64" in doc:
+            try:
+                data = base64.b64decode(doc["content_b64"], validate=True)
+            except (binascii.Error, ValueError, TypeError):
+                raise HTTPError(400, "'content_b64' is not valid base64.") from None
+            try:
+                return extract_text_from_bytes(data, file_kind(doc.get("filename")))
+            except (InvalidPdfError, zipfile.BadZipFile, ParseError, ValueError) as e:
+                raise HTTPError(400, f"Could not read the document: {e}") from None
+        raise HTTPError(400, "Documents need 'text' or 'content_b64'.")
+
+    async def _text(self, doc):
+        return await asyncio.get_running_loop().run_in_executor(self.extract_pool, self._document_text, doc)
+
+    def _compiled_for(self, body):
+        return self.compiled.mode(body.get("match_phrases"), body.get("match_variants"))
+
+    def _keywords(self, compiled, text):
+        return compiled.restrict(compiled.extract_keywords(text))
+
+    async def _profile(self, compiled, doc):
+        text = await self._text(doc)
+        if not text:
+            raise HTTPError(400, "No text could be extracted from a document.")
+        return await asyncio.get_running_loop().run_in_executor(self.extract_pool, self._keywords, compiled, text)
+
+    async def _jd_profile(self, compiled, doc):
+        text = await self._text(doc)
+        if not text:
+            raise HTTPError(400, "No text could be extracted from a document.")
+        return await asyncio.get_running_loop().run_in_executor(self.extract_pool, get_jd_profile, compiled, text)
+
+    # --- endpoints ---
+    async def analyze(self, body):
+        compiled = self._compiled_for(body)
+        resume_words, jd_profile = await asyncio.gather(
+            self._profile(compiled, body.get("resume")), self._jd_profile(compiled, body.get("jd")))
+        return await self.pair_batcher.submit((compiled, resume_words, jd_profile))
+
+    async def analyze_batch(self, body):
+        compiled = self._compiled_for(body)
+        jd_profile = await self._jd_profile(compiled, body.get("jd"))
+        resumes = await asyncio.gather(*(self._profile(compiled, doc) for doc in body.get("resumes", [])))
+        return await asyncio.gather(*(self.pair_batcher.submit((compiled, words, jd_profile)) for words in resumes))
+
+    def _require_gap_ontology(self):
+        if self.psa_ontology is None:
+            raise HTTPError(503, "Gap analysis is unavailable: start the service with --psa-ontology.")
+
+    async def gap_analysis(self, body):
+        self._require_gap_ontology()
+        resume_text, jd_text = await asyncio.gather(self._text(body.get("resume")), self._text(body.get("jd")))
+        return await self.gap_batcher.submit((self.psa_ontology, self.gap_config, resume_text, jd_text))
+
+    async def gap_analysis_batch(self, body):
+        self._require_gap_ontology()
+        jd_text = await self._text(body.get("jd"))
+        texts = await asyncio.gather(*(self._text(doc) for doc in body.get("resumes", [])))
+        return await asyncio.gather(*(
+            self.gap_batcher.submit((self.psa_ontology, self.gap_config, text, jd_text)) for text in texts))
+
+    def stats(self):
+        batcher = self.pair_batcher
+        return {
+            "uptime_seconds": round(time.time() - self.started, 1),
+            "requests": self.requests,
+            "batches": batcher.batches + self.gap_batcher.batches,
+            "mean_batch_size": round(batcher.items / batcher.batches, 2) if batcher.batches else 0,
+            "extraction_cache": get_extraction_cache().stats(),
+        }
+
+    async def dispatch(self, method, path, body):
+        routes = {
+            ("POST", "/analyze"): self.analyze,
+            ("POST", "/analyze/batch"): self.analyze_batch,
+            ("POST", "/gap-analysis"): self.gap_analysis,
+            ("POST", "/gap-analysis/batch"): self.gap_analysis_batch,
+        }
+        if method == "GET" and path == "/health":
+            return {"status": "ok"}
+        if method == "GET" and path == "/stats":
+            return self.stats()
+        if method == "GET" and path == "/metrics":
+            return metrics.export_prometheus()
+        handler = routes.get((method, path))
+        if handler is None:
+            raise HTTPError(404, f"No route for {method} {path}.")
+        try:
+            payload = json.loads(body or b"{}")
+        except ValueError as e:
+            raise HTTPError(400, f"Invalid JSON: {e}")
+        if not isinstance(payload, dict):
+            raise HTTPError(400, "Request body must be a JSON object.")
+        return await handler(payload)
+
+    # --- HTTP/1.1 plumbing ---
+    async def handle_connection(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, target, version = request_line.decode("latin-1").split()
+                headers = {}
+                while (line := await reader.readline()) not in (b"\r\n", b"\n", b""):
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                length = int(headers.get("content-length", 0))
+                if length > MAX_BODY_BYTES:
+                    await self._respond(writer, 413, {"error": "Request body too large."}, keep_alive=False)
+                    break
+                body = await reader.readexactly(length) if length else b""
+
+                self.requests += 1
+                try:
+                    status, payload = 200, await self.dispatch(method, urlsplit(target).path, body)
+                except HTTPError as e:
+                    status, payload = e.status, {"error": str(e)}
+                except Exception as e:
+                    status, payload = 500, {"error": f"{type(e).__name__}: {e}"}
+                keep_alive = version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+                await self._respond(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    async def _respond(writer, status, payload, keep_alive):
+        # Plain-text payloads (the Prometheus exposition) are sent as-is.
+        if isinstance(payload, str):
+            data, content_type = payload.encode("utf-8"), "text/plain; version=0.0.4"
+        else:
+            data, content_type = json.dumps(payload).encode("utf-8"), "application/json"
+        head = (f"HTTP/1.1 {status} {REASONS.get(status, '')}\r\n"
+                f"Content-Type: {content_type}\r\nContent-Length: {len(data)}\r\n"
+                f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+        writer.write(head.encode("latin-1") + data)
+        await writer.drain()
+
+
+async def serve(host, port, **service_options):
+    service = ScoringService(**service_options)
+    server = await asyncio.start_server(service.handle_connection, host, port)
+    print(f"PSA scoring service listening on http://{host}:{port}", file=sys.stderr, flush=True)
+    async with server:
+        await server.serve_forever()
+
+
+# --- Load generator ---
+async def _request(reader, writer, host, path, payload):
+    data = json.dumps(payload).encode("utf-8")
+    writer.write((f"POST {path} HTTP/1.1\r\nHost: {host}\r\nContent-Type: application/json\r\n"
+                  f"Content-Length: {len(data)}\r\n\r\n").encode("latin-1") + data)
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while (line := await reader.readline()) not in (b"\r\n", b"\n", b""):
+        name, _, value = line.decode("latin-1").partition(":")
+        if name.strip().lower() == "content-length":
+            length = int(value)
+    await reader.readexactly(length)
+    return status
+
+
+def synthetic_payloads(ontology_path, count, seed=0, resume_words=400, jd_words=150, distinct_jds=5):
+    """Builds /analyze payloads from ontology vocabulary mixed with filler words."""
+    rng = random.Random(seed)
+    ontology = load_ontology(ontology_path)
+    vocabulary = [kw for phrases in ontology.get("SignalDomains", {}).values() for phrase in phrases for kw in phrase.split()]
+    filler = ["team", "project", "managed", "delivered", "company", "role", "years", "experience", "responsible", "built"]
+
+    def document(n):
+        return " ".join(rng.choice(vocabulary) if rng.random() < 0.3 else rng.choice(filler) for _ in range(n))
+
+    jds = [document(jd_words) for _ in range(distinct_jds)]
+    return [{"resume": document(resume_words), "jd": rng.choice(jds)} for _ in range(count)]
+
+
+def percentile(sorted_values, q):
+    return sorted_values[min(len(sorted_values) - 1, int(round(q * (len(sorted_values) - 1))))]
+
+
+async def run_load(url, payloads, concurrency, path="/analyze"):
+    """Sends payloads over `concurrency` keep-alive connections; returns throughput and latency stats."""
+    parts = urlsplit(url)
+    host, port = parts.hostname, parts.port or 80
+    queue = iter(payloads)
+    latencies, errors = [], 0
+
+    async def client():
+        nonlocal errors
+        reader, writer = await asyncio.open_connection(host, port)
+        try:
+            for payload in queue:
+                start = time.perf_counter()
+                status = await _request(reader, writer, host, path, payload)
+                latencies.append(time.perf_counter() - start)
+                errors += status != 200
+        finally:
+            writer.close()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "concurrency": concurrency,
+        "seconds": round(elapsed, 3),
+        "requests_per_second": round(len(latencies) / elapsed, 1) if elapsed else 0,
+        "p50_ms": round(percentile(latencies, 0.50) * 1000, 2) if latencies else None,
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 2) if latencies else None,
+        "mean_ms": round(statistics.fmean(latencies) * 1000, 2) if latencies else None,
+    }
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _spawn_local_instance(ontology_path):
+    """Starts `serve` in a subprocess on a free port and waits until /health answers."""
+    port = _free_port()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "psa_core.service", "serve", "--port", str(port), "--ontology", ontology_path],
+        stderr=subprocess.DEVNULL)
+    url = f"http://127.0.0.1:{port}"
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"Local scoring service exited with code {process.returncode} before answering /health.")
+        try:
+            with urlopen(f"{url}/health", timeout=0.5) as response:
+                if response.status == 200:
+                    return process, url
+        except OSError:
+            pass
+        time.sleep(0.1)
+    process.kill()
+    raise RuntimeError("Local scoring service did not start within 30s.")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m psa_core.service", description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    serve_parser = sub.add_parser("serve", help="Run the scoring service")
+    serve_parser.add_argument("--host", default="127.0.0.1")
+    serve_parser.add_argument("--port", type=int, default=8765)
+    serve_parser.add_argument("--ontology", default="ontology.json")
+    serve_parser.add_argument("--psa-ontology", default="psa_ontology_comprehensive_with_alias.json",
+                              help="Domain/terms/aliases ontology for the gap-analysis endpoints")
+    serve_parser.add_argument("--config", default="config.yaml")
+    serve_parser.add_argument("--backend", choices=["index", "sparse"], default="index")
+    serve_parser.add_argument("--window-ms", type=float, default=5.0, help="Micro-batch collection window")
+    serve_parser.add_argument("--max-batch", type=int, default=256)
+
+    load_parser = sub.add_parser("loadtest", help="Measure throughput and latency of a running service")
+    load_parser.add_argument("--url", help="Service URL (default: spawn a local instance)")
+    load_parser.add_argument("--requests", type=int, default=2000)
+    load_parser.add_argument("--concurrency", type=int, default=32)
+    load_parser.add_argument("--ontology", default="ontology.json")
+    load_parser.add_argument("--seed", type=int, default=0)
+
+    args = parser.parse_args(argv)
+    if args.command == "serve":
+        try:
+            asyncio.run(serve(args.host, args.port, ontology_path=args.ontology,
+                              psa_ontology_path=args.psa_ontology, config_path=args.config,
+                              backend=args.backend, window=args.window_ms / 1000, max_batch=args.max_batch))
+        except KeyboardInterrupt:
+            pass
+        return 0
+
+    payloads = synthetic_payloads(args.ontology, args.requests, seed=args.seed)
+    process, url = (None, args.url) if args.url else _spawn_local_instance(args.ontology)
+    try:
+        report = asyncio.run(run_load(url, payloads, args.concurrency))
+    finally:
+        if process:
+            process.terminate()
+            process.wait()
+    print(json.dumps(report, indent=2))
+    return 1 if report["errors"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
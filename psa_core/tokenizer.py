@@ -0,0 +1,83 @@
+import re
+import string
+from collections import Counter
+
+CAMEL_CASE_RE = re.compile(r'([a-z])([A-Z])')
+# An e-mail match can only start where a token starts, so it is anchored there (same matches as
+# r'\S+@\S+', but linear rather than quadratic on long runs without whitespace).
+URL_EMAIL_RE = re.compile(r'https?://\S+|(?<!\S)\S+@\S+')
+PUNCT_DIGIT_RE = re.compile(f'[{re.escape(string.punctuation)}0-9]')
+# Deleting via str.translate is equivalent to PUNCT_DIGIT_RE.sub('', ...) and much cheaper.
+PUNCT_DIGIT_TABLE = str.maketrans('', '', string.punctuation + string.digits)
+# Matched against a reversed chunk: its trailing, possibly incomplete word, to carry into the next block.
+# (A forward search for r'\S*\Z' retries at every position and is quadratic on runs without whitespace.)
+TRAILING_WORD_RE = re.compile(r'\S*')
+
+BLOCK_SIZE = 1 << 16
+MIN_WORD_LENGTH = 3
+
+
+def normalize_text(text):
+    """Splits camelCase, lower-cases, and strips URLs, e-mails, punctuation and digits."""
+    text = CAMEL_CASE_RE.sub(r'\1 \2', text).lower()
+    text = URL_EMAIL_RE.sub('', text)
+    return text.translate(PUNCT_DIGIT_TABLE)
+
+
+def _blocks(chunks, block_size):
+    """
+    Re-cuts text chunks (a string or an iterable of strings read as if
+    concatenated, e.g. PDF pages) into blocks that end on whitespace, so a
+    word split across chunks is normalized as one word.
+    """
+    if isinstance(chunks, str):
+        text = chunks
+        chunks = (text[i:i + block_size] for i in range(0, len(text), block_size))
+    # Pieces of a word that may continue into the next chunk, joined once it ends.
+    carry = []
+    for chunk in chunks:
+        if not chunk:
+            continue
+        cut = len(chunk) - TRAILING_WORD_RE.match(chunk[::-1]).end()
+        if not cut:
+            carry.append(chunk)
+            continue
+        yield "".join(carry) + chunk[:cut] if carry else chunk[:cut]
+        carry = [chunk[cut:]] if cut < len(chunk) else []
+    if carry:
+        yield "".join(carry)
+
+
+def iter_tokens(chunks, block_size=BLOCK_SIZE):
+    """
+    Yields normalized words (the ones clean_and_extract_words keeps) in
+    document order. Input is consumed block by block, so only one block of
+    text is ever held in normalized form.
+    """
+    for block in _blocks(chunks, block_size):
+        for word in normalize_text(block).split():
+            if len(word) >= MIN_WORD_LENGTH:
+                yield word
+
+
+def tokenize(chunks, counts=False, positions=False, block_size=BLOCK_SIZE):
+    """
+    Tokenizes text or an iterable of text chunks in one streaming pass.
+
+    Returns the set of words by default, a Counter of word frequencies with
+    counts=True, or a dict of word -> token positions (ordinal index in the
+    token stream) with positions=True.
+    """
+    tokens = iter_tokens(chunks, block_size)
+    if positions:
+        word_positions = {}
+        for i, word in enumerate(tokens):
+            word_positions.setdefault(word, []).append(i)
+        return word_positions
+    if counts:
+        return Counter(tokens)
+    return set(tokens)
+
+
+def clean_and_extract_words(text):
+    return tokenize(text)
@@ -0,0 +1,207 @@
+import numpy as np
+from scipy import sparse
+
+from psa_core.matcher import OntologyTermMatcher
+from psa_core.ontology import compile_ontology
+
+
+def _incidence(rows, n_rows, n_cols):
+    """Builds a binary CSR matrix from a list of column-index lists, one per row."""
+    indptr = np.zeros(n_rows + 1, dtype=np.int64)
+    indptr[1:] = np.cumsum([len(cols) for cols in rows])
+    indices = np.fromiter((c for cols in rows for c in cols), dtype=np.int64, count=int(indptr[-1]))
+    data = np.ones(len(indices), dtype=np.float64)
+    return sparse.csr_matrix((data, indices, indptr), shape=(n_rows, n_cols))
+
+
+class VectorScorer:
+    """
+    Sparse-matrix backend for run_ontological_analysis.
+
+    Documents are encoded as binary rows over the ontology vocabulary and all
+    domain scores, gaps and SOC-group alignments for a batch come out of a few
+    sparse products. Results match CompiledOntology.analyze exactly.
+    """
+
+    def __init__(self, ontology):
+        self.compiled = compile_ontology(ontology)
+        self.vocabulary = sorted(self.compiled.keyword_domains)
+        self.index = {kw: i for i, kw in enumerate(self.vocabulary)}
+        n_vocab = len(self.vocabulary)
+
+        # keyword x domain and keyword x group incidence matrices
+        self.domain_matrix = _incidence(
+            [self.compiled.keyword_domains[kw] for kw in self.vocabulary],
+            n_vocab, len(self.compiled.domain_names))
+        self.group_matrix = _incidence(
+            [self.compiled.keyword_groups.get(kw, ()) for kw in self.vocabulary],
+            n_vocab, len(self.compiled.group_names))
+
+    def encode(self, word_sets):
+        """Encodes an iterable of token sets as a binary CSR matrix (documents x vocabulary)."""
+        index = self.index
+        rows = [sorted({index[w] for w in words if w in index}) for words in word_sets]
+        return _incidence(rows, len(rows), len(self.vocabulary))
+
+    def score_matrix(self, resume_matrix, jd_matrix):
+        """
+        Scores every resume row against the JD row (or the matching JD row when
+        both matrices have the same number of rows). Returns a dict of arrays;
+        a single JD row stays a single row and is broadcast, never copied.
+        """
+        jd_matrix = sparse.csr_matrix(jd_matrix)
+        if jd_matrix.shape[0] not in (1, resume_matrix.shape[0]):
+            raise ValueError(f"Expected 1 or {resume_matrix.shape[0]} JD rows, got {jd_matrix.shape[0]}.")
+        matched = sparse.csr_matrix(resume_matrix.multiply(jd_matrix))
+
+        group_scores = (matched @ self.group_matrix).toarray()
+        jd_domain_counts = (jd_matrix @ self.domain_matrix).toarray()
+        matched_domain_counts = (matched @ self.domain_matrix).toarray()
+        with np.errstate(divide="ignore", invalid="ignore"):
+            domain_scores = np.where(
+                jd_domain_counts > 0, matched_domain_counts / jd_domain_counts * 100, 0.0)
+
+        jd_totals = np.asarray(jd_matrix.sum(axis=1)).ravel()
+        matched_totals = np.asarray(matched.sum(axis=1)).ravel()
+        with np.errstate(divide="ignore", invalid="ignore"):
+            overall_scores = np.where(jd_totals > 0, matched_totals / jd_totals * 100, 0.0)
+
+        # np.argmax keeps the first maximum, matching the "first group wins" tie-break.
+        predicted_groups = group_scores.argmax(axis=1) if group_scores.shape[1] else None
+        return {
+            "jd_matrix": jd_matrix,
+            "matched_matrix": matched,
+            "group_scores": group_scores,
+            "predicted_groups": predicted_groups,
+            "jd_domain_counts": jd_domain_counts,
+            "domain_scores": domain_scores,
+            "overall_scores": overall_scores,
+        }
+
+    def to_results(self, scored):
+        """Materializes score_matrix output into the per-pair results dicts."""
+        compiled = self.compiled
+        jd_matrix, matched = scored["jd_matrix"], scored["matched_matrix"]
+        n_rows = matched.shape[0]
+        if scored["predicted_groups"] is None:
+            predicted_groups = [None] * n_rows
+        else:
+            predicted_groups = [compiled.group_names[idx] for idx in scored["predicted_groups"].tolist()]
+        domain_scores = scored["domain_scores"].tolist()
+        overall_scores = scored["overall_scores"].tolist()
+        jd_indptr, jd_indices = jd_matrix.indptr.tolist(), jd_matrix.indices.tolist()
+        matched_indptr, matched_indices = matched.indptr.tolist(), matched.indices.tolist()
+
+        def jd_side(jd_row):
+            domains = [(idx, compiled.domain_names[idx])
+                       for idx in np.flatnonzero(scored["jd_domain_counts"][jd_row]).tolist()]
+            return domains, jd_indices[jd_indptr[jd_row]:jd_indptr[jd_row + 1]]
+
+        # A single JD row is shared by every resume, so its side is worked out once.
+        shared_jd = jd_side(0) if jd_matrix.shape[0] == 1 else None
+        results = []
+        for row in range(n_rows):
+            jd_domains, jd_cols = shared_jd or jd_side(row)
+            group_data = compiled.soc_groups.get(predicted_groups[row], {})
+
+            matched_cols = set(matched_indices[matched_indptr[row]:matched_indptr[row + 1]])
+            gaps = {}
+            # Columns follow the sorted vocabulary, so each gap list comes out sorted.
+            for col in jd_cols:
+                if col not in matched_cols:
+                    kw = self.vocabulary[col]
+                    for idx in compiled.keyword_domains[kw]:
+                        gaps.setdefault(idx, []).append(kw)
+
+            results.append({
+                "predicted_soc_group": predicted_groups[row],
+                "critical_domains": group_data.get("signal_domains", []),
+                "domain_scores": {name: domain_scores[row][idx] for idx, name in jd_domains},
+                "domain_gaps": {compiled.domain_names[idx]: gaps[idx] for idx in sorted(gaps)},
+                "overall_score": overall_scores[row] if jd_cols else 0,
+                "suggested_titles": group_data.get("example_titles", []),
+            })
+        return results
+
+    def analyze_batch(self, resume_word_sets, jd_words):
+        """Scores many tokenized resumes against one tokenized JD in one batched pass."""
+        resume_matrix = self.encode(resume_word_sets)
+        jd_matrix = self.encode([jd_words])
+        return self.to_results(self.score_matrix(resume_matrix, jd_matrix))
+
+    def analyze(self, resume_words, jd_words):
+        """Drop-in equivalent of CompiledOntology.analyze."""
+        return self.analyze_batch([resume_words], jd_words)[0]
+
+
+class GapVectorScorer:
+    """
+    Sparse-matrix backend for psa_score_engine.generate_gap_analysis.
+
+    Each unique lower-cased term/alias slot is one vocabulary column, found
+    with a single OntologyTermMatcher scan per document (mapped aliases hit
+    their term's column); a slot matrix maps columns to their occurrences in
+    each domain's term list so per-domain hit counts for a whole batch are a
+    single product.
+    """
+
+    def __init__(self, ontology, term_matcher=None):
+        self.ontology = ontology
+        self.term_matcher = term_matcher or OntologyTermMatcher(ontology)
+        self.domain_terms = self.term_matcher.domain_terms
+        self.vocabulary = sorted(self.term_matcher.slots)
+        self.index = {term: i for i, term in enumerate(self.vocabulary)}
+
+        # term x domain occurrence counts (a term listed twice in a domain counts twice)
+        rows, cols = [], []
+        for term, slots in self.term_matcher.slots.items():
+            for d, _ in slots:
+                rows.append(self.index[term])
+                cols.append(d)
+        self.slot_matrix = sparse.csr_matrix(
+            (np.ones(len(rows)), (rows, cols)), shape=(len(self.vocabulary), len(ontology)))
+
+    def encode(self, texts):
+        """Encodes texts as a binary CSR matrix of which ontology terms they contain."""
+        rows = [sorted(self.index[term] for term in self.term_matcher.matched_terms(text)) for text in texts]
+        return _incidence(rows, len(rows), len(self.vocabulary))
+
+    def generate_gap_analysis_batch(self, resume_texts, jd_text, config):
+        """Returns a list of (result, score) tuples, one per resume text."""
+        weights = config.get("weights", {"mli": 0.4, "signal_strength": 0.6})
+        resume_matrix = self.encode(resume_texts)
+        jd_matrix = self.encode([jd_text])
+        jd_counts = (jd_matrix @ self.slot_matrix).toarray()[0]
+        resume_counts = (resume_matrix @ self.slot_matrix).toarray()
+        with np.errstate(divide="ignore", invalid="ignore"):
+            ratios = np.where(jd_counts > 0, resume_counts / jd_counts, 0.0)
+        matched_domains = (ratios > 0).sum(axis=1)
+
+        jd_terms = self.term_matcher.domain_hits(
+            jd_text, matched={self.vocabulary[i] for i in jd_matrix.indices})
+        outputs = []
+        for row, resume_text in enumerate(resume_texts):
+            resume_cols = resume_matrix.indices[resume_matrix.indptr[row]:resume_matrix.indptr[row + 1]]
+            resume_hits = self.term_matcher.domain_hits(
+                resume_text, matched={self.vocabulary[i] for i in resume_cols})
+            result = []
+            for d, domain in enumerate(self.ontology):
+                resume_terms = resume_hits[d]
+                missing_terms = list(set(jd_terms[d]) - set(resume_terms))
+                result.append({
+                    "Domain": domain["name"],
+                    "JD Terms": ", ".join(jd_terms[d]),
+                    "Resume Terms": ", ".join(resume_terms),
+                    "Missing": ", ".join(missing_terms),
+                    "Match %": round(float(ratios[row, d]), 2) if jd_counts[d] else 0
+                })
+
+            signal_strength = matched_domains[row] / len(self.ontology)
+            mli = 1.0 if len(resume_text.split()) >= 300 else 0.5
+            score = round(
+                weights["signal_strength"] * float(signal_strength) +
+                weights["mli"] * mli,
+                2
+            )
+            outputs.append((result, score))
+        return outputs
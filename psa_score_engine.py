@@ -1,31 +1,72 @@
-import json
 import yaml
 from collections import defaultdict
+from psa_core import metrics
+from psa_core.matcher import OntologyTermMatcher
+from psa_core.ontology_store import FileMemo, load_json_document
 
+# Both loaders return shared, read-only objects that are only re-read when the file changes.
+@metrics.timed("gap.load_ontology")
 def get_psa_ontology(path="psa_ontology_comprehensive_with_alias.json"):
-    with open(path, encoding="utf-8-sig") as f:
-        data = json.load(f)
+    data = load_json_document(path)
     return data["SignalDomains"]
 
-def load_config(path="config.yaml"):
+def _read_config(path, sha256):
     with open(path, "r") as f:
         return yaml.safe_load(f)
 
-def match_terms(domain, text):
-    all_terms = domain.get("terms", []) + domain.get("aliases", [])
-    return [term for term in all_terms if term.lower() in text.lower()]
+_configs = FileMemo(_read_config)
+
+@metrics.timed("gap.load_config")
+def load_config(path="config.yaml"):
+    return _configs.get(path)
+
+_ontology_cache = {}
+
+def _cached_for_ontology(kind, ontology, build):
+    # One entry per kind for the most recent ontology; the entry holds the ontology so its id stays valid.
+    cached = _ontology_cache.get(kind)
+    if cached is None or cached[0] is not ontology:
+        cached = _ontology_cache[kind] = (ontology, build(ontology))
+    return cached[1]
 
+def get_term_matcher(ontology, match_variants=False):
+    # With match_variants, terms and aliases are also matched in their inflected forms ("audits", "audited").
+    return _cached_for_ontology(("matcher", match_variants), ontology,
+                                lambda o: OntologyTermMatcher(o, match_variants=match_variants))
+
+def get_gap_vector_scorer(ontology, match_variants=False):
+    from psa_core.vector_engine import GapVectorScorer
+    return _cached_for_ontology(("vector", match_variants), ontology,
+                                lambda o: GapVectorScorer(o, get_term_matcher(o, match_variants)))
+
+@metrics.timed("gap.sparse_batch")
+def generate_gap_analysis_batch(resume_texts, jd_text, ontology, config):
+    """
+    Scores many resumes against one JD with the sparse-matrix backend.
+    Returns a list of (result, score) tuples in the same shape as generate_gap_analysis.
+    """
+    scorer = get_gap_vector_scorer(ontology, config.get("match_variants", False))
+    return scorer.generate_gap_analysis_batch(resume_texts, jd_text, config)
+
+@metrics.timed("gap.analysis")
 def generate_gap_analysis(resume_text, jd_text, ontology, config):
+    if config.get("scoring_backend") == "sparse":
+        return generate_gap_analysis_batch([resume_text], jd_text, ontology, config)[0]
+
     result = []
     weights = config.get("weights", {"mli": 0.4, "signal_strength": 0.6})
 
     matched_domains = 0
     total_domains = len(ontology)
 
-    for domain in ontology:
+    # One automaton scan per document covers every domain's terms and aliases.
+    term_matcher = get_term_matcher(ontology, config.get("match_variants", False))
+    with metrics.span("gap.match_terms"):
+        jd_hits = term_matcher.domain_hits(jd_text)
+        resume_hits = term_matcher.domain_hits(resume_text)
+
+    for domain, jd_terms, resume_terms in zip(ontology, jd_hits, resume_hits):
         name = domain["name"]
-        jd_terms = match_terms(domain, jd_text)
-        resume_terms = match_terms(domain, resume_text)
 
         missing_terms = list(set(jd_terms) - set(resume_terms))
         match_pct = round(len(resume_terms) / len(jd_terms), 2) if jd_terms else 0
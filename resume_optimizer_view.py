@@ -3,7 +3,7 @@ import pandas as pd
 from psa_auth import get_user_mode
 from streamlit_io import get_clean_text
 from psa_score_engine import generate_gap_analysis, get_psa_ontology, load_config
-from utils import clean_text
+from psa_core.extraction import clean_text
 from io import BytesIO
 import base64
 
@@ -1,17 +1,11 @@
-from PyPDF2 import PdfReader
-import docx
-import io
+from psa_core.extraction import extract_text_from_bytes
+from psa_core.extraction_cache import read_file_bytes
 
 def extract_text_from_pdf(file):
-    text = ""
-    reader = PdfReader(file)
-    for page in reader.pages:
-        text += page.extract_text() or ""
-    return text.strip()
+    return extract_text_from_bytes(read_file_bytes(file), "pdf").strip()
 
 def extract_text_from_docx(file):
-    doc = docx.Document(file)
-    return "\n".join([para.text for para in doc.paragraphs if para.text.strip()])
+    return extract_text_from_bytes(read_file_bytes(file), "docx")
 
 def get_clean_text(file):
     filename = file.name.lower()
@@ -0,0 +1,70 @@
+from collections import defaultdict
+
+from psa_core.matcher import OntologyTermMatcher, phrase_tokens
+from psa_core.normalization import NormalizationTable, inflections
+from psa_core.ontology import load_ontology
+from psa_core.tokenizer import normalize_text
+
+# Words that share a stem with an ontology keyword without being a form of it.
+FALSE_FRIENDS = ["police", "policed", "policing", "general", "generation", "station", "valuation"]
+
+
+def _vocabularies():
+    phrases = [phrase for phrases in load_ontology()["SignalDomains"].values() for phrase in phrases]
+    return {
+        "words": sorted({word for phrase in phrases for word in phrase.lower().split()}),
+        "phrase tokens": sorted({tok for phrase in phrases for tok in phrase_tokens(normalize_text(phrase))}),
+    }
+
+
+def test_ontology_vocabulary_has_no_unintended_merges():
+    for name, vocabulary in _vocabularies().items():
+        table = NormalizationTable(vocabulary)
+        classes = defaultdict(set)
+        for word in vocabulary:
+            classes[table.canonical(word)].add(word)
+        for keyword, members in classes.items():
+            # Two vocabulary words may only merge when one is an inflection of the other.
+            for word in members - {keyword}:
+                assert word in inflections(keyword), (name, keyword, sorted(members))
+
+
+def test_inflections_resolve_to_their_keyword():
+    for vocabulary in _vocabularies().values():
+        table = NormalizationTable(vocabulary)
+        for word in vocabulary:
+            keyword = table.canonical(word)
+            # A form that is itself a vocabulary word keeps its own class.
+            for form in inflections(word) - set(vocabulary):
+                assert table.canonical(form) == keyword, (word, form, table.canonical(form))
+
+
+def test_false_friends_do_not_match():
+    for vocabulary in _vocabularies().values():
+        table = NormalizationTable(vocabulary)
+        for word in FALSE_FRIENDS:
+            assert table.canonical(word) is None, (word, table.canonical(word))
+
+
+def test_variants_still_match():
+    table = NormalizationTable(_vocabularies()["words"])
+    expected = {
+        "adapting": "adapt", "collaborated": "collaboration", "analytical": "analytics",
+        "policies": "policy", "measured": "measurement", "engaging": "engagement", "changing": "change",
+    }
+    assert {word: table.canonical(word) for word in expected} == expected
+
+
+def test_aliases_hit_their_term():
+    ontology = [
+        {"name": "Risk", "terms": ["audit", "risk management"],
+         "aliases": {"controls review": "audit", "ml": "machine learning"}},
+        {"name": "Data", "terms": ["SQL", "audit"], "aliases": ["database"]},
+    ]
+    for match_variants in (False, True):
+        matcher = OntologyTermMatcher(ontology, match_variants=match_variants)
+        assert matcher.domain_hits("Led the controls review") == [["audit"], ["audit"]]
+        # An alias whose term the domain does not list, or a plain alias list, keeps its own slot.
+        assert matcher.domain_hits("ML on a database") == [["ml"], ["database"]]
+    matcher = OntologyTermMatcher(ontology, match_variants=True)
+    assert matcher.domain_hits("Ran controls reviews") == [["audit"], ["audit"]]
@@ -0,0 +1,37 @@
+import io
+import zipfile
+
+from psa_core import extraction
+from psa_core.ontology import load_ontology
+from psa_core.ranking import rank_resumes
+
+
+def make_archive(files):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        for name, text in files.items():
+            archive.writestr(name, text)
+    buffer.seek(0)
+    return buffer
+
+
+def test_oversized_members_are_reported_as_skipped(monkeypatch):
+    monkeypatch.setattr(extraction, "MAX_ARCHIVE_MEMBER_BYTES", 100)
+    archive = make_archive({
+        "small.txt": "leadership strategy data analysis",
+        "large.txt": "leadership " * 20,
+        "empty.txt": "",
+        "notes.csv": "ignored",
+    })
+    ranked, skipped = rank_resumes("leadership strategy data", archive, load_ontology(), k=5)
+    assert [name for name, _ in ranked] == ["small.txt"]
+    skipped = dict(skipped)
+    assert sorted(skipped) == ["empty.txt", "large.txt"]
+    assert skipped["empty.txt"] == "no text extracted"
+    assert skipped["large.txt"].endswith("limit for archive members")
+
+    archive.seek(0)
+    reported = []
+    documents = extraction.iter_archive_documents(archive, on_skip=lambda name, reason: reported.append(name))
+    assert [name for name, _, _ in documents] == ["small.txt", "empty.txt"]
+    assert reported == ["large.txt"]
@@ -0,0 +1,45 @@
+import random
+
+from psa_core.ontology import CompiledOntology, load_ontology
+
+
+def brute_force_ranking(compiled, resume_words, jd_words, k):
+    matched = resume_words & jd_words
+    scores = [len(matched & keywords) for keywords in compiled.group_keyword_sets]
+    ranked = sorted((idx for idx, score in enumerate(scores) if score), key=lambda idx: (-scores[idx], idx))
+    return [(idx, scores[idx]) for idx in ranked[:k]]
+
+
+def random_ontology(rng, n_keywords, n_domains, n_groups):
+    vocabulary = [f"kw{i}" for i in range(n_keywords)]
+    domains = {f"domain{d}": rng.sample(vocabulary, rng.randint(1, min(40, n_keywords))) for d in range(n_domains)}
+    groups = {
+        f"group{g}": {"signal_domains": rng.sample(sorted(domains), rng.randint(0, min(4, n_domains)))}
+        for g in range(n_groups)
+    }
+    return {"SignalDomains": domains, "SOC_Groups": groups}, vocabulary
+
+
+def test_rank_soc_groups_matches_brute_force_on_random_ontologies():
+    rng = random.Random(15)
+    for _ in range(60):
+        ontology, vocabulary = random_ontology(rng, rng.randint(5, 300), rng.randint(1, 30), rng.randint(1, 120))
+        compiled = CompiledOntology(ontology)
+        for _ in range(10):
+            resume_words = set(rng.sample(vocabulary, rng.randint(0, len(vocabulary))))
+            jd_words = set(rng.sample(vocabulary, rng.randint(0, len(vocabulary))))
+            for k in (0, 1, 2, 5, 50, 500):
+                assert compiled.rank_soc_groups(resume_words, jd_words, k) == \
+                    brute_force_ranking(compiled, resume_words, jd_words, k)
+
+
+def test_rank_soc_groups_matches_brute_force_on_shipped_ontology():
+    rng = random.Random(16)
+    compiled = CompiledOntology(load_ontology())
+    vocabulary = compiled.keywords + ["team", "delivered"]
+    for _ in range(300):
+        resume_words = set(rng.sample(vocabulary, rng.randint(0, len(vocabulary))))
+        jd_words = set(rng.sample(vocabulary, rng.randint(0, len(vocabulary))))
+        for k in (1, 3, 5, 25):
+            assert compiled.rank_soc_groups(resume_words, jd_words, k) == \
+                brute_force_ranking(compiled, resume_words, jd_words, k)
@@ -0,0 +1,91 @@
+import random
+
+from psa_core.jd_profiles import JDProfile
+from psa_core.ontology import CompiledOntology, load_ontology
+from psa_core.scoring import analyze_texts
+from psa_score_engine import generate_gap_analysis, generate_gap_analysis_batch
+
+
+def random_ontology(rng, n_keywords, n_domains, n_groups):
+    vocabulary = [f"kw{i}" for i in range(n_keywords)]
+    domains = {
+        f"domain{d}": [" ".join(rng.sample(vocabulary, min(n_keywords, rng.choice((1, 1, 2)))))
+                       for _ in range(rng.randint(1, 30))]
+        for d in range(n_domains)
+    }
+    groups = {
+        f"group{g}": {
+            "signal_domains": rng.sample(sorted(domains), rng.randint(0, min(4, n_domains))),
+            "example_titles": [f"title{g}"],
+        }
+        for g in range(n_groups)
+    }
+    return {"SignalDomains": domains, "SOC_Groups": groups}, vocabulary
+
+
+def random_psa_ontology(rng, n_terms, n_domains):
+    vocabulary = [f"term {i}" if i % 3 else f"skill{i}" for i in range(n_terms)]
+    ontology = []
+    for d in range(n_domains):
+        terms = rng.sample(vocabulary, rng.randint(1, min(10, n_terms)))
+        aliases = rng.sample(vocabulary, rng.randint(0, min(3, n_terms)))
+        if rng.random() < 0.5:
+            # Aliases mapped to a term, some of which the domain does not list.
+            aliases = {alias: rng.choice(terms + vocabulary[:1]) for alias in aliases}
+        ontology.append({"name": f"Domain {d}", "terms": terms, "aliases": aliases})
+    return ontology, vocabulary
+
+
+def random_words(rng, vocabulary):
+    return set(rng.sample(vocabulary, rng.randint(0, len(vocabulary)))) | {"unrelated"}
+
+
+def test_sparse_matches_index_on_random_ontologies():
+    rng = random.Random(2)
+    for _ in range(40):
+        ontology, vocabulary = random_ontology(rng, rng.randint(1, 80), rng.randint(1, 12), rng.randint(0, 30))
+        compiled = CompiledOntology(ontology)
+        scorer = compiled.vectorized()
+        resumes = [random_words(rng, vocabulary) for _ in range(rng.randint(0, 20))] + [set()]
+        for jd_words in (random_words(rng, vocabulary), set()):
+            profile = JDProfile(compiled, jd_words)
+            expected = [compiled.analyze(words, jd_words) for words in resumes]
+            assert scorer.analyze_batch(resumes, jd_words) == expected
+            assert [profile.analyze(words) for words in resumes] == expected
+
+        # One JD row per resume row scores each pair on its own.
+        jds = [random_words(rng, vocabulary) for _ in resumes]
+        scored = scorer.score_matrix(scorer.encode(resumes), scorer.encode(jds))
+        assert scorer.to_results(scored) == [compiled.analyze(r, j) for r, j in zip(resumes, jds)]
+
+
+def test_analyze_texts_backends_agree_on_shipped_ontology():
+    rng = random.Random(3)
+    ontology = load_ontology()
+    phrases = [phrase for values in ontology["SignalDomains"].values() for phrase in values]
+    filler = ["team", "delivered", "projects", "adapting", "collaborated", "Policies"]
+    for _ in range(30):
+        resume_text, jd_text = (" ".join(rng.sample(phrases + filler, rng.randint(1, 40))) for _ in range(2))
+        for match_phrases in (False, True):
+            for match_variants in (False, True):
+                options = {"match_phrases": match_phrases, "match_variants": match_variants}
+                assert analyze_texts(resume_text, jd_text, ontology, backend="sparse", **options) == \
+                    analyze_texts(resume_text, jd_text, ontology, backend="index", **options)
+
+
+def test_gap_batch_matches_per_pair_analysis():
+    rng = random.Random(5)
+    for _ in range(10):
+        ontology, terms = random_psa_ontology(rng, rng.randint(1, 40), rng.randint(1, 8))
+        texts = [" ".join(rng.sample(terms, rng.randint(0, len(terms))) + ["team"] * rng.randint(0, 300))
+                 for _ in range(8)]
+        config = {"match_variants": rng.random() < 0.5}
+        for jd_text in texts[:3]:
+            expected = [generate_gap_analysis(text, jd_text, ontology, config) for text in texts]
+            for (result, score), (expected_result, expected_score) in zip(
+                    generate_gap_analysis_batch(texts, jd_text, ontology, config), expected):
+                assert score == expected_score
+                # Missing terms come from a set difference, so only their membership is defined.
+                for row, expected_row in zip(result, expected_result):
+                    assert sorted(row.pop("Missing").split(", ")) == sorted(expected_row.pop("Missing").split(", "))
+                    assert row == expected_row
@@ -0,0 +1,62 @@
+import random
+import re
+import string
+
+from psa_core.tokenizer import clean_and_extract_words, iter_tokens, tokenize
+
+
+def baseline_words(text):
+    """The original app.py implementation, as a list in document order."""
+    text = re.sub(r'([a-z])([A-Z])', r'\1 \2', text).lower()
+    text = re.sub(r'https?://\S+|\S+@\S+', '', text)
+    text = re.sub(f'[{re.escape(string.punctuation)}0-9]', '', text)
+    return [word for word in text.split() if len(word) > 2]
+
+
+PIECES = [
+    "data", "Leadership", "camelCaseWord", "machine-learning", "x", "ab", "R&D", "2024", "café",
+    "https://example.com/a?b=1", "http://x", "jane.doe@example.com", "@handle", "a@", "@@x@y", "foohttp://bar",
+    " ", "  ", "\n", "\t", " ", " ", ".", ",", "'", "(", ")",
+]
+
+
+def random_text(rng):
+    parts = [rng.choice(PIECES) + rng.choice(["", " ", "\n"]) for _ in range(rng.randint(0, 80))]
+    if rng.random() < 0.3:
+        parts.insert(rng.randrange(len(parts) + 1), rng.choice("aZ@.") * rng.randint(100, 3000))
+    return "".join(parts)
+
+
+def random_chunks(rng, text):
+    cuts = sorted(rng.sample(range(len(text) + 1), min(len(text) + 1, rng.randint(0, 8))))
+    bounds = [0] + cuts + [len(text)]
+    return [text[a:b] for a, b in zip(bounds, bounds[1:])]
+
+
+def test_tokenize_matches_baseline():
+    rng = random.Random(7)
+    for _ in range(500):
+        text = random_text(rng)
+        expected = baseline_words(text)
+        assert clean_and_extract_words(text) == set(expected)
+        for block_size in (1, 7, 64, 1 << 16):
+            assert list(iter_tokens(text, block_size=block_size)) == expected
+            assert list(iter_tokens(random_chunks(rng, text), block_size=block_size)) == expected
+
+
+def test_counts_and_positions_match_baseline():
+    rng = random.Random(11)
+    for _ in range(100):
+        text = random_text(rng)
+        expected = baseline_words(text)
+        chunks = random_chunks(rng, text)
+        assert dict(tokenize(chunks, counts=True)) == {w: expected.count(w) for w in set(expected)}
+        positions = tokenize(text, positions=True)
+        assert {i: w for w, idx in positions.items() for i in idx} == dict(enumerate(expected))
+
+
+def test_long_run_without_whitespace():
+    run = "a" * 200_000
+    pages = [run[i:i + 5000] for i in range(0, len(run), 5000)] + [" tail"]
+    assert list(iter_tokens(pages, block_size=1000)) == [run, "tail"]
+    assert clean_and_extract_words(run + " tail") == {run, "tail"}
@@ -1,10 +1,15 @@
 import streamlit as st
+import csv
 import io
-import zipfile
 from collections import Counter
 import random
-from reportlab.lib.pagesizes import letter
-from reportlab.pdfgen import canvas
+from psa_core import metrics
+from psa_core.export import PdfDocument, bundle_bytes, render_pdf_cached, write_bundle
+from psa_core.extraction import extract_text_from_file
+from psa_core.extraction_cache import read_file_bytes
+from psa_core.matcher import PhraseMatcher
+from psa_core.pipeline import get_report_pipeline
+from functools import lru_cache
 
 # 📤 Upload resume + job description
 def upload_files():
@@ -13,40 +18,33 @@ def upload_files():
     return resume, jd
 
 # 🔍 Extract content from uploaded files
+@metrics.timed("utils.extract_text")
 def extract_text(file):
-    import string
-    from PyPDF2 import PdfReader
-
     if file is None:
         return ""
 
     filename = file.name.lower()
     if filename.endswith(".pdf"):
         try:
-            reader = PdfReader(file)
-            text = ""
-            for page in reader.pages:
-                text += page.extract_text() or ""
-            return text
+            return extract_text_from_file(file)
         except Exception as e:
             return f"PDF extraction error: {e}"
     else:
         try:
-            content = file.read()
+            content = read_file_bytes(file)
             return content.decode("utf-8", errors="ignore")
         except:
             return ""
 
+# 🧩 Shared pipeline – each document is extracted and tokenized once per pair
+def report_pipeline(resume_file, jd_file):
+    return get_report_pipeline(resume_file, jd_file, extract_text)
+
 # 📌 Signal match table
-def generate_signal_table(resume_file, jd_file):
-    resume_text = extract_text(resume_file).lower()
-    jd_text = extract_text(jd_file).lower()
-    resume_words = set(resume_text.split())
-    jd_words = set(jd_text.split())
-    matched = list(jd_words & resume_words)
-    missing = list(jd_words - resume_words)
-    score = len(matched) / len(jd_words) * 100 if jd_words else 0
-    return matched, score, missing[:10]
+@metrics.timed("utils.signal_table")
+def generate_signal_table(resume_file, jd_file, pipeline=None):
+    pipeline = pipeline or report_pipeline(resume_file, jd_file)
+    return pipeline.signal_table
 
 # 📋 Scorecard generator
 def generate_scorecard(resume_file, jd_file):
@@ -92,51 +90,60 @@ I welcome the opportunity to discuss how my approach could align with your missi
 Sincerely,
 Tuboise Floyd, Ph.D."""
 
-# 🧾 PDF generator
+# 🧾 PDF generator – wrapped, and cached by content hash
+@metrics.timed("utils.create_pdf")
 def create_pdf_bytes(content, title="PSA Document"):
-    buffer = io.BytesIO()
-    c = canvas.Canvas(buffer, pagesize=letter)
-    width, height = letter
-    c.setFont("Helvetica", 11)
-    c.drawString(30, height - 40, title)
-
-    y = height - 60
-    for line in content.split("\n"):
-        if y < 50:
-            c.showPage()
-            y = height - 50
-            c.setFont("Helvetica", 11)
-        c.drawString(30, y, line)
-        y -= 15
-    c.save()
-    buffer.seek(0)
-    return buffer.read()
-
-# 📦 ZIP bundle exporter – PDF output only
-def export_zip_bundle():
-    buffer = io.BytesIO()
-    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as zipf:
-        cover_letter_text = generate_cover_letter(None, None)
-        resume_lines_text = "\n".join(generate_resume_rebuild(None, None))
-        scorecard_data = str(generate_scorecard(None, None))
-        signal_table_csv = "keyword,matched\nstrategy,yes\nexecution,no"
-
-        zipf.writestr("optimized_resume.pdf", create_pdf_bytes(resume_lines_text, "Optimized Resume"))
-        zipf.writestr("cover_letter.pdf", create_pdf_bytes(cover_letter_text, "Cover Letter"))
-        zipf.writestr("psa_scorecard.pdf", create_pdf_bytes(scorecard_data, "PSA™ Scorecard"))
-        zipf.writestr("signal_match_table.csv", signal_table_csv)
-        zipf.writestr("job_description.txt", "Uploaded job description placeholder")
-
+    return render_pdf_cached(content, title)
+
+# 📊 Signal match table as CSV
+def signal_table_csv(matched, missing):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    writer.writerow(["keyword", "matched"])
+    writer.writerows([keyword, "yes"] for keyword in sorted(matched))
+    writer.writerows([keyword, "no"] for keyword in missing)
     return buffer.getvalue()
 
+# 📦 ZIP bundle exporter – PDFs render in parallel and stream into the archive
+@metrics.timed("utils.export_zip")
+def export_zip_bundle(resume_file=None, jd_file=None, dest=None):
+    """
+    Builds the report bundle from the uploaded resume and JD; the signal table
+    and JD text come from one shared pipeline. Writes the ZIP to dest (a path
+    or writable binary stream) when given; otherwise returns the archive bytes.
+    """
+    pipeline = report_pipeline(resume_file, jd_file)
+    matched, _, missing = generate_signal_table(resume_file, jd_file, pipeline)
+    members = [
+        ("optimized_resume.pdf", PdfDocument("Optimized Resume", "\n".join(generate_resume_rebuild(resume_file, jd_file)))),
+        ("cover_letter.pdf", PdfDocument("Cover Letter", generate_cover_letter(resume_file, jd_file))),
+        ("psa_scorecard.pdf", PdfDocument("PSA™ Scorecard", str(generate_scorecard(resume_file, jd_file)))),
+        ("signal_match_table.csv", signal_table_csv(matched, missing)),
+        ("job_description.txt", pipeline.jd.text),
+    ]
+    if dest is None:
+        return bundle_bytes(members)
+    write_bundle(members, dest)
+
 # 🔗 LinkedIn optimizer (beta)
+LINKEDIN_TERMS = ["strategic", "transformation", "delivery", "AI", "execution"]
+_linkedin_matcher = PhraseMatcher(LINKEDIN_TERMS)
+
+@metrics.timed("utils.linkedin")
 def run_linkedin_optimizer(linkedin_text, resume_file, jd_file):
-    terms_to_check = ["strategic", "transformation", "delivery", "AI", "execution"]
-    results = {term: ("✅" if term in linkedin_text.lower() else "❌") for term in terms_to_check}
+    found = _linkedin_matcher.matched(linkedin_text)
+    results = {term: ("✅" if term in found else "❌") for term in LINKEDIN_TERMS}
     return results
 
+@lru_cache(maxsize=64)
+def _compile_terms(terms):
+    return PhraseMatcher(terms)
+
 def match_terms(text, terms):
     """
-    Simple match scoring: counts how many terms from the list appear in the text.
+    Simple match scoring: counts how many terms from the list appear in the text
+    as whole words, using one automaton scan of the text.
     """
-    return sum(1 for term in terms if term.lower() in text.lower())
+    terms = tuple(terms)
+    found = _compile_terms(terms).matched(text)
+    return sum(1 for term in terms if term in found)